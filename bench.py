@@ -0,0 +1,74 @@
+# This is the entry point for benchmarking the game.
+# It runs every scene without a window and reports how long frames take as JSON.
+# With --micro, it times the most used helpers on their own instead, saving the results to saves/benchmarks.
+# With --pacing, it compares how evenly and with how much CPU each frame pacing strategy waits between frames instead.
+# Run "python bench.py --help" to see the options.
+
+import os
+import sys
+import json
+import argparse
+
+# Running without a window or sound, which has to be set before Pygame starts
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import src.benchmark
+
+parser = argparse.ArgumentParser(description = "Runs the game's scenes without a window and measures frame times.")
+parser.add_argument("--frames", type = int, default = 600, help = "frames measured in each scene")
+parser.add_argument("--warmup", type = int, default = 60, help = "frames run in each scene before measuring")
+parser.add_argument("--scenes", nargs = "*", help = "names of the scenes to run (such as \"main menu\" or \"boss level 3\"), all of them if not given")
+parser.add_argument("--replay", help = "replay file (found in saves/replays) to play back and measure as well")
+parser.add_argument("--output", help = "file to write the results to as JSON, printed if not given")
+parser.add_argument("--baseline", help = "results file to compare against, exiting with an error if any scene got slower")
+parser.add_argument("--threshold", type = float, default = 0.15, help = "how much slower than the baseline counts as a regression (0.15 is 15%%)")
+parser.add_argument("--micro", action = "store_true", help = "time the most used helpers on their own instead of running the scenes")
+parser.add_argument("--repetitions", type = int, default = 30, help = "timed repetitions of each micro-benchmark")
+parser.add_argument("--benchmarks", nargs = "*", help = "names of the micro-benchmarks to run (such as \"load_levels\"), all of them if not given")
+parser.add_argument("--pacing", action = "store_true", help = "compare the frame pacing strategies, running a level with the frame rate capped")
+parser.add_argument("--strategies", nargs = "*", help = "names of the frame pacing strategies to compare (such as \"hybrid\"), all of them if not given")
+args = parser.parse_args()
+
+if args.micro:
+    import src.micro_benchmark
+
+    results = src.micro_benchmark.run(args.repetitions, args.warmup, names = args.benchmarks)
+
+    outputPath = args.output if args.output is not None else src.micro_benchmark.get_default_path()
+    src.benchmark.write_json(results, outputPath)
+    print(f"Results written to {outputPath}", file = sys.stderr)
+
+    sys.exit(0)
+
+if args.pacing:
+    results = src.benchmark.run_pacing(args.frames, args.warmup, strategies = args.strategies)
+
+    if args.output is not None:
+        src.benchmark.write_json(results, args.output)
+    else:
+        print(json.dumps(results, indent = 4))
+
+    sys.exit(0)
+
+results = src.benchmark.run(args.frames, args.warmup, sceneNames = args.scenes, replayPath = args.replay)
+
+if args.output is not None:
+    src.benchmark.write_json(results, args.output)
+else:
+    print(json.dumps(results, indent = 4))
+
+if args.baseline is not None:
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+
+    regressions = src.benchmark.compare(results, baseline, args.threshold)
+
+    if regressions:
+        print("Regressions found:", file = sys.stderr)
+        for regression in regressions:
+            print(f"  {regression}", file = sys.stderr)
+
+        sys.exit(1)
+
+    print("No regressions found", file = sys.stderr)
@@ -1,7 +1,12 @@
 # This is the entry point for the program.
 # Run this to run the game!
 
+import sys
+
 import src.loop
 
-game = src.loop.Loop()
+# A replay file can be passed in to play it back (found in saves/replays)
+replayPath = sys.argv[1] if len(sys.argv) > 1 else None
+
+game = src.loop.Loop(replayPath = replayPath)
 game.run_game()
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+This file counts how many Pygame surfaces are created every frame, shown on the debug overlay (src/debug_overlay.py) as "surface allocations".
+It works by replacing pygame.Surface, pygame.font.Font, and the pygame.transform functions that create surfaces
+with versions that add to the counter, so it is only installed when DEBUG_ALLOCATIONS is on.
+Surfaces created by the debug and profiler overlays are counted as well while they are shown.
+"""
+
+import functools
+
+import pygame
+
+import src.instrumentation as instrumentation
+
+COUNTER_NAME = "surface allocations"
+
+# Functions in pygame.transform that create a new surface, unless given one to draw to
+TRANSFORM_FUNCTIONS = ("scale", "smoothscale", "rotate", "rotozoom", "flip")
+
+installed = False
+
+# Pygame's surface class, kept since pygame.Surface is replaced when installed
+BaseSurface = pygame.Surface
+
+
+class CountedSurface(BaseSurface):
+    """Surface which counts itself when created, and counts the surfaces it creates by copying or converting"""
+    def __init__(self, *args, **kwargs):
+        """Counts the surface and creates it normally"""
+        instrumentation.count(COUNTER_NAME)
+        super().__init__(*args, **kwargs)
+
+
+    def copy(self) -> "pygame.Surface":
+        """Counts the copy and copies normally"""
+        instrumentation.count(COUNTER_NAME)
+        return super().copy()
+
+
+    def convert(self, *args, **kwargs) -> "pygame.Surface":
+        """Counts the converted surface and converts normally"""
+        instrumentation.count(COUNTER_NAME)
+        return super().convert(*args, **kwargs)
+
+
+    def convert_alpha(self, *args, **kwargs) -> "pygame.Surface":
+        """Counts the converted surface and converts normally"""
+        instrumentation.count(COUNTER_NAME)
+        return super().convert_alpha(*args, **kwargs)
+
+
+class CountedFont(pygame.font.Font):
+    """Font which counts the surfaces it renders text to"""
+    def render(self, *args, **kwargs) -> "pygame.Surface":
+        """Counts the rendered surface and renders normally"""
+        instrumentation.count(COUNTER_NAME)
+        return super().render(*args, **kwargs)
+
+
+def count_transform(function):
+    """Wraps a pygame.transform function so it counts the surfaces it creates, which is whenever it isn't given a destination surface"""
+    @functools.wraps(function)
+    def wrapper(surface, *args, **kwargs):
+        if "dest_surface" not in kwargs and not any(isinstance(arg, BaseSurface) for arg in args):
+            instrumentation.count(COUNTER_NAME)
+
+        return function(surface, *args, **kwargs)
+
+    return wrapper
+
+
+def install():
+    """Replaces Pygame's surface, font, and transform functions with the counting versions. Must be called before the surfaces being counted are created."""
+    global installed
+
+    if installed:
+        return
+
+    pygame.Surface = CountedSurface
+    pygame.font.Font = CountedFont
+
+    for name in TRANSFORM_FUNCTIONS:
+        setattr(pygame.transform, name, count_transform(getattr(pygame.transform, name)))
+
+    installed = True
+
+
+def new_frame():
+    """Shows the counter on the debug overlay even when nothing was allocated this frame. Called by the loop after the instrumentation starts a new frame."""
+    instrumentation.count(COUNTER_NAME, 0)
@@ -13,20 +13,28 @@ class Animation:
         delay, # Delay between frames
         path = None, # Path of the image
         width = None, # Width of one frame
-        frames = None # Frames in the image
+        frames = None, # Frames in the image
         # The load_spritesheet function only requires either frames or width
         # So any instances of this class can be created with one or the other
+        copyFrames = False # If the frames are changed after loading (such as with set_alpha), so they're copied from the spritesheet
         ):
         """Loads the spritesheet with the appropriate inputs, creates default variables"""
         if path is not None:
             self.images = utility.load_spritesheet(
                 path, 
                 width = width, 
-                frames = frames
+                frames = frames,
+                copy = copyFrames
             )
 
         self.delay = delay
 
+        # Masks of the frames, created when first needed
+        # Keys are (frame, flipped horizontally, flipped vertically)
+        self.masks = {}
+        # Flipped frames, created when first needed, with the same keys as the masks
+        self.flippedImages = {}
+
         self.timer = 0
         self.frame = 0
 
@@ -51,11 +59,44 @@ class Animation:
         window.blit(self.images[self.frame], position)
     
 
+    def get_bounds(self, position) -> "pygame.Rect":
+        """Gets the rectangle the current frame is drawn in at a given position, for culling (src/culling.py)"""
+        # Not using get_rect, which rounds the position instead of truncating it like blitting does
+        return pygame.Rect(position, self.images[self.frame].get_size())
+    
+
     def get_frame(self) -> "pygame.Surface":
         """Gets the current pygame.Surface frame in the animation"""
         return self.images[self.frame]
     
 
+    def get_flipped_frame(self, flipX = False, flipY = False) -> "pygame.Surface":
+        """Gets the current frame, flipped if asked to. Each flipped frame is only created once and then reused."""
+        if not flipX and not flipY:
+            return self.images[self.frame]
+
+        key = (self.frame, flipX, flipY)
+
+        if key not in self.flippedImages:
+            self.flippedImages[key] = pygame.transform.flip(self.images[self.frame], flipX, flipY)
+
+        return self.flippedImages[key]
+    
+
+    def get_mask(self, flipX = False, flipY = False) -> "pygame.mask.Mask":
+        """Gets the mask of the current frame, flipped if asked to. Each mask is only created once and then reused."""
+        key = (self.frame, flipX, flipY)
+
+        if key not in self.masks:
+            image = self.images[self.frame]
+            if flipX or flipY:
+                image = pygame.transform.flip(image, flipX, flipY)
+            
+            self.masks[key] = pygame.mask.from_surface(image)
+
+        return self.masks[key]
+
+
     def get_image_width(self) -> int:
         """Gets the width of the current frame"""
         return self.images[self.frame].get_width()
@@ -67,15 +108,20 @@ class Animation:
     
     
     def set_alpha(self, alpha):
-        """Sets the alpha value for all frames to a given alpha value"""
+        """Sets the alpha value for all frames to a given alpha value. The animation should be created with copyFrames, since this changes the frames."""
         for image in self.images:
             image.set_alpha(alpha)
+
+        for image in self.flippedImages.values():
+            image.set_alpha(alpha)
     
 
     def copy(self) -> "Animation":
         """Creates a copy of the animation"""
         obj = Animation(self.delay)
         obj.images = self.images
+        obj.masks = self.masks # The frames are the same, so the masks and flipped frames can be shared
+        obj.flippedImages = self.flippedImages
         return obj
     
 
@@ -0,0 +1,361 @@
+"""
+This file decodes the game's images on a background thread while the game sets up and the startup animation plays, so scenes don't have to decode them when they're created.
+Images are decoded in groups in priority order, starting with the startup animation's (while the rest of the first frame is set up),
+then the main menu's so it can be created before the startup animation ends.
+Decoded images are shared by everything that loads them, so they shouldn't be changed, only converted or copied.
+An image loaded before the thread gets to it is decoded straight away instead of waiting for the thread.
+Progress is shown on the debug overlay (src/debug_overlay.py), and each group is logged when it's done.
+
+Images decoded from their PNGs are also converted to the screen's pixel format when they're loaded, and written to the asset cache folder named after the PNG's hash and the pixel format.
+Next time the image is loaded from there instead, with its pixels mapped from the file instead of decoded, so converting it for the screen is only a copy.
+An image whose PNG changed has a different hash, so it's decoded again and the old cache file is replaced.
+"""
+
+import glob
+import hashlib
+import io
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+
+import pygame
+
+import src.constants as constants
+import src.instrumentation as instrumentation
+
+logger = logging.getLogger(__name__)
+
+# Groups whose images are only loaded once, so they aren't kept once they're loaded (the startup animation is too large to keep)
+LOADED_ONCE = ("startup",)
+
+# Pixel formats images can be cached in, which are used if images converted for the screen are in one of them
+CACHE_FORMATS = ("BGRA", "RGBA", "ARGB")
+# Width and height of the image, at the start of each cache file before its pixels
+CACHE_HEADER = struct.Struct("<II")
+
+images = {} # Path: decoded image, for the images in the groups
+imageGroups = {} # Path: name of the group the image is in
+loaded = set() # Paths of the images loaded before decoding started
+pending = [] # (group, path) of the images the thread hasn't decoded yet, in priority order
+decoding = None # Path of the image the thread is decoding
+groupsLeft = {} # Group name: amount of its images not decoded yet
+decoded = 0 # Images in the groups that have been decoded
+total = 0 # Images in all of the groups
+cacheHits = 0 # Images loaded from the cache instead of decoded
+uncached = {} # Path: hash of the PNG, for the images decoded from their PNGs, which are cached when they're loaded
+cacheFormat = None # Pixel format images are cached in, known once the screen has been created (see set_cache_format)
+
+condition = threading.Condition() # Held while changing any of the above, and notified whenever an image is decoded
+thread = None
+startTime = None
+
+
+def get_groups() -> list:
+    """Gets the groups of images to decode as (name, paths) in the order they're decoded, with every image in the res folder in one of them"""
+    mainMenu = [
+        constants.CRYSTAL_CHECK_PATH, constants.CRYSTAL_X_PATH, constants.ARROW_PATH, constants.COG_PATH,
+        constants.SCREEN_SHADOW_PATH, constants.TIN_LOGO_PATH,
+        # The main menu's background is drawn with the tiles
+        constants.SPIKE_PATH, constants.BRIGHT_SPIKE_PATH,
+        *glob.glob("res/tiles/solid/**/*.png", recursive = True),
+        *[data["path"] for anims in constants.TILES_WITH_ANIMATIONS.values() for data in anims.values()]
+    ]
+    menus = [constants.BACK_PATH, constants.CHECK_BOX_PATH, constants.CHECK_MARK_PATH, constants.PAUSE_BUTTON_PATH]
+
+    listed = {os.path.normpath(path) for path in [constants.CTM_LOGO_PATH] + mainMenu + menus}
+    levels = [path for path in sorted(glob.glob("res/**/*.png", recursive = True)) if os.path.normpath(path) not in listed]
+
+    return [("startup", [constants.CTM_LOGO_PATH]), ("main menu", mainMenu), ("menus", menus), ("levels", levels)]
+
+
+def start():
+    """Starts decoding every image in the groups on a background thread"""
+    global thread, startTime, total
+
+    if not constants.PRELOAD_ASSETS or startTime is not None:
+        return
+
+    startTime = time.perf_counter()
+
+    with condition:
+        for group, paths in get_groups():
+            # Removing duplicates, such as a path listed in a group and found again by a glob
+            paths = [path for path in dict.fromkeys(os.path.normpath(path) for path in paths) if path not in imageGroups]
+            if group in LOADED_ONCE:
+                paths = [path for path in paths if path not in loaded]
+
+            imageGroups.update((path, group) for path in paths)
+
+            pending.extend((group, path) for path in paths)
+            groupsLeft[group] = len(paths)
+            total += len(paths)
+
+    thread = threading.Thread(target = decode_pending, name = "asset loader", daemon = True)
+    thread.start()
+
+    report()
+
+
+def stop():
+    """Stops decoding once the image being decoded is done, so Pygame isn't quit while the thread is using it"""
+    global thread
+
+    with condition:
+        pending.clear()
+
+    if thread is not None:
+        thread.join()
+        thread = None
+
+
+def decode_pending():
+    """Decodes the images waiting to be decoded in order until there are none left. Run on the background thread."""
+    global decoding
+
+    while True:
+        with condition:
+            if not pending:
+                break
+
+            group, path = pending.pop(0)
+            decoding = path
+
+        try:
+            # Pygame lets other threads run while the image is decoded, so the startup animation keeps playing
+            image = decode(path)
+
+        except Exception as error:
+            # Left for load_image to decode again, so the error comes up where the image is used
+            logger.warning(f"Could not decode {path} in the background: {error}")
+            image = None
+
+        with condition:
+            if image is not None:
+                images[path] = image
+
+            decoding = None
+            finish(group)
+            condition.notify_all()
+
+
+def finish(group):
+    """Counts an image in the group as decoded, logging the group when it's done. Has to be called while holding the condition."""
+    global decoded
+
+    decoded += 1
+    groupsLeft[group] -= 1
+
+    if groupsLeft[group] == 0:
+        logger.info(f"Decoded the {group} images {(time.perf_counter() - startTime) * 1000:.1f}ms after starting")
+
+    report()
+
+
+def load_image(path) -> "pygame.Surface":
+    """
+    Loads an image, using the decoded image if it's in one of the groups, waiting for it if the thread is decoding it.
+    The image returned may be shared, so it has to be converted or copied before it's changed.
+    """
+    path = os.path.normpath(path)
+
+    with condition:
+        while decoding == path:
+            condition.wait()
+
+        if path in images:
+            image = images.pop(path) if imageGroups[path] in LOADED_ONCE else images[path]
+
+        else:
+            image = None
+
+            # Decoding it now instead of waiting for the thread to get to it
+            group = next((group for group, pendingPath in pending if pendingPath == path), None)
+            if group is not None:
+                pending.remove((group, path))
+
+            if startTime is None:
+                loaded.add(path)
+
+    if image is None:
+        image = decode(path)
+
+        if group is not None:
+            with condition:
+                if group not in LOADED_ONCE:
+                    images[path] = image
+
+                finish(group)
+                condition.notify_all()
+
+    # Cached here instead of where it was decoded, since converting it uses the screen, which the thread can't safely use
+    cache(path, image)
+
+    return image
+
+
+def decode(path) -> "pygame.Surface":
+    """
+    Decodes an image, loading it from the cache instead if it's been cached since the PNG last changed.
+    Images decoded from their PNGs are cached by load_image. Run on both threads, so it doesn't use the screen.
+    """
+    global cacheHits
+
+    if not constants.CACHE_ASSETS:
+        return pygame.image.load(path)
+
+    with open(path, "rb") as file:
+        data = file.read()
+
+    key = hashlib.sha1(data).hexdigest()
+
+    image = load_cached(path, key, cacheFormat)
+    if image is not None:
+        with condition:
+            cacheHits += 1
+
+        return image
+
+    image = pygame.image.load(io.BytesIO(data), path)
+
+    with condition:
+        uncached[path] = key
+
+    return image
+
+
+def cache(path, image):
+    """Caches an image that was decoded from its PNG, once the screen's pixel format is known. Only called on the main thread, since converting the image uses the screen."""
+    with condition:
+        if cacheFormat is None or path not in uncached:
+            return
+
+        key = uncached.pop(path)
+
+    save_cached(path, key, cacheFormat, image)
+
+
+def cache_next():
+    """
+    Caches one of the images the thread decoded from their PNGs that hasn't been loaded yet, so it's cached even if it isn't used this time.
+    Called by the loop after every frame, caching one image at a time so no frame is held up for long. Only called on the main thread.
+    """
+    with condition:
+        path = next((path for path in uncached if path in images), None) if cacheFormat is not None else None
+        if path is None:
+            return
+
+        image = images[path]
+
+    cache(path, image)
+
+
+def set_cache_format():
+    """
+    Finds the format images are cached in, the one images are converted to for the screen, if it's one that can be cached.
+    Called by the window once the screen won't be created again, so the background thread never uses the screen while it's being created.
+    """
+    global cacheFormat
+
+    masks = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha().get_masks()
+    format = next((format for format in CACHE_FORMATS if pygame.image.frombuffer(bytes(4), (1, 1), format).get_masks() == masks), None)
+
+    with condition:
+        cacheFormat = format
+
+
+def get_cache_path(path, key, format) -> str:
+    """Gets the path of the cache file of an image with the PNG's hash and the pixel format given"""
+    return f"{constants.ASSET_CACHE_FOLDER}/{path.replace(os.sep, '_')}.{key}.{format}"
+
+
+def load_cached(path, key, format) -> "pygame.Surface":
+    """
+    Loads an image from the cache, returning None if it isn't cached in the format.
+    If no format is given (since the screen hasn't been created yet) any format it's cached in is used, which is converted when it's used.
+    Only uses the files, so it can be run on the background thread.
+    """
+    if format is None:
+        cachePaths = glob.glob(glob.escape(get_cache_path(path, key, "")) + "*")
+        format = next((cachePath.rsplit(".", 1)[1] for cachePath in cachePaths if cachePath.rsplit(".", 1)[1] in CACHE_FORMATS), None)
+
+        if format is None:
+            return None
+
+    try:
+        with open(get_cache_path(path, key, format), "rb") as file:
+            # Copied on write, so the image can be changed without changing the file
+            pixels = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_COPY)
+
+    except FileNotFoundError:
+        return None
+
+    except (OSError, ValueError) as error:
+        logger.warning(f"Could not load {path} from the cache: {error}")
+        return None
+
+    width, height = CACHE_HEADER.unpack_from(pixels) if len(pixels) >= CACHE_HEADER.size else (0, 0)
+    if len(pixels) != CACHE_HEADER.size + width * height * 4:
+        logger.warning(f"The cache file of {path} is the wrong size, so it's decoded again")
+        return None
+
+    # The image keeps the file mapped, so its pixels are only read from the file when they're first used
+    return pygame.image.frombuffer(memoryview(pixels)[CACHE_HEADER.size:], (width, height), format)
+
+
+def save_cached(path, key, format, image):
+    """Converts an image to the screen's pixel format and writes it to the cache, removing any older cache files of it"""
+    cachePath = get_cache_path(path, key, format)
+
+    try:
+        if not os.path.exists(constants.ASSET_CACHE_FOLDER):
+            os.makedirs(constants.ASSET_CACHE_FOLDER, exist_ok = True)
+
+        # Written to another file first, so a cache file is never loaded while it's partly written
+        with open(cachePath + ".tmp", "wb") as file:
+            file.write(CACHE_HEADER.pack(*image.get_size()))
+            file.write(pygame.image.tobytes(image.convert_alpha(), format))
+
+        os.replace(cachePath + ".tmp", cachePath)
+
+    except OSError as error:
+        # Decoded from the PNG again next time
+        logger.warning(f"Could not cache {path}: {error}")
+        return
+
+    # Cached before the PNG changed or in another pixel format
+    for oldPath in glob.glob(glob.escape(get_cache_path(path, "", ""))[:-1] + "*"):
+        if oldPath != cachePath:
+            try:
+                os.remove(oldPath)
+
+            except OSError:
+                pass # Can't be removed while an image loaded from it is still using it on some systems, so it's removed next time
+
+
+def is_ready(group) -> bool:
+    """Checks if decoding has started and every image in the group has been decoded"""
+    with condition:
+        return startTime is not None and groupsLeft.get(group, 0) == 0
+
+
+def wait(group) -> float:
+    """Waits until every image in the group has been decoded, returning the seconds waited"""
+    start = time.perf_counter()
+
+    with condition:
+        while groupsLeft.get(group, 0) > 0:
+            condition.wait()
+
+    waited = time.perf_counter() - start
+    if waited > 0.001:
+        logger.info(f"Waited {waited * 1000:.1f}ms for the {group} images to be decoded")
+
+    return waited
+
+
+def report():
+    """Reports how many of the images have been decoded to the debug overlay"""
+    instrumentation.report("assets", f"{decoded}/{total} decoded ({cacheHits} from the cache)")
@@ -4,7 +4,13 @@ import logging
 import src.player
 import src.constants as constants
 import src.utility as utility
+import src.asset_loader as asset_loader
 import src.ellipse_and_corlen as eac
+import src.collision_manager
+import src.trail_buffer
+import src.profiler as profiler
+import src.frame_stats as frame_stats
+import src.quality as quality
 
 class BaseLevel():
     """
@@ -22,7 +28,7 @@ class BaseLevel():
         # Loading levels from levels.txt
         self.levels, self.levelData = utility.load_levels(constants.LEVELS_PATH)
         
-        self.screenShadow = pygame.image.load(constants.SCREEN_SHADOW_PATH).convert_alpha()
+        self.screenShadow = asset_loader.load_image(constants.SCREEN_SHADOW_PATH).convert_alpha()
 
         # Gravity line pull direction
         # Each entity still has its own pull direction for if it's below or above the line.
@@ -32,14 +38,16 @@ class BaseLevel():
 
         self.currentCrystal = False # If the crystal in the current level has been collected
 
+        # Checks collisions between the player and hazards (spikes and bosses)
+        self.collisionManager = src.collision_manager.CollisionManager()
+
         # Setting up the player
         self.setup_player(new = True)
 
         self.setup_entities(self.player.rect.topleft)
 
-        self.playerPositions = [] # List of player positions for Corlen and Ellipse to follow
-        self.playerLevelAndRoom = [] # List of the level and room the player is in at what frame
-        self.playerFacing = [] # List of what direction the player is facing at what frame
+        # Player positions, levels and rooms, and facing directions for Corlen and Ellipse to follow
+        self.playerTrail = src.trail_buffer.TrailBuffer(constants.MAX_FOLLOW_DISTANCE + 1)
 
         self.showEntities = True
         self.check_entity_rendering()
@@ -50,9 +58,16 @@ class BaseLevel():
         self.gravityBeam = src.animation.Animation(
             constants.GRAV_BEAM_DELAY,
             path = constants.GRAV_BEAM_PATH, 
-            width = constants.GRAV_BEAM_WIDTH
+            width = constants.GRAV_BEAM_WIDTH,
+            copyFrames = True # Made transparent below
         )
+        # The first frame of the gravity beam across the whole screen, drawn in one blit when the quality governor turns off its animation
+        self.stillGravityBeam = pygame.Surface((constants.SCREEN_SIZE[0], self.gravityBeam.images[0].get_height()), flags = pygame.SRCALPHA)
+        for x in range(constants.SCREEN_SIZE[0] // constants.GRAV_BEAM_WIDTH):
+            self.stillGravityBeam.blit(self.gravityBeam.images[0], (x * constants.GRAV_BEAM_WIDTH, 0))
+
         self.gravityBeam.set_alpha(150) # Makes gravity beam transparent
+        self.stillGravityBeam.set_alpha(150)
 
         self.gravBeamYPos = constants.GRAV_BEAM_TILE_Y_POS
 
@@ -150,6 +165,7 @@ class BaseLevel():
 
         if new:
             self.player = src.player.Player(playerStart, yVelocity, xVelocity) # Creating the player object based on the position found/given
+            self.player.collisionManager = self.collisionManager
         
         else:
             self.player.reset(playerStart, yVelocity, xVelocity) # Resetting the player's position and velocity
@@ -191,9 +207,7 @@ class BaseLevel():
         self.currentCrystal = False
 
         # Ellipse and Corlen data clearing
-        self.playerPositions.clear()
-        self.playerLevelAndRoom.clear()
-        self.playerFacing.clear()
+        self.playerTrail.clear()
     
 
     def popup(self, text):
@@ -236,6 +250,7 @@ class BaseLevel():
         """
         Updating Player
         """
+        profiler.start("player")
         playerState = self.player.update(
             self.levels[self.level][self.room],
             self.room,
@@ -245,11 +260,13 @@ class BaseLevel():
             globalGravity = self.gravityDir,
             tileRenderer = tileRenderer
         ) # Updating the player with the inputs
+        profiler.stop()
 
         # If the player moved to the far right of the screen
         if playerState == "right":
             self.room += 1
             self.logger.info(f"Player traveled to the next room into room {self.room}")
+            frame_stats.event("room change")
             
             # If the room number has hit the end of the level
             if self.room >= len(self.levels[self.level]):
@@ -272,6 +289,7 @@ class BaseLevel():
             if self.room > 0: # If it isn't the start of a level
                 self.room -= 1
                 self.logger.info(f"Player traveled left one room into room {self.room}")
+                frame_stats.event("room change")
 
                 # Moving the player to the opposite side of the screen
                 self.player.rect.x += constants.SCREEN_TILE_SIZE[0] * (constants.TILE_SIZE[0]) + playerSpawnOffset 
@@ -321,20 +339,14 @@ class BaseLevel():
 
             
         if self.showEntities:
+            profiler.start("followers")
             # Updating the data for the follow objects to use (Ellipse and Corlen)
-            if self.playerPositions == [] or self.playerPositions[0] != self.player.rect.topleft: # If the player moved
+            # If the player moved
+            if len(self.playerTrail) == 0 or self.playerTrail.get(0)[:2] != self.player.rect.topleft:
                 playerMoved = True
 
-                # inserts at the front of the list
-                self.playerPositions.insert(0, self.player.rect.topleft)
-                self.playerLevelAndRoom.insert(0, (self.level, self.room))
-                self.playerFacing.insert(0, self.player.facing)
-                
-                # Removing excess data
-                if len(self.playerPositions) > constants.MAX_FOLLOW_DISTANCE + 1:
-                    self.playerPositions.pop(-1)
-                    self.playerLevelAndRoom.pop(-1)
-                    self.playerFacing.pop(-1)
+                # Adds the newest sample, replacing the oldest one once the trail is full
+                self.playerTrail.append(self.player.rect.topleft, self.level, self.room, self.player.facing)
             
             else:
                 playerMoved = False
@@ -343,13 +355,12 @@ class BaseLevel():
             for ent in self.entities:
                 ent.update(
                     self.levels, 
-                    self.playerPositions,
-                    self.playerLevelAndRoom,
-                    self.playerFacing,
+                    self.playerTrail,
                     playerMoved,
                     self.gravBeamYPos,
                     self.gravityDir
                 )
+            profiler.stop()
         
         self.gravityBeam.update()
 
@@ -358,7 +369,7 @@ class BaseLevel():
     
     def render(self, surface, offset = 0, renderWithCheck = True):
         """Renders all entities to the given surface with an offset"""
-        if self.showEntities:
+        if self.showEntities and quality.enabled("followers"):
             # Drawing Ellipse and Corlen
             for ent in self.entities:
                 if renderWithCheck:
@@ -375,6 +386,10 @@ class BaseLevel():
 
     def render_grav_beam(self, surface):
         """Renders the gravity beam/line across the screen"""
+        if not quality.enabled("gravity beam animation"):
+            surface.blit(self.stillGravityBeam, (0, (self.gravBeamYPos * constants.TILE_SIZE[1]) - (self.stillGravityBeam.get_height() / 2)))
+            return
+
         for x in range(constants.SCREEN_SIZE[0] // constants.GRAV_BEAM_WIDTH): # Goes through the center of the screen
             # Draws the gravity beam
             self.gravityBeam.render(
@@ -401,4 +416,5 @@ class BaseLevel():
     
     def render_screen_shadow(self, surface):
         """Renders the shadow at the edges onto the screen"""
-        surface.blit(self.screenShadow, (0, 0))
\ No newline at end of file
+        if quality.enabled("screen shadow"):
+            surface.blit(self.screenShadow, (0, 0))
\ No newline at end of file
@@ -1,118 +1,24 @@
 import pygame
 import logging
-import random
 import math
+import numpy as np
 
 import src.constants as constants
 import src.utility as utility
-
-class Lazer:
-    """
-    This class, lazer, manages the lazers that the Belloq fires.
-    It has several functions that can check collisions with the player, check if it's offscreen, and more.
-    """
-    def __init__(
-        self, 
-        degreesFacing, # What direction it's facing in radians 
-        startPos 
-        ):
-        """Sets the default vars"""
-        self.degreesFacing = degreesFacing
-        self.position = list(startPos)
-    
-    
-    def get_top_left(self, position):
-        """Gets the lessor of the two points, for the top left"""
-        topLeftX = position[0] if position[0] < self.endPoint[0] else self.endPoint[0]
-        topLeftY = position[1] if position[1] < self.endPoint[1] else self.endPoint[1]
-        return (topLeftX, topLeftY)
-    
-
-    def get_bottom_right(self, position):
-        """Gets the greater of the two points, for the bottom right"""
-        bottomRightX = position[0] if position[0] > self.endPoint[0] else self.endPoint[0]
-        bottomRightY = position[1] if position[1] > self.endPoint[1] else self.endPoint[1]
-        return(bottomRightX, bottomRightY)
-    
-
-    def update(self, playerMask, playerPos, playerRoom, tilesOffset) -> bool:
-        """Updates the lazer, returning True if it has collided with the player"""
-        # Moves the lazer in the direction it's moving
-        self.position[0] += math.cos(self.degreesFacing) * constants.LAZER_SPEED
-        self.position[1] += math.sin(self.degreesFacing) * constants.LAZER_SPEED
-
-        self.screenPos = self.position.copy()
-        self.screenPos[0] += tilesOffset - playerRoom * constants.SCREEN_SIZE[0]
-
-        # The end point of the lazer (self.position is the starting point of it)
-        self.endPoint = (
-            self.screenPos[0] + (math.cos(self.degreesFacing) * constants.LAZER_LENGTH),
-            self.screenPos[1] + (math.sin(self.degreesFacing) * constants.LAZER_LENGTH)
-        )
-
-        topLeftX, topLeftY = self.get_top_left(self.screenPos)
-        bottomRightX, bottomRightY = self.get_bottom_right(self.screenPos)
-
-        # Creates a surface with the exact size of the lazer
-        # Used to create a mask to check collisions with the player
-        collisionSurface = pygame.Surface((
-            math.ceil(bottomRightX - topLeftX),
-            math.ceil(bottomRightY - topLeftY)
-        ))
-
-        # Draws the lazer onto the collision surface
-        pygame.draw.line(
-            collisionSurface, 
-            constants.LAZER_COLOR,
-            (math.ceil(self.screenPos[0] - topLeftX), math.ceil(self.screenPos[1] - topLeftY)),
-            (math.ceil(self.endPoint[0] - topLeftX), math.ceil(self.endPoint[1] - topLeftY))
-        )
-
-        lineMask = pygame.mask.from_surface(collisionSurface)
-
-        # Checking collisions between the lazer and the player
-        collided = lineMask.overlap(
-            playerMask,
-            (playerPos[0] - topLeftX + tilesOffset,
-             playerPos[1] - topLeftY)
-        )
-
-        return collided
-    
-
-    def check_offscreen(self, rooms) -> bool:
-        """Checks if it's off the screen of the entire level and returns True if it is"""
-        topLeftX, topLeftY = self.get_top_left(self.position)
-        bottomRightX, bottomRightY = self.get_bottom_right(self.position)
-
-        endOfLevel = rooms * constants.SCREEN_SIZE[0]
-
-        xOffScreen = bottomRightX < 0 or topLeftX > endOfLevel
-        yOffScreen = bottomRightY < 0 or topLeftY > constants.SCREEN_SIZE[1]
-
-        return xOffScreen or yOffScreen
-
-    
-    def render(self, window):
-        """Draws the line to the screen, from the starting position to the ending position"""
-        pygame.draw.line(
-            window, 
-            constants.LAZER_COLOR,
-            self.screenPos,
-            self.endPoint
-        )
-
+import src.culling as culling
 
 class Belloq:
     """
     This manages the Belloq boss, creating lazers, moving it, 
     checking collisions with the player, and rendering it.
+    The lazers are projectiles in the boss level's projectile pool (src/projectile_pool.py),
+    so all of them are moved, checked for collisions with the player, and removed when offscreen at once.
     """
-    def __init__(self):
+    def __init__(self, projectiles):
         """Loads animation, sets default variables"""
         self.logger = logging.getLogger(__name__)
 
-        self.lazers = []
+        self.projectiles = projectiles
         self.cooldown = constants.BELLOQ_COOLDOWN
 
         self.animation = utility.load_animations_dict(constants.BELLOQ_ANIMATIONS)
@@ -129,7 +35,7 @@ class Belloq:
             -self.animation[self.currentAnim].get_image_width(), 
             constants.SCREEN_SIZE[1] // 2 - self.animation[self.currentAnim].get_image_height() // 2
         ]
-        self.lazers.clear()
+        self.projectiles.clear("Belloq")
         self.cooldown = constants.BELLOQ_COOLDOWN
 
     
@@ -161,26 +67,85 @@ class Belloq:
         
         # Gets a random decimal (multiplies by 100 to choose a random integer and then divides the result by 100)
         # Since the degrees is in radians
-        randomOffsetDegrees = random.randrange(
+        randomOffsetDegrees = utility.gameRandom.randrange(
             -constants.BELLOQ_LAZER_ACCURACY * 100, 
             constants.BELLOQ_LAZER_ACCURACY * 100
         ) / 100
 
+        degreesFacing = utility.angle_to(eyeballCenterScreenPos, playerCenter) + randomOffsetDegrees
+
         # Creating a lazer pointing at the player
-        self.lazers.append(Lazer(
-            utility.angle_to(eyeballCenterScreenPos, playerCenter) + randomOffsetDegrees,
-            # math.atan2( # Finds the rotation needed to point at the player
-            #     playerCenter[1] - eyeballCenterScreenPos[1],
-            #     playerCenter[0] - eyeballCenterScreenPos[0]
-            # ) + randomOffsetDegrees,
-            eyeballCenter # Starting position
-        ))
+        self.projectiles.spawn(
+            "Belloq",
+            eyeballCenter, # Starting position
+            (math.cos(degreesFacing) * constants.LAZER_SPEED, math.sin(degreesFacing) * constants.LAZER_SPEED),
+            constants.LAZER_LENGTH
+        )
+
+        self.logger.info(f"Amount of lazers is now {len(self.projectiles.get_slots('Belloq'))}")
+
+
+    def get_lazers_on_screen(self, tilesOffset, playerRoom) -> tuple:
+        """Gets arrays of the starting and ending points of the lazers on the screen"""
+        slots = self.projectiles.get_slots("Belloq")
+
+        screenStarts = self.projectiles.positions[slots]
+        screenStarts[:, 0] += tilesOffset - playerRoom * constants.SCREEN_SIZE[0]
+
+        # The end points of the lazers (the positions are the starting points)
+        screenEnds = screenStarts + (self.projectiles.get_ends(slots) - self.projectiles.positions[slots])
+
+        return screenStarts, screenEnds
+
+
+    def check_lazers(self, playerMask, playerPos, playerRoom, tilesOffset, collisionManager) -> bool:
+        """Checks all lazers against the player, returning True if any of them collided with the player. Adds to the collision manager's counters."""
+        screenStarts, screenEnds = self.get_lazers_on_screen(tilesOffset, playerRoom)
+
+        # Player's rectangle on the screen
+        playerSize = playerMask.get_size()
+        playerLeft = playerPos[0] + tilesOffset
+        playerTop = playerPos[1]
+        playerRight = playerLeft + playerSize[0]
+        playerBottom = playerTop + playerSize[1]
+
+        # Broad phase: the bounding box of each lazer against the player's rectangle
+        topLefts = np.minimum(screenStarts, screenEnds)
+        bottomRights = np.maximum(screenStarts, screenEnds)
+
+        candidates = np.flatnonzero(
+            (bottomRights[:, 0] >= playerLeft) & (topLefts[:, 0] < playerRight) &
+            (bottomRights[:, 1] >= playerTop) & (topLefts[:, 1] < playerBottom)
+        )
+
+        collisionManager.add_counts(hazards = len(screenStarts), candidates = len(candidates), maskTests = len(candidates))
+
+        if len(candidates) == 0:
+            return False
 
-        self.logger.info(f"Amount of lazers is now {len(self.lazers)}")
+        # Narrow phase: the pixels each lazer covers against the player's mask
+        # Steps along each lazer one pixel at a time
+        steps = np.linspace(0, 1, math.ceil(constants.LAZER_LENGTH) + 1)
+        points = screenStarts[candidates, None, :] + (screenEnds - screenStarts)[candidates, None, :] * steps[None, :, None]
+
+        # Pixel positions relative to the top left of the player
+        pixels = np.floor(points).astype(int).reshape(-1, 2) - (math.floor(playerLeft), playerTop)
+
+        onPlayer = (
+            (pixels[:, 0] >= 0) & (pixels[:, 0] < playerSize[0]) &
+            (pixels[:, 1] >= 0) & (pixels[:, 1] < playerSize[1])
+        )
+
+        for x, y in pixels[onPlayer].tolist():
+            if playerMask.get_at((x, y)):
+                collisionManager.add_counts(hits = 1)
+                return True
+
+        return False
 
     
-    def update(self, player, playerRoom, amountOfRooms, tilesOffset):
-        """Updates everything, moves the boss towards the player, the cooldown for lazers, and updating lazers and removing ones offscreen."""
+    def update(self, player, playerRoom, amountOfRooms, tilesOffset, collisionManager) -> bool:
+        """Updates everything, moves the boss towards the player, the cooldown for lazers, and updating lazers and removing ones offscreen. Registers the Belloq with the collision manager, and returns True if a lazer hit the player."""
         screenPos = self.position.copy()
         screenPos[0] += tilesOffset
         screenPos[0] -= playerRoom * constants.SCREEN_SIZE[0]
@@ -213,37 +178,63 @@ class Belloq:
 
                 self.create_lazer(player, playerScreenX, screenPos)
         
+        # Moving the lazers in the direction they're facing
+        self.projectiles.update("Belloq")
+
         # Checking lazer collisions with the player
-        for lazer in self.lazers:
-            if lazer.update(player.get_mask(), player.rect.topleft, playerRoom, tilesOffset):
-                # Collided with player
-                return True
+        if self.check_lazers(player.get_mask(), player.rect.topleft, playerRoom, tilesOffset, collisionManager):
+            # Collided with player
+            return True
         
-        # Removing lazers that are offscreen
-        self.lazers[:] = [lazer for lazer in self.lazers if not lazer.check_offscreen(amountOfRooms)] 
-
-        # Checking collisions between the Belloq and the player
-        belloqMask = pygame.mask.from_surface(self.animation[self.currentAnim].get_frame())
-        playerMask = player.get_mask()
-
-        # Checking collision
-        collided = belloqMask.overlap(
-            playerMask,
-            (playerScreenX - screenPos[0],
-            player.rect.y - screenPos[1])
+        # Removing lazers that are off the screen of the entire level
+        self.projectiles.cull("Belloq", (0, 0, amountOfRooms * constants.SCREEN_SIZE[0], constants.SCREEN_SIZE[1]))
+
+        # Registering the Belloq so collisions with the player are checked
+        collisionManager.register(
+            "Belloq",
+            screenPos,
+            (self.animation[self.currentAnim].get_image_width(), self.animation[self.currentAnim].get_image_height()),
+            self.animation[self.currentAnim].get_mask
         )
-        
-        if collided:
-            return True
+
+        return False
     
 
+    def get_bounds(self, tilesOffset, playerRoom) -> "pygame.Rect":
+        """Gets the rectangle the boss is drawn in on the screen"""
+        return self.animation[self.currentAnim].get_bounds((
+            self.position[0] + tilesOffset - (playerRoom * constants.SCREEN_SIZE[0]),
+            self.position[1]
+        ))
+
+
     def render(self, window, tilesOffset, playerRoom):
-        """Renders animation frame and lazers"""
-        self.animation[self.currentAnim].render(
-            window, 
-            (self.position[0] + tilesOffset - (playerRoom * constants.SCREEN_SIZE[0]),
-             self.position[1])
+        """Renders animation frame and lazers, skipping any that are off the screen"""
+        if culling.is_visible(self.get_bounds(tilesOffset, playerRoom)):
+            self.animation[self.currentAnim].render(
+                window, 
+                (self.position[0] + tilesOffset - (playerRoom * constants.SCREEN_SIZE[0]),
+                 self.position[1])
+            )
+
+        # Rendering lazers, from the starting positions to the ending positions
+        screenStarts, screenEnds = self.get_lazers_on_screen(tilesOffset, playerRoom)
+
+        # Only the lazers with a bounding box on the screen, which can have no width or height since they're lines
+        topLefts = np.minimum(screenStarts, screenEnds)
+        bottomRights = np.maximum(screenStarts, screenEnds)
+        visible = (
+            (bottomRights[:, 0] >= culling.camera.left) & (topLefts[:, 0] < culling.camera.right) &
+            (bottomRights[:, 1] >= culling.camera.top) & (topLefts[:, 1] < culling.camera.bottom)
         )
-        # Rendering lazers
-        for lazer in self.lazers:
-            lazer.render(window)
\ No newline at end of file
+        screenStarts = screenStarts[visible]
+        screenEnds = screenEnds[visible]
+        culling.count(len(screenStarts), len(visible) - len(screenStarts))
+
+        for start, end in zip(screenStarts.tolist(), screenEnds.tolist()):
+            pygame.draw.line(
+                window, 
+                constants.LAZER_COLOR,
+                start,
+                end
+            )
\ No newline at end of file
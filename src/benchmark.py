@@ -0,0 +1,318 @@
+"""
+This file runs the game without a window (using SDL's dummy video and audio drivers) to measure how long frames take.
+Each scene type (the startup animation, the main menu, a normal level, every boss level, and every cutscene)
+is run for a number of frames with scripted inputs, or a recorded replay is played back.
+The results can be written as JSON and compared against a baseline to find regressions.
+The frame pacing strategies (src/frame_pacer.py) can be compared as well, running a level with the frame rate capped.
+Used by bench.py, which should be run instead of this file.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import platform
+import numpy as np
+
+import pygame
+
+import src.constants as constants
+import src.utility as utility
+import src.frame_pacer
+
+# Percentiles of the frame times reported for each scene
+PERCENTILES = (50, 95, 99)
+# Statistics that are compared against the baseline (higher is slower)
+COMPARED_STATS = ("p50", "p95")
+
+
+class ScriptedInputs:
+    """
+    Generates inputs for every frame, standing in for an InputReplayer (src/replay.py) so the window uses them instead of the user's inputs.
+    Walks right (and sometimes left), jumps, skips cutscene text, and sweeps the mouse across the screen without clicking.
+    """
+    def __init__(self):
+        """Starts at the first frame"""
+        self.frame = 0
+
+
+    def apply(self, window) -> bool:
+        """Sets the window's inputs to the inputs of the next frame. Always returns True since the script never ends."""
+        window.inputs["right"] = (self.frame // 60) % 4 != 3
+        window.inputs["left"] = (self.frame // 60) % 4 == 3
+        window.inputs["up"] = self.frame % 37 == 0
+        window.inputs["enter"] = self.frame % 45 == 0
+        window.inputs["space"] = False
+        window.inputs["esc"] = False
+
+        # Moving the mouse over the buttons of the menus
+        window.mousePos = (
+            (self.frame * 3) % constants.SCREEN_SIZE[0],
+            (self.frame // 2) % constants.SCREEN_SIZE[1]
+        )
+        for button in window.mousePressed:
+            window.mousePressed[button] = False
+
+        self.frame += 1
+        return True
+
+
+def setup_save():
+    """Points the game at a fresh save file used only for benchmarking, so the user's save isn't changed"""
+    constants.SAVE_PATH = constants.BENCHMARK_SAVE_PATH
+
+    if os.path.isfile(constants.SAVE_PATH):
+        os.remove(constants.SAVE_PATH)
+
+    utility.create_default_database()
+
+
+def get_stats(frameTimes) -> dict:
+    """Gets the percentiles, mean, and throughput (frames per second) of a list of frame times in milliseconds. Only the amount of frames is given if the list is empty."""
+    if len(frameTimes) == 0:
+        return {"frames": 0}
+
+    frameTimes = np.array(frameTimes)
+
+    stats = {f"p{percentile}": float(np.percentile(frameTimes, percentile)) for percentile in PERCENTILES}
+    stats["mean"] = float(frameTimes.mean())
+    stats["max"] = float(frameTimes.max())
+    stats["frames"] = len(frameTimes)
+    stats["fps"] = float(len(frameTimes) / (frameTimes.sum() / 1000))
+
+    return stats
+
+
+def time_frames(game, frames, scene = None) -> list:
+    """
+    Runs the game for the amount of frames given, returning how long each frame took in milliseconds.
+    If a scene is given, stops early when the game switches to a different scene.
+    """
+    frameTimes = []
+
+    for frame in range(frames):
+        if game.window.closeWindow: # A replay finished
+            break
+
+        if scene is not None and game.scene != scene:
+            break
+
+        start = time.perf_counter()
+        game.run_frame()
+        frameTimes.append((time.perf_counter() - start) * 1000)
+
+    return frameTimes
+
+
+def print_progress(name, stats):
+    """Prints the main statistics of a scene once it has finished. Printed to stderr so the JSON results can be piped."""
+    if stats["frames"] == 0:
+        print(f"{name}: no frames measured, the scene ended during the warmup", file = sys.stderr)
+        return
+
+    print(f"{name}: {stats['p50']:.2f}ms p50, {stats['p99']:.2f}ms p99, {stats['fps']:.0f} FPS", file = sys.stderr)
+
+
+def get_scenes(game) -> list:
+    """Gets a list of (scene name, level) for every scene that is benchmarked. The level is None for scenes that aren't levels."""
+    scenes = [("startup", None), ("main menu", None)]
+
+    # The first normal level
+    firstLevel = game.levelsList.index("Normal Level")
+    scenes.append((f"level {firstLevel}", firstLevel))
+
+    # Every boss level and cutscene
+    for level, levelType in enumerate(game.levelsList):
+        if levelType == "Boss Level":
+            scenes.append((f"boss level {level}", level))
+
+        elif levelType == "Cutscene":
+            scenes.append((f"cutscene {level}", level))
+
+    return scenes
+
+
+def create_game() -> tuple:
+    """Sets up the game for benchmarking, with an uncapped frame rate, no quality governor, and its own save. Returns the loop and how long it took to set up in milliseconds."""
+    import src.loop # Imported here since it sets up Pygame
+
+    constants.CAP_FPS = False
+    constants.RECORD_INPUTS = False
+    constants.ADAPTIVE_QUALITY = False # So every run does the same work
+
+    setup_save()
+
+    start = time.perf_counter()
+    game = src.loop.Loop()
+    setupTime = (time.perf_counter() - start) * 1000
+
+    if game.errorSettingUp:
+        raise Exception("The game failed to start up, check the event log for the error")
+
+    # Logging every frame would slow down the benchmark
+    logging.disable(logging.INFO)
+
+    return game, setupTime
+
+
+def get_system_info() -> dict:
+    """Gets the versions and platform the benchmark was run on"""
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform()
+    }
+
+
+def run(frames, warmupFrames, sceneNames = None, replayPath = None) -> dict:
+    """
+    Runs every scene (or only the scenes named) for the amount of frames given after the warmup frames, and plays back the replay if one is given.
+    Returns a dictionary of the results.
+    """
+    import src.loop
+
+    game, setupTime = create_game()
+
+    game.window.replayer = ScriptedInputs()
+
+    results = {
+        "frames": frames,
+        "warmupFrames": warmupFrames,
+        "setupMs": setupTime,
+        **get_system_info(),
+        "scenes": {}
+    }
+
+    for name, level in get_scenes(game):
+        if sceneNames and name not in sceneNames:
+            continue
+
+        if name == "startup":
+            # The loop starts in the startup animation, so it isn't warmed up
+            frameTimes = time_frames(game, frames, scene = "startup")
+
+        else:
+            if level is None: # Main menu
+                game.transitionImg = None
+                game.scene = "mainMenu"
+                game.scenes["mainMenu"].start_music()
+
+            else:
+                # The loop reads the level it's in from game.level (such as when finishing it), so it's set like when playing
+                game.level = level
+                game.switch_to_new_scene(level)
+
+            # Stopping when the scene ends, so frames of the next scene aren't measured as this one
+            scene = game.scene
+            time_frames(game, warmupFrames, scene = scene)
+            frameTimes = time_frames(game, frames, scene = scene)
+
+        results["scenes"][name] = get_stats(frameTimes)
+        # Scenes that ended before all of the frames were measured (such as a short cutscene)
+        results["scenes"][name]["stoppedEarly"] = len(frameTimes) < frames
+        print_progress(name, results["scenes"][name])
+
+    # Milliseconds from when the game started setting up until the first frame and until the main menu took inputs
+    # The startup animation isn't capped to the frame rate either, so the time until the main menu took inputs is shorter than when playing
+    results["startup"] = dict(game.startupTimes)
+
+    if replayPath is not None and (not sceneNames or "replay" in sceneNames):
+        # Playing back the replay from the start with its own save and seed
+        replayGame = src.loop.Loop(replayPath = replayPath)
+        logging.disable(logging.INFO)
+
+        frameTimes = time_frames(replayGame, replayGame.window.replayer.totalFrames)
+
+        results["scenes"]["replay"] = get_stats(frameTimes)
+        results["scenes"]["replay"]["path"] = replayPath
+        print_progress("replay", results["scenes"]["replay"])
+
+    logging.disable(logging.NOTSET)
+
+    return results
+
+
+def run_pacing(frames, warmupFrames, strategies = None) -> dict:
+    """
+    Runs the first normal level with the frame rate capped once with each frame pacing strategy (or only the ones named),
+    returning how far the time between frames is from the target (the jitter) and how much of the CPU was used with each.
+    Without a window vsync is unavailable, so the vsync strategy falls back to the hybrid strategy.
+    """
+    game = create_game()[0]
+    game.window.replayer = ScriptedInputs()
+    constants.CAP_FPS = True
+
+    level = game.levelsList.index("Normal Level")
+
+    results = {
+        "frames": frames,
+        "warmupFrames": warmupFrames,
+        "fps": constants.FPS,
+        **get_system_info(),
+        "strategies": {}
+    }
+
+    for strategy in strategies or src.frame_pacer.FramePacer.STRATEGIES:
+        game.window.pacer = src.frame_pacer.FramePacer(constants.FPS, strategy, game.window.vsync)
+        game.level = level
+        game.switch_to_new_scene(level)
+        time_frames(game, warmupFrames)
+
+        cpuStart = time.process_time()
+        start = time.perf_counter()
+        # Each frame's time includes waiting, so it's the time between frames
+        jitters = np.abs(np.array(time_frames(game, frames)) - 1000 / constants.FPS)
+        cpuUsage = (time.process_time() - cpuStart) / (time.perf_counter() - start)
+
+        results["strategies"][strategy] = {
+            "used": game.window.pacer.strategy,
+            "meanJitter": float(jitters.mean()),
+            "p99Jitter": float(np.percentile(jitters, 99)),
+            "maxJitter": float(jitters.max()),
+            "cpuUsage": cpuUsage
+        }
+
+        stats = results["strategies"][strategy]
+        print(f"{strategy}: {stats['meanJitter']:.3f}ms mean jitter, {stats['p99Jitter']:.3f}ms p99, {stats['cpuUsage'] * 100:.0f}% CPU", file = sys.stderr)
+
+    constants.CAP_FPS = False
+    logging.disable(logging.NOTSET)
+
+    return results
+
+
+def compare(results, baseline, threshold) -> list:
+    """
+    Compares the results to the baseline results, returning a list of the regressions found as text.
+    A regression is when a compared statistic of a scene is slower than the baseline by more than the threshold (0.1 being 10% slower).
+    Scenes which measured a different amount of frames than in the baseline (such as one that stopped early) aren't compared.
+    """
+    regressions = []
+
+    for name, stats in results["scenes"].items():
+        if name not in baseline["scenes"]:
+            continue
+
+        if stats["frames"] != baseline["scenes"][name]["frames"]:
+            print(f"{name}: not compared, {stats['frames']} frames were measured but the baseline measured {baseline['scenes'][name]['frames']}", file = sys.stderr)
+            continue
+
+        for stat in COMPARED_STATS:
+            before = baseline["scenes"][name][stat]
+            after = stats[stat]
+
+            if after > before * (1 + threshold):
+                regressions.append(f"{name} {stat}: {before:.2f}ms -> {after:.2f}ms ({(after / before - 1) * 100:+.0f}%)")
+
+    return regressions
+
+
+def write_json(results, filePath):
+    """Writes the results to a JSON file, creating its folder if it doesn't exist"""
+    folder = os.path.dirname(filePath)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder)
+
+    with open(filePath, "w") as file:
+        json.dump(results, file, indent = 4)
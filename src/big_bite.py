@@ -1,9 +1,10 @@
 import pygame
 import logging
-import random
 
 import src.constants as constants
+import src.utility as utility
 import src.animation
+import src.culling as culling
 
 class BigBite:
     """
@@ -26,7 +27,7 @@ class BigBite:
         """Resets the boss to the default state"""
         self.logger.info("Resetting Big Bite boss")
 
-        self.delayCounter = random.randint(constants.BIG_BITE_ATTACK_DELAY[0], constants.BIG_BITE_ATTACK_DELAY[1]) # For counting the frames between the attacks
+        self.delayCounter = utility.gameRandom.randint(constants.BIG_BITE_ATTACK_DELAY[0], constants.BIG_BITE_ATTACK_DELAY[1]) # For counting the frames between the attacks
         self.attacking = False
 
         self.position = None
@@ -35,12 +36,11 @@ class BigBite:
 
     def update(
         self, 
-        playerMask, # The player's mask object
-        playerPosition, # The player's position in the level
+        collisionManager, # Where the boss is registered when attacking
         tilesOffset, # The offset of the level
         room # The room number the player is in
         ):
-        """Updates the boss, checking for collisions and also updating cooldowns"""
+        """Updates the boss and its cooldowns, registering it with the collision manager on the frame it attacks"""
         if not self.attacking: # If the boss is not on screen
             self.delayCounter -= 1
 
@@ -48,15 +48,15 @@ class BigBite:
                 self.logger.info("Appearing")
 
                 # Choosing a random delay in the range given in constants for the next time
-                self.delayCounter = random.randint(constants.BIG_BITE_ATTACK_DELAY[0], constants.BIG_BITE_ATTACK_DELAY[1])
+                self.delayCounter = utility.gameRandom.randint(constants.BIG_BITE_ATTACK_DELAY[0], constants.BIG_BITE_ATTACK_DELAY[1])
                 self.attacking = True
 
                 self.animation.reset()
 
                 # Choosing a random position on screen
                 self.position = (
-                    random.randint(0, constants.SCREEN_SIZE[0] - self.animation.get_image_width()) - tilesOffset,
-                    random.randint(0, constants.SCREEN_SIZE[1] - self.animation.get_image_height())
+                    utility.gameRandom.randint(0, constants.SCREEN_SIZE[0] - self.animation.get_image_width()) - tilesOffset,
+                    utility.gameRandom.randint(0, constants.SCREEN_SIZE[1] - self.animation.get_image_height())
                 )
 
                 self.room = room
@@ -67,25 +67,29 @@ class BigBite:
 
             # If the animation is on the frame where the Big Bite attacks
             if self.animation.frame == constants.BIG_BITE_ATTACK_FRAME:
-                # Mask from the animation
-                bbMask = pygame.mask.from_surface(self.animation.get_frame())
-
                 # Position on screen
                 onScreenX = self.position[0] + tilesOffset - ((room - self.room) * constants.SCREEN_SIZE[0])
                 
-                # COllision CHECKING
-                collided = bbMask.overlap(
-                    playerMask, 
-                    (playerPosition[0] + tilesOffset - onScreenX, 
-                     playerPosition[1] - self.position[1])
+                # Registering so collisions with the player are checked
+                collisionManager.register(
+                    "Big Bite",
+                    (onScreenX, self.position[1]),
+                    (self.animation.get_image_width(), self.animation.get_image_height()),
+                    self.animation.get_mask
                 )
-
-                return collided
         
     
+    def get_bounds(self, tilesOffset, playerRoom) -> "pygame.Rect":
+        """Gets the rectangle the boss is drawn in on the screen"""
+        return self.animation.get_bounds((
+            self.position[0] + tilesOffset - ((playerRoom - self.room) * constants.SCREEN_SIZE[0]), 
+            self.position[1]
+        ))
+
+
     def render(self, window, tilesOffset, playerRoom):
-        """Renders animation frame if the boss is attacking"""
-        if self.attacking:
+        """Renders animation frame if the boss is attacking and on the screen"""
+        if self.attacking and culling.is_visible(self.get_bounds(tilesOffset, playerRoom)):
             self.animation.render(
                 window, 
                 (self.position[0] + tilesOffset - ((playerRoom - self.room) * constants.SCREEN_SIZE[0]), 
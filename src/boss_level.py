@@ -2,10 +2,15 @@ import pygame
 
 import src.base_level
 import src.tile_renderer
+import src.layer_compositor
+import src.culling as culling
 import src.belloq
 import src.big_bite
 import src.red_stare
+import src.projectile_pool
 import src.constants as constants
+import src.profiler as profiler
+import src.frame_stats as frame_stats
 
 class BossLevel(src.base_level.BaseLevel):
     """
@@ -32,11 +37,24 @@ class BossLevel(src.base_level.BaseLevel):
 
         self.tilesOffset = 0
 
-        # Transparent surface used for entity rendering
-        self.empty_surf = pygame.Surface(constants.SCREEN_SIZE, flags = pygame.SRCALPHA)
+        # Every boss's projectiles (such as lazers)
+        self.projectiles = src.projectile_pool.ProjectilePool(constants.PROJECTILE_POOL_SIZE)
+
+        # Transparent surface used for entity rendering, cleared every frame
+        self.entitiesSurf = pygame.Surface(constants.SCREEN_SIZE, flags = pygame.SRCALPHA)
         
         self.bossName = None
 
+        # Layers the level is drawn with, from the bottom up
+        # The tiles scroll with the player, so nothing can be cached
+        self.layers = src.layer_compositor.LayerCompositor()
+        self.layers.add("tiles", "dynamic", self.render_tiles)
+        self.layers.add("entities", "dynamic", self.render_entities)
+        self.layers.add("bosses", "dynamic", self.render_bosses)
+        self.layers.add("gravity beam", "animated", super().render_grav_beam)
+        self.layers.add("screen shadow", "static", super().render_screen_shadow)
+        self.layers.add("popup", "animated", super().render_popup)
+
 
     def setup(self, boss, level, crystals, crystalIndex, entities = True):
         """Extends the "setup" method from the BaseLevel class, setting up bosses as well."""
@@ -45,16 +63,17 @@ class BossLevel(src.base_level.BaseLevel):
         self.load_rooms()
 
         self.bosses = {}
+        self.projectiles.clear()
 
         # Creating bosses
         if "Belloq" in boss:
-            self.bosses["Belloq"] = src.belloq.Belloq()
+            self.bosses["Belloq"] = src.belloq.Belloq(self.projectiles)
         
         if "Big Bite" in boss:
             self.bosses["Big Bite"] = src.big_bite.BigBite()
         
         if "Red Stare" in boss:
-            self.bosses["Red Stare"] = src.red_stare.RedStare()
+            self.bosses["Red Stare"] = src.red_stare.RedStare(self.projectiles)
 
         # The minimum tile offset that it can be 
         # so, when the player reaches the end of the level, it can't scroll off the screen
@@ -79,6 +98,7 @@ class BossLevel(src.base_level.BaseLevel):
     def load_rooms(self):
         """Renders the rooms to a Pygame Surface and adds that to the tileSurface list"""
         self.logger.info("Loading tiles in surrounding rooms")
+        frame_stats.event("load_rooms")
 
         self.tileSurfaces.clear()
 
@@ -112,11 +132,13 @@ class BossLevel(src.base_level.BaseLevel):
     
     def update(self, window):
         """Updates everything in the boss level, such as the boss object, the player, and the tile rendering offset"""
+        profiler.start("level")
         result = super().update(
             window.inputs, 
             self.tileRenderers[self.playerRoomIndex],
             playerSpawnOffset = 0 # change maybe soon
         )
+        profiler.stop()
 
         if result == "right": # If the player moved to the next room or level
             # If the room variable was reset (by the BaseLevel class), meaning the player moved to the next level
@@ -153,42 +175,63 @@ class BossLevel(src.base_level.BaseLevel):
                 self.playerRoomIndex = 1
                 self.load_rooms()
                 
+        profiler.start("tiles")
         for tr in self.tileRenderers:
             tr.update_tiles_with_anims() # Update any tiles that have animations
+        profiler.stop()
         
+        profiler.start("bosses")
         # Going through all bosses and updating them
+        # Bosses register themselves with the collision manager, which checks them against the player afterwards
+        dead = False
         for name, boss in self.bosses.items():
             if name == "Belloq":
+                # The Belloq's lazers are checked by the Belloq itself
                 dead = boss.update(
                     self.player, 
                     self.room, 
                     len(self.levels[self.level]), 
-                    self.tilesOffset
-                )
+                    self.tilesOffset,
+                    self.collisionManager
+                ) or dead
 
             elif name == "Big Bite":
-                dead = boss.update(
-                    self.player.get_mask(), 
-                    self.player.rect.topleft, 
+                boss.update(
+                    self.collisionManager,
                     self.tilesOffset,
                     self.room
                 )
             
             elif name == "Red Stare":
-                dead = boss.update(
+                boss.update(
                     self.player,
                     self.room,
-                    self.tilesOffset
+                    self.tilesOffset,
+                    self.collisionManager
                 )
+        profiler.stop()
+
+        profiler.start("collisions")
+        # Checking the registered bosses against the player's position on screen
+        hits = self.collisionManager.resolve(
+            (self.player.rect.x + self.tilesOffset, self.player.rect.y),
+            self.player.get_mask()
+        )
+        profiler.stop()
 
-            if dead: 
-                self.restart_level()
-                super().popup("You Died!")
-                break
+        if dead or hits:
+            self.logger.info(f"Player hit by {', '.join(hits) if hits else 'lazer'}")
+            self.restart_level()
+            super().popup("You Died!")
     
     
     def render(self, window):
-        """Renders everything in the boss level to the screen"""
+        """Renders everything in the boss level to the screen with the level's layers"""
+        self.layers.render(window)
+
+
+    def render_tiles(self, window):
+        """Renders the tiles of the room the player is in, and the room next to it if it's on screen"""
         # Rendering the tiles of the room the player is in
         window.blit(self.tileSurfaces[self.playerRoomIndex], (self.tilesOffset, 0))
         self.tileRenderers[self.playerRoomIndex].render_tiles_with_anims(window, self.gravityDir, self.gravBeamYPos, offset = self.tilesOffset)
@@ -199,24 +242,25 @@ class BossLevel(src.base_level.BaseLevel):
         else:
             otherRoomIndex = 0
             otherRoomX = self.tilesOffset - constants.SCREEN_SIZE[0]
-        
+    
         # Rendering the tiles of the other room on screen if there is one
-        window.blit(self.tileSurfaces[otherRoomIndex], (otherRoomX, 0))
-        self.tileRenderers[otherRoomIndex].render_tiles_with_anims(window, self.gravityDir, self.gravBeamYPos, offset = otherRoomX)
+        if culling.is_visible(culling.camera.move(otherRoomX, 0)):
+            window.blit(self.tileSurfaces[otherRoomIndex], (otherRoomX, 0))
+            self.tileRenderers[otherRoomIndex].render_tiles_with_anims(window, self.gravityDir, self.gravBeamYPos, offset = otherRoomX)
+
 
-        entitiesSurf = self.empty_surf.copy() # Surface for entities to render to
+    def render_entities(self, window):
+        """Renders the player, Ellipse, and Corlen with the tile offset"""
+        self.entitiesSurf.fill((0, 0, 0, 0)) # Clearing the surface for entities to render to
         super().render(
-            entitiesSurf, 
+            self.entitiesSurf, 
             offset = self.tilesOffset, 
             renderWithCheck = False
         ) # Renders entities with the tile offset onto the entities surface
-        window.blit(entitiesSurf, (0, 0)) # Rendering entities surf onto the screen
+        window.blit(self.entitiesSurf, (0, 0)) # Rendering entities surf onto the screen
 
-        # Rendering bosses
-        for boss in self.bosses.values():
-            boss.render(window, self.tilesOffset, self.room)
 
-        # Rendering other things
-        super().render_grav_beam(window)
-        super().render_screen_shadow(window)
-        super().render_popup(window)
\ No newline at end of file
+    def render_bosses(self, window):
+        """Renders the bosses with the tile offset"""
+        for boss in self.bosses.values():
+            boss.render(window, self.tilesOffset, self.room)
\ No newline at end of file
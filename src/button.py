@@ -2,6 +2,7 @@ import pygame
 import math
 
 import src.constants as constants
+import src.asset_loader as asset_loader
 
 class Button:
     """
@@ -52,7 +53,7 @@ class Button:
             if image is not None:
                 self.image = image
             else:
-                self.image = pygame.image.load(imagePath).convert()
+                self.image = asset_loader.load_image(imagePath).convert()
 
             # Centers x, gets width and height of the image as the rect for the button
             self.rect = pygame.Rect((
@@ -65,10 +66,59 @@ class Button:
             if toggle: # If specified that it's toggled
                 self.toggled = False
                 # Loading toggle image
-                self.toggleImg = pygame.image.load(toggledImgPath)
+                self.toggleImg = asset_loader.load_image(toggledImgPath)
+
+        self.create_highlight_images()
 
         self.reset() # Sets up other variables to default states
 
+
+    def create_highlight_images(self):
+        """
+        Creates the two images the button is drawn with, the same size as the button, so they don't need to be created every frame.
+        The top image is the "normal" button, and the highlighted image is the reversed button, with only part of each drawn when highlighted.
+        """
+        # The "normal" part
+        self.topImage = pygame.Surface(self.rect.size)
+        # The reversed and "highlighted" part
+        self.highlightedImage = pygame.Surface(self.rect.size, flags = pygame.SRCALPHA)
+
+        if self.isText:
+            # Text
+            self.topImage.blit(self.fontRendered, (self.textOffset, 0)) # Rendering text
+            self.topImage.set_colorkey(constants.BLACK) # Removes black background
+
+            self.highlightedImage.fill(constants.WHITE)
+
+            # Getting the text surface but black
+            blackFont = self.fontObj.render(self.text, False, constants.BLACK)
+            # Rendering onto the highlighted surface
+            self.highlightedImage.blit(blackFont, (self.textOffset, 0))
+            self.highlightedImage.set_colorkey(constants.BLACK) # Makes the text part transparent
+        
+        else:
+            # Image
+
+            # Normal top section rendering
+            self.topImage.blit(self.image, (0, 0))
+            self.topImage.set_colorkey(constants.BLACK)
+
+            # Copies image and makes the white part transparent
+            noWhite = self.image.copy()
+            noWhite.set_colorkey(constants.WHITE)
+
+            # Creates a copy of the image with no white, but this time solidifying the colorkey so the pixelarray doesn't see the white section of the image
+            reversed = pygame.Surface(noWhite.get_size(), flags = pygame.SRCALPHA)
+            reversed.blit(noWhite, (0, 0))
+
+            # Turns the black background to white
+            pixelArr = pygame.PixelArray(reversed)
+            pixelArr.replace(constants.BLACK, constants.WHITE)
+            del pixelArr
+
+            # Drawing onto the highlighted section
+            self.highlightedImage.blit(reversed, (0, 0))
+
     
     def reset(self):
         """Resets button to the default state"""
@@ -110,56 +160,29 @@ class Button:
         return False
 
 
-    def render(self, window):
-        """Renders the button with its highlight effect"""
-        if round(self.highlightYPos) != 0: # If it's highlighted at least partially
-            cielHYPos = math.ceil(self.highlightYPos) # Rounded up highlighted y position
-
-            # Top section of the button, the "normal" part
-            topHalf = pygame.Surface((self.rect.width, self.rect.height - cielHYPos))
-            # Bottom section, the reversed and "highlighted" part
-            highlighted = pygame.Surface((self.rect.width, cielHYPos), flags = pygame.SRCALPHA)
-
-            if self.isText:
-                # Text
-                topHalf.blit(self.fontRendered, (self.textOffset, 0)) # Rendering text
-                topHalf.set_colorkey(constants.BLACK) # Removes black background
+    def get_render_state(self) -> tuple:
+        """Gets what changes how the button looks when rendered: the height of the highlight drawn, and whether it's toggled"""
+        highlightHeight = math.ceil(self.highlightYPos) if round(self.highlightYPos) != 0 else 0
+        return highlightHeight, self.toggleable and self.toggled
 
-                highlighted.fill(constants.WHITE)
 
-                # Getting the text surface but black
-                blackFont = self.fontObj.render(self.text, False, constants.BLACK)
-                # Rendering onto the highlighted surface, up above it so it only shows the bottom section (or however much is highlighted) of the text
-                highlighted.blit(blackFont, (self.textOffset, -(self.rect.height - cielHYPos)))
-                highlighted.set_colorkey(constants.BLACK) # Makes the text part transparent
-            
-            else:
-                # Image
-
-                # Normal top section rendering
-                topHalf.blit(self.image, (0, 0))
-                topHalf.set_colorkey(constants.BLACK)
-
-                # Copies image and makes the white part transparent
-                noWhite = self.image.copy()
-                noWhite.set_colorkey(constants.WHITE)
+    def is_moving(self) -> bool:
+        """Checks if the highlight is still moving enough to change how the button looks, which it does until it's drawn filled or empty"""
+        if self.selected and not self.clicked:
+            return self.get_render_state()[0] != self.rect.height
 
-                # Creates a copy of the image with no white, but this time solidifying the colorkey so the pixelarray doesn't see the white section of the image
-                reversed = pygame.Surface(noWhite.get_size(), flags = pygame.SRCALPHA)
-                reversed.blit(noWhite, (0, 0))
+        return self.get_render_state()[0] != 0
 
-                # Turns the black background to white
-                pixelArr = pygame.PixelArray(reversed)
-                pixelArr.replace(constants.BLACK, constants.WHITE)
-                del pixelArr
 
-                # Drawing onto the highlighted section
-                highlighted.blit(reversed, (0, -(self.rect.height - cielHYPos)))
-                
+    def render(self, window):
+        """Renders the button with its highlight effect"""
+        if round(self.highlightYPos) != 0: # If it's highlighted at least partially
+            cielHYPos = math.ceil(self.highlightYPos) # Rounded up highlighted y position
+            topHeight = self.rect.height - cielHYPos
 
-            # Rendering both sections
-            window.blit(topHalf, self.rect.topleft)
-            window.blit(highlighted, (self.rect.x, self.rect.y + (self.rect.height - cielHYPos)))
+            # Rendering the top section of the normal image, and the bottom section (or however much is highlighted) of the highlighted image
+            window.blit(self.topImage, self.rect.topleft, (0, 0, self.rect.width, topHeight))
+            window.blit(self.highlightedImage, (self.rect.x, self.rect.y + topHeight), (0, topHeight, self.rect.width, cielHYPos))
 
         
         else:
@@ -170,10 +193,8 @@ class Button:
                 window.blit(self.fontRendered, (self.rect.x + self.textOffset, self.rect.y))
             
             else:
-                # Image
-                noBG = self.image.copy() # Copying
-                noBG.set_colorkey(constants.BLACK) # Setting the background to transparent
-                window.blit(noBG, self.rect.topleft)
+                # Image, with the background transparent
+                window.blit(self.topImage, self.rect.topleft)
 
 
         # Rendering toggle image if the button is toggled
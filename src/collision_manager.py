@@ -0,0 +1,84 @@
+import src.instrumentation as instrumentation
+
+def rects_overlap(position, size, targetPosition, targetSize) -> bool:
+    """Checks if two rectangles overlap, with one pixel of leeway since mask offsets are rounded"""
+    return (position[0] - 1 < targetPosition[0] + targetSize[0] and targetPosition[0] < position[0] + size[0] + 1 and
+            position[1] - 1 < targetPosition[1] + targetSize[1] and targetPosition[1] < position[1] + size[1] + 1)
+
+
+def masks_overlap(maskSource, position, targetPosition, targetMask) -> bool:
+    """
+    Pixel perfect check between a hazard's mask and the target's mask.
+    The mask source can either be a mask or a function that returns one, so it's only created when needed.
+    """
+    mask = maskSource() if callable(maskSource) else maskSource
+
+    return mask.overlap(
+        targetMask,
+        (targetPosition[0] - position[0],
+         targetPosition[1] - position[1])
+    ) is not None
+
+
+def overlap(position, size, maskSource, targetPosition, targetMask) -> bool:
+    """Checks if a hazard at the position given overlaps the target, only comparing masks if the rectangles overlap"""
+    if not rects_overlap(position, size, targetPosition, targetMask.get_size()):
+        return False
+
+    return masks_overlap(maskSource, position, targetPosition, targetMask)
+
+
+class CollisionManager:
+    """
+    Checks collisions between the player and hazards (spikes and bosses).
+    Hazards are registered every frame with their position, size, and mask,
+    and are checked with a rectangle check before the pixel perfect mask check.
+    Counts how many hazards there were, how many passed the rectangle check, how many masks were compared, and how many hit.
+    These counters are shown on the debug overlay.
+    """
+    def __init__(self):
+        """Sets up the list of hazards registered this frame"""
+        self.hazards = []
+
+
+    def add_counts(self, hazards = 0, candidates = 0, maskTests = 0, hits = 0):
+        """Adds to the counters. Used by hazards that do their own collision checks (such as the Belloq's lazers)."""
+        instrumentation.count("collision hazards", hazards)
+        instrumentation.count("collision candidates", candidates)
+        instrumentation.count("collision mask tests", maskTests)
+        instrumentation.count("collision hits", hits)
+
+
+    def test(self, position, size, maskSource, targetPosition, targetMask) -> bool:
+        """Checks a single hazard against the target right away, returning True if they collided"""
+        instrumentation.count("collision hazards")
+
+        if not rects_overlap(position, size, targetPosition, targetMask.get_size()):
+            return False
+
+        instrumentation.count("collision candidates")
+        instrumentation.count("collision mask tests")
+
+        collided = masks_overlap(maskSource, position, targetPosition, targetMask)
+        if collided:
+            instrumentation.count("collision hits")
+
+        return collided
+
+
+    def register(self, owner, position, size, maskSource):
+        """Registers a hazard to be checked the next time resolve() is called. The owner is returned if the hazard hits."""
+        self.hazards.append((owner, position, size, maskSource))
+
+
+    def resolve(self, targetPosition, targetMask) -> list:
+        """Checks all registered hazards against the target, returning a list of the owners of the hazards that hit. Clears the registered hazards."""
+        hits = []
+
+        for owner, position, size, maskSource in self.hazards:
+            if self.test(position, size, maskSource, targetPosition, targetMask):
+                hits.append(owner)
+
+        self.hazards.clear()
+
+        return hits
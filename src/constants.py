@@ -1,13 +1,26 @@
-import pygame
-
-import src.utility as utility
+"""
+Nothing here is loaded from the disk or needs Pygame when this file is imported, so anything can import it quickly.
+The animation data (ANIMATION_MANIFEST) and the keys (KEY_BINDINGS) are loaded the first time they're used instead (see __getattr__).
+"""
 
 """  File paths for multiple things  """
 SAVE_PATH = "saves/save.db"
 EVENT_LOG_PATH = "saves/events.log"
 CRASH_REPORT_PATH = "saves/crash"
 
+REPLAYS_FOLDER = "saves/replays" # Recordings of the inputs of play sessions
+REPLAY_SAVE_PATH = "saves/replay_save.db" # Save file used while playing back a replay
+REPLAY_EXTENSION = "rep"
+
+BENCHMARK_SAVE_PATH = "saves/benchmark_save.db" # Save file used while benchmarking (bench.py)
+BENCHMARKS_FOLDER = "saves/benchmarks" # Results of the micro-benchmarks
+
+PROFILES_FOLDER = "saves/profiles" # Frame timings exported by the profiler as CSV files
+HITCHES_FOLDER = "saves/hitches" # Hitches logged by the frame stats (src/frame_stats.py), dumped as JSON files
+ASSET_CACHE_FOLDER = "saves/asset_cache" # Images already converted to the screen's pixel format, loaded instead of decoding the PNGs (see src/asset_loader.py)
+
 CTM_LOGO_PATH = "res/ui/CTM_logo.png" # Cognitive Thought Media (Company Logo)
+INTRO_SOUND_PATH = "res/sound/Intro.wav" # Played with the logo
 TIN_LOGO_PATH = "res/ui/TIN_logo.png" # There Is Nothing (Game Logo)
 
 FONT_PATH = "res/font/monogram.ttf"
@@ -48,6 +61,9 @@ LEVEL_EDITING = False
 
 BUTTON_HIGHLIGHT_SPEED = 10 # The higher this goes, the slower buttons fills up when hovering a mouse over it.
 
+RECORD_INPUTS = True # Records the inputs of every session to the replays folder
+REPLAYS_KEPT = 10 # Amount of replays kept in the replays folder before the oldest ones are removed
+
 SCREEN_SHAKE_POWER = 2 # How intense screenshakes are (in cutscenes)
 
 POPUP_TEXT_DURATION = 60 # How long the popup text stays on screen until it starts fading
@@ -65,6 +81,32 @@ YELLOW = (255, 255, 0)
 CAP_FPS = True # True/False to cap FPS
 FPS = 60 # Frame rate of the screen
 
+# Order the loop runs each frame in (see Loop.run_frame):
+# "normal" shows the last frame and waits before running the next one, "low" shows each frame as soon as it's rendered and waits after it,
+# and "late latch" waits before polling the inputs instead, for as long as the frame can still be shown in time
+LATENCY_MODE = "normal"
+LATE_LATCH_MARGIN = 2 # Milliseconds the late latch mode leaves spare in case a frame takes longer than usual
+LATENCY_SMOOTHING = 0.05 # How quickly the average input latency and frame work time follow the latest frames
+
+# How the game waits for the next frame (see src/frame_pacer.py): "sleep", "hybrid" (sleeping then spinning), "spin", or "vsync"
+PACING_STRATEGY = "sleep"
+PACING_SPIN_TIME = 1 # Milliseconds the hybrid strategy spins for instead of sleeping at the end of each wait
+PACING_HISTORY = 120 # Amount of the last frames the average and largest jitter are taken from
+
+# Turning off optional visual work when frames take too long (see src/quality.py)
+ADAPTIVE_QUALITY = True # True/False to let the quality governor turn things off
+QUALITY_WINDOW = 30 # Frames the median frame work time is taken from for each check
+QUALITY_LOWER_THRESHOLD = 0.9 # Fraction of the frame budget the median work time has to go over to turn the next thing off
+QUALITY_RAISE_THRESHOLD = 0.6 # Fraction of the frame budget the median work time has to stay under to turn the last thing back on
+QUALITY_RAISE_WINDOWS = 4 # Checks in a row the work time has to stay under the raise threshold for before turning something back on
+
+# Waiting for inputs on the menus instead of running every frame when nothing on them is moving (see Loop.is_idle)
+IDLE_THROTTLING = True # True/False to wait for inputs when idle
+IDLE_TIMEOUT = 250 # Most milliseconds to wait for an input, so anything that changes without one (like the FPS counter) is still shown
+
+PRELOAD_ASSETS = True # Decodes the images on a background thread during the startup animation (see src/asset_loader.py)
+CACHE_ASSETS = True # Keeps converted copies of the images in the asset cache folder, so they don't have to be decoded again next time
+
 TILE_SIZE = (16, 16) # Size in pixels of the tiles
 SCREEN_TILE_SIZE = (24, 14) # Amount of tiles on the screen by X and Y
 SCREEN_SIZE = (
@@ -73,9 +115,17 @@ SCREEN_SIZE = (
 ) # Size of the screen in pixels, not including scale factor
 
 PX_SCALE_FACTOR = 3 # This is the scale factor of everything being rendered to the screen
+FRAME_BUFFER_COUNT = 2 # Amount of surfaces the loop takes turns rendering frames to
+
+# How the screen is scaled up to the window (see Window.set_scaling_mode in src/window.py):
+# "integer", "scaled", "letterbox" (fullscreen), or "auto" to use the fastest of "integer" and "scaled"
+SCALING_MODE = "auto"
+SCALING_TEST_FRAMES = 20 # Frames shown with each scaling mode when choosing one automatically
+SCALING_TIME_SMOOTHING = 0.05 # How quickly the reported time taken to scale and show each frame follows the latest frames
 
 VERTICAL_TEXT_GAP = 12 # Gap between text in places that render multiple lines of text
 TEXT_BOB_INTENSITY = 3 # When text bobs, how strong it should be
+TEXT_CACHE_SIZE = 256 # Amount of rendered text surfaces kept in the text cache (src/text_cache.py)
 
 # These are the separaters in the levels.txt file.
 LEVEL_SEPARATOR = "\n------------------------\n"
@@ -84,10 +134,43 @@ ROOM_SEPARATOR = "\n||||||||||||||||||||||||\n"
 # The assignment of leveldata
 ASSIGNMENT_SEPARATOR = " = "
 
-# These are the keys which will trigger the movement of the player.
-LEFT_KEYS = (pygame.K_LEFT, pygame.K_a)
-RIGHT_KEYS = (pygame.K_RIGHT, pygame.K_d)
-UP_KEYS = (pygame.K_UP, pygame.K_w)
+# Names of the keys (pygame.K_<name>) each constant is set to, looked up in Pygame when first used
+KEY_BINDINGS = {
+    # These are the keys which will trigger the movement of the player.
+    "LEFT_KEYS": ("LEFT", "a"),
+    "RIGHT_KEYS": ("RIGHT", "d"),
+    "UP_KEYS": ("UP", "w"),
+
+    "DEBUG_OVERLAY_KEY": "F3", # Shows/hides the debug overlay
+    "PROFILER_OVERLAY_KEY": "F4", # Shows/hides the profiler's graph of frame timings
+    "PROFILER_EXPORT_KEY": "F5", # Exports the profiler's frame timings to the profiles folder
+    "HITCH_DUMP_KEY": "F6" # Dumps the hitch log and frame times to the hitches folder
+}
+
+DEBUG_OVERLAY_SHADE = (70, 70, 70) # Multiplied with the area behind the debug overlay's text to darken it
+DEBUG_ALLOCATIONS = False # Counts the surfaces created every frame, shown on the debug overlay (src/allocation_counter.py)
+
+PROFILER_HISTORY = 240 # Amount of frames the profiler keeps timings for
+PROFILER_GRAPH_FRAMES = 120 # Amount of the latest frames shown on the graph, one pixel wide each
+PROFILER_GRAPH_SCALE = 4 # Pixels of height in the graph per millisecond
+
+FRAME_STATS_HISTORY = 600 # Amount of the last frames the frame time percentiles are taken from
+FRAME_STATS_BUCKET_MS = 0.25 # Width of each bucket of the frame time histogram in milliseconds
+FRAME_STATS_MAX_MS = 250 # Frames longer than this go in the last bucket of the histogram
+HITCH_THRESHOLD = 2 # Frames taking longer than this many frame budgets (1/FPS of a second) are logged as hitches
+HITCH_LOG_SIZE = 100 # Amount of the latest hitches kept in the log
+# Colors of the main phases of a frame in the profiler's graph
+PROFILER_COLORS = {
+    "inputs": (255, 0, 255),
+    "update": (0, 160, 255),
+    "render": (0, 220, 0),
+    "hud": (255, 255, 0),
+    "transition": (140, 140, 255),
+    "scale": (255, 140, 0),
+    "display flip": (255, 60, 60),
+    "clock tick": (110, 110, 110),
+    "other": (200, 200, 200)
+}
 
 # Player constants
 JUMP_FORCE = 3.6 # Upward force
@@ -185,19 +268,26 @@ NO_ROTATE_TILES = (
     "m"
 )
 
-# These tiles have animations
-TILES_WITH_ANIMATIONS = utility.load_json("res/tiles/animated/anim_dat.json")
+# JSON files each constant is loaded from when first used
+ANIMATION_MANIFEST = {
+    # These tiles have animations
+    "TILES_WITH_ANIMATIONS": "res/tiles/animated/anim_dat.json",
+
+    # Animation data for the Player, Ellipse, and Corlen
+    "PLAYER_ANIMATIONS": "res/characters/player/animations.json",
+    "ELLIPSE_ANIMATIONS": "res/characters/ellipse/animations.json",
+    "CORLEN_ANIMATIONS": "res/characters/corlen/animations.json",
 
-# Animation data for the Player, Ellipse, and Corlen
-PLAYER_ANIMATIONS = utility.load_json("res/characters/player/animations.json")
-ELLIPSE_ANIMATIONS = utility.load_json("res/characters/ellipse/animations.json")
-CORLEN_ANIMATIONS = utility.load_json("res/characters/corlen/animations.json")
+    # The Belloq is the first boss
+    # This holds the animations for the Belloq, their paths, frames, and delays
+    "BELLOQ_ANIMATIONS": "res/characters/belloq/animations.json",
+
+    "RED_STARE_ANIMATIONS": "res/characters/red_stare/animations.json"
+}
 
 PLAYER_WIDTH = 8 # In pixels
 
-# The Belloq is the first boss
-# This holds the animations for the Belloq, their paths, frames, and delays
-BELLOQ_ANIMATIONS = utility.load_json("res/characters/belloq/animations.json")
+# The Belloq is the first boss (its animations are in the animation manifest)
 BELLOQ_SPEED = 0.75 # Pixels moved per frame
 BELLOQ_COOLDOWN = 60 # Frames between lazers
 BELLOQ_LAZER_OFFSET = (33, 17) # Position of the eye in relation to the top left of the sprite
@@ -212,6 +302,8 @@ LAZER_SPEED = 2 # Pixels moved per frame
 LAZER_LENGTH = 20 # Length of each lazer in pixels
 LAZER_COLOR = (255, 255, 0) # Color of the lazer
 
+PROJECTILE_POOL_SIZE = 256 # Amount of projectiles (such as lazers) that can be on screen before the pool has to grow
+
 # Big Bite Boss constants
 BIG_BITE_ANIM_PATH = "res/characters/big_bite/anim.png"
 BIG_BITE_ATTACK_FRAME = 3 # The frame number in the animation in which collisions are checked between the player and the boss
@@ -219,7 +311,6 @@ BIG_BITE_TOTAL_FRAMES = 5
 BIG_BITE_DELAY = 15 # The delay between frames in the animation, in game frames (60 frames per second)
 BIG_BITE_ATTACK_DELAY = (5, 40) # The delay between each attack in frames. It is randomly chosen between these two numbers
 
-RED_STARE_ANIMATIONS = utility.load_json("res/characters/red_stare/animations.json")
 RED_STARE_COOLDOWN = 50 # Frames between each time it pops up from below the screen to throw its mouth
 RED_STARE_POPUP_RANGE = 100 # Pixels in each direction from the player's X that it can popup at (it's random)
 RED_STARE_POPUP_SPEED = 2 # How many pixels it moves to popup per frame
@@ -231,4 +322,25 @@ GRAV_BEAM_PATH = "res/game/grav_beam.png"
 GRAV_BEAM_DELAY = 2 # Delay between each frame of the beam
 GRAV_BEAM_WIDTH = 8 # Width of the beam
 
-GRAV_BEAM_TILE_Y_POS = SCREEN_TILE_SIZE[1] / 2
\ No newline at end of file
+GRAV_BEAM_TILE_Y_POS = SCREEN_TILE_SIZE[1] / 2
+
+
+def __getattr__(name):
+    """
+    Loads a constant in the animation manifest or the key bindings the first time it's used, keeping it so it's only loaded once.
+    Called by Python only for names that aren't set in this file yet.
+    """
+    if name in ANIMATION_MANIFEST:
+        import src.utility as utility
+        value = utility.load_json(ANIMATION_MANIFEST[name])
+
+    elif name in KEY_BINDINGS:
+        import pygame
+        keys = KEY_BINDINGS[name]
+        value = getattr(pygame, f"K_{keys}") if isinstance(keys, str) else tuple(getattr(pygame, f"K_{key}") for key in keys)
+
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
\ No newline at end of file
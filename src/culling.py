@@ -0,0 +1,30 @@
+"""
+This file skips drawing anything which is entirely outside of the camera, the part of the level shown on the screen.
+Renderables get their bounds (the rectangle they're drawn in on the screen, with the tile offset of boss levels applied)
+and check them with is_visible before transforming or blitting anything.
+The amount of things drawn and culled in every frame are counted on the debug overlay (src/debug_overlay.py).
+"""
+
+import pygame
+
+import src.constants as constants
+import src.instrumentation as instrumentation
+
+# The rectangle of the screen, which bounds are compared with since they already have the tile offset applied
+camera = pygame.Rect((0, 0), constants.SCREEN_SIZE)
+
+
+def is_visible(bounds) -> bool:
+    """Checks if the bounds given (a rectangle or an (x, y, width, height) tuple on the screen) are at least partly on the screen, counting it as drawn or culled"""
+    if camera.colliderect(bounds):
+        instrumentation.count("renderables drawn")
+        return True
+
+    instrumentation.count("renderables culled")
+    return False
+
+
+def count(drawn, culled):
+    """Counts renderables checked some other way (such as many at once with NumPy) as drawn or culled"""
+    instrumentation.count("renderables drawn", drawn)
+    instrumentation.count("renderables culled", culled)
@@ -5,9 +5,15 @@ import math
 
 import src.player
 import src.utility as utility
+import src.asset_loader as asset_loader
 import src.constants as constants
+import src.profiler as profiler
+import src.frame_stats as frame_stats
+import src.quality as quality
+import src.culling as culling
 import src.animation
 import src.tile_renderer
+import src.layer_compositor
 
 class Cutscenes():
     """
@@ -24,13 +30,26 @@ class Cutscenes():
 
         self.tileRenderer = src.tile_renderer.TileRenderer()
         
-        self.screenShadow = pygame.image.load(constants.SCREEN_SHADOW_PATH).convert_alpha()
+        self.screenShadow = asset_loader.load_image(constants.SCREEN_SHADOW_PATH).convert_alpha()
         
         self.room = 0
         self.timer = 0
 
-        # Background tiles image
-        self.tiles = pygame.Surface(constants.SCREEN_SIZE)
+        # Layers the scene is drawn with onto the screen surface (which is shaken), from the bottom up
+        # The background tiles are only drawn again when the room changes, since they're cached
+        self.sceneLayers = src.layer_compositor.LayerCompositor()
+        self.sceneLayers.add("tiles", "static", self.render_tiles)
+        self.sceneLayers.add("tile animations", "animated", lambda surface: self.tileRenderer.render_tiles_with_anims(surface, 1, constants.SCREEN_TILE_SIZE[1]))
+        self.sceneLayers.add("background animation", "animated", self.render_background_anim)
+        self.sceneLayers.add("objects", "dynamic", self.render_objects)
+        self.sceneLayers.add("tile objects", "animated", self.render_tile_objects)
+
+        # Layers drawn onto the window, over the screen surface
+        self.layers = src.layer_compositor.LayerCompositor()
+        self.layers.add("scene", "dynamic", self.render_scene)
+        self.layers.add("screen shadow", "static", self.render_screen_shadow)
+        self.layers.add("fade", "dynamic", self.render_fade)
+        self.layers.add("text", "dynamic", self.render_text)
 
         # Animations used for entities
         self.entitiesAnimList = {
@@ -167,15 +186,11 @@ class Cutscenes():
 
     
     def rerender_tiles(self):
-        """Renders the tiles in the background to a surface that's stored and rendered every frame"""
+        """Renders the tiles in the background again, which are cached by the scene's layers and drawn from there every frame"""
         self.logger.info("Rendering background tiles")
+        frame_stats.event("rerender_tiles")
 
-        self.tiles.fill(constants.BLACK)
-        self.tileRenderer.draw_tiles(
-            self.level[self.room], self.room,
-            self.tiles,
-            self.levelData[self.levelNum]["background"]
-        )
+        self.sceneLayers.invalidate("tiles")
         self.tileRenderer.setup_room_tile_anims(self.level[self.room])
 
 
@@ -282,7 +297,7 @@ class Cutscenes():
                     else:
                         if len(comm) == 3: # If it gives an image
                             # Loading image given
-                            self.fadeImage = pygame.image.load(comm[2]).convert_alpha()
+                            self.fadeImage = asset_loader.load_image(comm[2]).convert_alpha()
                         
                         elif len(comm) == 5: # If it gives a solid color
                             # Creates an image filled with purely the color given
@@ -432,6 +447,7 @@ class Cutscenes():
             if self.room == self.cutsceneData["backgroundAnim"]["room"]:
                 self.backgroundAnim.update()
 
+        profiler.start("commands")
         # Interpretting and running timed commands
         for time, commands in self.cutsceneData["time_commands"].items():
             if self.timer == int(time):
@@ -470,8 +486,11 @@ class Cutscenes():
         for command in commandsToBeRun:
             result = self.interpret_commands(command)
             if result is not None:
+                profiler.stop()
                 return result
+        profiler.stop()
         
+        profiler.start("objects")
         # Updating player's animation if not using player object class
         if not self.playerControlled:
             self.objects["player"]["obj"].update_animation()
@@ -507,6 +526,7 @@ class Cutscenes():
 
                     if self.room >= len(self.level): # If the room is the last room
                         self.logger.info("Player walked off cutscene")
+                        profiler.stop()
                         return "end"
                     else:
                         # Rerending tiles for the background
@@ -552,6 +572,7 @@ class Cutscenes():
                             # Increment cutscene rooom and rerender tiles if the room is not the last room
                             self.room += 1
                             if self.room == len(self.level):
+                                profiler.stop()
                                 return "end" # Reached the end, ending the cutscene
                             else:
                                 # Updating background tiles to the new room
@@ -609,55 +630,77 @@ class Cutscenes():
                 if text["pos"] != text["moveTo"]: # Not at its destination
                     # Moving the text towards its destination
                     text["pos"] = self.move(text["pos"], text["moveTo"], 0.3)
+        profiler.stop()
             
         self.timer += 1 # Incrementing timer (for time commands)
 
 
     def render(self, window):
-        """Renders everything within the cutscene, including the background/tiles, objects, and text"""
-        # Tiles
-        self.screen.blit(self.tiles, (0, 0))
-        # Tiles with animations
-        self.tileRenderer.render_tiles_with_anims(self.screen, 1, constants.SCREEN_TILE_SIZE[1])
+        """Renders everything within the cutscene, including the background/tiles, objects, and text, with the cutscene's layers"""
+        self.layers.render(window)
+
+
+    def render_tiles(self, surface):
+        """Draws the tiles in the background, which is only done when the room changes since they're cached by the scene's layers"""
+        self.tileRenderer.draw_tiles(
+            self.level[self.room], self.room,
+            surface,
+            self.levelData[self.levelNum]["background"]
+        )
 
-        # Rendering background animation if there is one and it's on the room that it was set on
+
+    def render_background_anim(self, surface):
+        """Renders the background animation if there is one and it's on the room that it was set on"""
         if self.backgroundAnim is not None:
             if self.room == self.cutsceneData["backgroundAnim"]["room"]:
-                self.backgroundAnim.render(self.screen, (0, 0))
-        
-        # Rendering objects
+                self.backgroundAnim.render(surface, (0, 0))
+
+
+    def render_objects(self, surface):
+        """Renders the objects in the current room, and the player"""
         for name, dat in self.objects.items():
             # If the object is the player and the player is not being controlled by the user, or it's not the player
             if name == "player" and not self.playerControlled or name != "player":
                 # If it's the player (which is always on screen) or the room of the object is the current room as well
                 if name == "player" or dat["room"] == self.room:
                     if name != "redStare": # If it's not the Red Stare (who has two things to render)
-                        # Gets the frame of the animation of the object
-                        image = self.get_anim_obj(name, dat).get_frame()
-                        
-                        # Flips the frame based on the direction the object is facing
-                        image = pygame.transform.flip(image, dat["facing"] == "left", False)
-                        # Drawing at position
-                        self.screen.blit(image, dat["pos"])
-                    
+                        animation = self.get_anim_obj(name, dat)
+
+                        # Skipping it before flipping if it's walked off the screen
+                        if culling.is_visible(animation.get_bounds(dat["pos"])):
+                            # Gets the frame of the animation of the object
+                            # Flipped based on the direction the object is facing
+                            image = animation.get_flipped_frame(dat["facing"] == "left")
+                            # Drawing at position
+                            surface.blit(image, dat["pos"])
+                
                     else:
                         # Rendering body and mouth at offset of the Red Stare
-                        dat["anim"]["body"].render(self.screen, dat["pos"])
-                        dat["anim"]["mouth"].render(
-                            self.screen, 
-                            (dat["pos"][0] + constants.RED_STARE_MOUTH_OFFSET[0], 
-                             dat["pos"][1] + constants.RED_STARE_MOUTH_OFFSET[1])
-                        )
-            
+                        mouthPos = (dat["pos"][0] + constants.RED_STARE_MOUTH_OFFSET[0], dat["pos"][1] + constants.RED_STARE_MOUTH_OFFSET[1])
+
+                        if culling.is_visible(dat["anim"]["body"].get_bounds(dat["pos"])):
+                            dat["anim"]["body"].render(surface, dat["pos"])
+
+                        if culling.is_visible(dat["anim"]["mouth"].get_bounds(mouthPos)):
+                            dat["anim"]["mouth"].render(surface, mouthPos)
+        
             else:
                 # Rendering the player object
-                self.objects["player"]["obj"].render(self.screen)
-        
-        # Rendering tile objects
+                self.objects["player"]["obj"].render(surface)
+
+
+    def render_tile_objects(self, surface):
+        """Renders the tile objects"""
         for dat in self.tileObjects.values():
-            dat["anim"].render(self.screen, dat["pos"])
+            if culling.is_visible(dat["anim"].get_bounds(dat["pos"])):
+                dat["anim"].render(surface, dat["pos"])
+
 
-        if self.screenShake:
+    def render_scene(self, window):
+        """Renders the scene's layers onto the screen surface, then draws it to the window, shaking it if the screen is shaking"""
+        self.sceneLayers.render(self.screen)
+
+        if self.screenShake and quality.enabled("screen shake"):
             # Creating a random offset for the entire screen
             offset = (
                 random.randint(-constants.SCREEN_SHAKE_POWER, constants.SCREEN_SHAKE_POWER),
@@ -666,15 +709,20 @@ class Cutscenes():
 
             # Drawing the rendered screen to the window at the screen shake offset
             window.blit(self.screen, offset)
-        
+    
         else:
             # Drawing at the top left
             window.blit(self.screen, (0, 0))
-        
-        # Drawing screen shadow
-        window.blit(self.screenShadow, (0, 0))
 
-        # Drawing the fade image to the screen if there is one
+
+    def render_screen_shadow(self, window):
+        """Draws the shadow at the edges of the screen"""
+        if quality.enabled("screen shadow"):
+            window.blit(self.screenShadow, (0, 0))
+
+
+    def render_fade(self, window):
+        """Draws the fade image to the screen if there is one, fading it in"""
         if self.fadeImage is not None:
             if not self.fadeDone:
                 # Updating fade alpha
@@ -683,23 +731,25 @@ class Cutscenes():
                 if self.fadeProgress >= 255: # 255 is full ocpacity
                     # Fade is done
                     self.fadeDone = True
-            
+        
             # Drawing the fade image with the current alpha value
             self.fadeImage.set_alpha(self.fadeProgress)
             window.blit(self.fadeImage, (0, 0))
-        
-        # Going through all text objects and rendering them with borders at their positions
+
+
+    def render_text(self, window):
+        """Renders all text objects with borders at their positions"""
         for text in self.texts.values():
             if text["show"]: # If the text is to be displayed
-                if not text["movable"]: # If the text isn't movable text
+                if not text["movable"] and quality.enabled("text bobbing"): # If the text isn't movable text
                     # Adding to the sine wave counter
                     text["displayWaveX"] += 0.05
                     # Using the sine wave counter to get the new position of the text
                     # (For bobbing up and down)
                     textYOffset = math.sin(text["displayWaveX"]) * constants.TEXT_BOB_INTENSITY
-                
+            
                 else: # Otherwise, set it to zero
-                    # (Movable text doesn't bob up/down)
+                    # (Movable text doesn't bob up/down, and no text does if the quality governor turned bobbing off)
                     textYOffset = 0
 
                 # Rendering text background
@@ -708,11 +758,8 @@ class Cutscenes():
                 fullText = text["text"].split("\n")
                 # Going through all rows of the text
                 for count, t in enumerate(fullText):
-                    # Getting text surface
-                    renderText = self.textObject.render(t, False, text["color"])
-
                     # Getting position, centering it on the x position and moving it down by the y if there are multiple lines
-                    position = (text["pos"][0] - renderText.get_width() / 2, text["pos"][1] + textYOffset + count * constants.VERTICAL_TEXT_GAP)
+                    position = (text["pos"][0] - self.textObject.size(t)[0] / 2, text["pos"][1] + textYOffset + count * constants.VERTICAL_TEXT_GAP)
 
                     # Drawing the text 
-                    utility.draw_text_with_border(window, position, t, self.textObject, text["color"], renderText = renderText)
\ No newline at end of file
+                    utility.draw_text_with_border(window, position, t, self.textObject, text["color"])
@@ -0,0 +1,129 @@
+import pygame
+
+import src.constants as constants
+import src.instrumentation as instrumentation
+import src.profiler as profiler
+
+class DebugOverlay:
+    """
+    Displays the counters and values from src/instrumentation.py
+    in the bottom left corner of the screen. Toggled with the debug overlay key (F3).
+    """
+    def __init__(self):
+        """Sets up the font and hides the overlay"""
+        self.font = pygame.font.Font(constants.FONT_PATH, constants.FONT_SIZE)
+        self.show = False
+
+
+    def toggle(self):
+        """Shows the overlay if hidden, hides it if shown"""
+        self.show = not self.show
+
+
+    def render(self, window):
+        """Renders all the lines from the instrumentation to the bottom left corner on a darkened background"""
+        if not self.show:
+            return
+
+        lines = instrumentation.get_lines()
+        if not lines:
+            return
+
+        rendered = [self.font.render(line, False, constants.WHITE) for line in lines]
+
+        width = max(text.get_width() for text in rendered) + 4
+        height = len(rendered) * constants.VERTICAL_TEXT_GAP + 4
+        top = constants.SCREEN_SIZE[1] - height
+
+        # Darkening the area behind the text
+        window.fill(constants.DEBUG_OVERLAY_SHADE, (0, top, width, height), special_flags = pygame.BLEND_MULT)
+
+        for count, text in enumerate(rendered):
+            window.blit(text, (2, top + 1 + count * constants.VERTICAL_TEXT_GAP))
+
+
+class ProfilerOverlay:
+    """
+    Displays a graph of the timings from src/profiler.py in the top left corner of the screen,
+    with a stacked bar for each of the last frames showing how long each phase took.
+    Next to the graph are the average milliseconds of each phase. Toggled with the profiler overlay key (F4).
+    """
+    # Height of the graph in pixels, fitting one and a half frames at the target frame rate
+    GRAPH_HEIGHT = int(1000 / constants.FPS * 1.5 * constants.PROFILER_GRAPH_SCALE)
+    SUB_PHASES_SHOWN = 8 # Amount of phases inside other phases listed under the graph, the slowest first
+
+    def __init__(self):
+        """Sets up the font and hides the overlay"""
+        self.font = pygame.font.Font(constants.FONT_PATH, constants.FONT_SIZE)
+        self.show = False
+
+
+    def toggle(self):
+        """Shows the overlay if hidden, hides it if shown"""
+        self.show = not self.show
+
+
+    def render(self, window):
+        """Renders the graph and the averages of each phase on a darkened background"""
+        if not self.show:
+            return
+
+        frames = profiler.get_frames(constants.PROFILER_GRAPH_FRAMES)
+        if not frames:
+            return
+
+        averages = profiler.get_averages(frames)
+
+        # Darkening the area behind the graph
+        window.fill(
+            constants.DEBUG_OVERLAY_SHADE, 
+            (0, 0, constants.PROFILER_GRAPH_FRAMES, self.GRAPH_HEIGHT), 
+            special_flags = pygame.BLEND_MULT
+        )
+
+        # Drawing a stacked bar for every frame, with the newest on the right
+        for x, frame in enumerate(frames):
+            y = self.GRAPH_HEIGHT
+
+            for name, color in constants.PROFILER_COLORS.items():
+                height = round(frame.get(name, 0) * constants.PROFILER_GRAPH_SCALE)
+
+                if height > 0:
+                    window.fill(color, (x, y - height, 1, height))
+                    y -= height
+
+                if y <= 0: # Bar reached the top of the graph
+                    break
+
+        # Line at the time one frame has at the target frame rate
+        budgetY = self.GRAPH_HEIGHT - round(1000 / constants.FPS * constants.PROFILER_GRAPH_SCALE)
+        window.fill(constants.WHITE, (0, budgetY, constants.PROFILER_GRAPH_FRAMES, 1))
+
+        # Averages of the main phases, in the colors of their bars
+        lines = [(f"frame {averages['frame']:.2f}ms", constants.WHITE)]
+        lines += [
+            (f"{name} {averages[name]:.2f}ms", color) 
+            for name, color in constants.PROFILER_COLORS.items() if name in averages
+        ]
+        self.render_lines(window, lines, (constants.PROFILER_GRAPH_FRAMES + 2, 0))
+
+        # Averages of the slowest phases inside other phases
+        subPhases = sorted((name for name in averages if "/" in name), key = lambda name: averages[name], reverse = True)
+        lines = [(f"{name} {averages[name]:.2f}ms", constants.WHITE) for name in subPhases[:self.SUB_PHASES_SHOWN]]
+        self.render_lines(window, lines, (0, self.GRAPH_HEIGHT + 2))
+
+
+    def render_lines(self, window, lines, position):
+        """Renders lines of text (given as tuples of text and color) starting at the position given on a darkened background"""
+        if not lines:
+            return
+
+        rendered = [self.font.render(text, False, color) for text, color in lines]
+
+        width = max(text.get_width() for text in rendered) + 4
+        height = len(rendered) * constants.VERTICAL_TEXT_GAP + 4
+
+        window.fill(constants.DEBUG_OVERLAY_SHADE, (position[0], position[1], width, height), special_flags = pygame.BLEND_MULT)
+
+        for count, text in enumerate(rendered):
+            window.blit(text, (position[0] + 2, position[1] + 1 + count * constants.VERTICAL_TEXT_GAP))
@@ -0,0 +1,44 @@
+class DirtyRectTracker:
+    """
+    Keeps track of the parts of a scene that don't change every frame, such as buttons and text on the menus,
+    so only the parts that look different from the last frame need to be scaled and shown on the screen (see Window.present).
+    Every frame, each part is marked with a key, the state it was drawn in (anything that changes how it looks), and the rectangle it was drawn in.
+    Anything that isn't marked is expected to look the same every frame.
+    """
+    def __init__(self):
+        """Starts with nothing drawn, so everything marked in the first frame is dirty"""
+        self.drawn = {} # Key: (state, rectangle) of the parts drawn in the last frame
+        self.marked = {} # Key: (state, rectangle) of the parts drawn in this frame
+
+
+    def mark(self, key, state, rect):
+        """Marks a part as drawn this frame in the state and rectangle given"""
+        self.marked[key] = (state, rect)
+
+
+    def get_dirty_rects(self) -> list:
+        """
+        Gets the rectangles of the parts that look different from the last frame, which are where parts were drawn before and are drawn now.
+        Called once every frame after rendering, starting the next frame.
+        """
+        dirtyRects = []
+
+        for key, drawn in self.marked.items():
+            previous = self.drawn.get(key)
+
+            if previous != drawn:
+                dirtyRects.append(drawn[1])
+
+                # The part has to be cleared from where it was
+                if previous is not None and previous[1] != drawn[1]:
+                    dirtyRects.append(previous[1])
+
+        # Parts that stopped being drawn
+        for key, (state, rect) in self.drawn.items():
+            if key not in self.marked:
+                dirtyRects.append(rect)
+
+        self.drawn = self.marked
+        self.marked = {}
+
+        return dirtyRects
@@ -31,6 +31,8 @@ class FollowObject(src.object_base.ObjectBase):
 
         self.yVelocity = velocity
 
+        self.lastSample = None # Sample of the player's trail the object was last moved to without needing any correction
+
 
     def check_below(self, level): 
         """Check if the object is on a platform"""
@@ -46,12 +48,31 @@ class FollowObject(src.object_base.ObjectBase):
         return result is True # If there was a collision below the object
 
     
+    def touching_solid(self, room) -> bool:
+        """
+        Checks if the object's rectangle touches any solid tiles, or goes off the screen (where tiles can be made solid).
+        If it doesn't, the collision checks can't move the object.
+        """
+        left = self.rect.left // constants.TILE_SIZE[0]
+        right = (self.rect.right - 1) // constants.TILE_SIZE[0]
+        top = self.rect.top // constants.TILE_SIZE[1]
+        bottom = (self.rect.bottom - 1) // constants.TILE_SIZE[1]
+
+        if left < 0 or top < 0 or right >= constants.SCREEN_TILE_SIZE[0] or bottom >= constants.SCREEN_TILE_SIZE[1]:
+            return True
+
+        for y in range(top, bottom + 1):
+            for x in range(left, right + 1):
+                if room[y][x] in constants.TILE_KEYS:
+                    return True
+
+        return False
+
+
     def update(
         self, 
         levels, # List of all levels
-        playerPositions,
-        playerLevelAndRoom,
-        playerFacing,
+        playerTrail, # TrailBuffer of the player's positions, levels and rooms, and facing directions
         playerMoved, # If the player has moved
         gravBeamYPos,
         globalGravity
@@ -60,7 +81,9 @@ class FollowObject(src.object_base.ObjectBase):
         super().test_grav_line(globalGravity, gravBeamYPos) # Updates the gravity direction
         super().update_animation()
 
-        if len(playerPositions) > self.followDistance: # If the player has moved far enough for the object to start following 
+        if len(playerTrail) > self.followDistance: # If the player has moved far enough for the object to start following 
+            playerY = playerTrail.get(0)[1] # The player's current y position
+
             if not playerMoved: # If the player hasn't moved
                 # self.followDistance is a variable which describes how far 
                 # forward the object is in frames from where it was before the player
@@ -72,49 +95,68 @@ class FollowObject(src.object_base.ObjectBase):
 
                 if self.followContinueFrames < self.followDistance:
                     # If the entity's y position is not the same as the player's current y position (because of gravity) or it isn't on a platform
-                    if self.rect.y != playerPositions[0][1] or not self.check_below(levels[self.level]):
+                    if self.rect.y != playerY or not self.check_below(levels[self.level]):
                         self.followContinueFrames += 1
                 
             else: # Player has moved
                 if self.followContinueFrames > 0:
-                    if self.rect.y == playerPositions[0][1] or self.check_below(levels[self.level]): # If the entity is not in need of changing
+                    if self.rect.y == playerY or self.check_below(levels[self.level]): # If the entity is not in need of changing
                         self.followContinueFrames -= 1
             
-            self.level, self.room = playerLevelAndRoom[self.followDistance - self.followContinueFrames] # Setting level and room
+            sample = playerTrail.get(self.followDistance - self.followContinueFrames)
 
-            self.facing = playerFacing[self.followDistance - self.followContinueFrames] # Setting facing
+            if sample is self.lastSample: # Already moved exactly to this sample
+                self.rect.y = sample[1] # Undoing any movement from checking below
+                self.switch_anim("idle")
+                return
+
+            sampleX, sampleY, self.level, self.room, self.facing = sample # Setting level, room, and facing
+            room = levels[self.level][self.room]
 
             # Distance the object moved
-            xMoved = (
-                playerPositions[self.followDistance - self.followContinueFrames][0] # player x position
-                 - self.rect.x - (constants.PLAYER_WIDTH // 2)
-            )
+            xMoved = sampleX - self.rect.x - (constants.PLAYER_WIDTH // 2)
             
             posBeforeMove = self.rect.x
             self.rect.x += xMoved
 
-            super().update_x_collision(
-                levels[self.level][self.room],
-                self.room,
-                levels[self.level], 
-                utility.lock_neg1_zero_pos1(xMoved)
-            )
-
-            self.rect.y = playerPositions[self.followDistance - self.followContinueFrames][1]
-
-            # Checking both directions after updating y position
-            super().update_x_collision(
-                levels[self.level][self.room],
-                self.room,
-                levels[self.level],
-                -1 # Checking to the left
-            )
-            super().update_x_collision(
-                levels[self.level][self.room],
-                self.room,
-                levels[self.level],
-                1 # Checking to the right
-            )
+            # If the object doesn't touch any solid tiles before or after updating the y position,
+            # the sample needs no correction and the collision checks are skipped
+            needsCorrection = self.touching_solid(room)
+            
+            yBeforeMove = self.rect.y
+            self.rect.y = sampleY
+
+            needsCorrection = needsCorrection or self.touching_solid(room)
+
+            if not needsCorrection:
+                self.lastSample = sample
+
+            else:
+                self.lastSample = None
+                self.rect.y = yBeforeMove
+
+                super().update_x_collision(
+                    room,
+                    self.room,
+                    levels[self.level], 
+                    utility.lock_neg1_zero_pos1(xMoved)
+                )
+
+                self.rect.y = sampleY
+
+                # Checking both directions after updating y position
+                super().update_x_collision(
+                    room,
+                    self.room,
+                    levels[self.level],
+                    -1 # Checking to the left
+                )
+                super().update_x_collision(
+                    room,
+                    self.room,
+                    levels[self.level],
+                    1 # Checking to the right
+                )
 
             # Setting animation
             if self.rect.x != posBeforeMove:
@@ -0,0 +1,119 @@
+import collections
+import logging
+import time
+
+import src.constants as constants
+import src.instrumentation as instrumentation
+import src.profiler as profiler
+
+class FramePacer:
+    """
+    Waits between frames so they start at an even rate, keeping a schedule of when each frame should start
+    instead of waiting a frame's time after the last one, so a late frame doesn't push back the ones after it.
+    The way it waits is chosen by the strategy:
+    "sleep" sleeps until the next frame, which uses the least CPU but may wake up late depending on the OS,
+    "hybrid" sleeps until shortly before the next frame and spins (checks the time in a loop) for the rest,
+    "spin" only spins, which is the most accurate but keeps the CPU busy,
+    and "vsync" lets showing the frame wait for the screen to refresh, only sleeping if the screen refreshes faster than the frame rate.
+    The jitter of each frame (how far the time between it and the last frame was from the target) is reported on the debug overlay.
+    """
+    STRATEGIES = ("sleep", "hybrid", "spin", "vsync")
+
+    def __init__(self, fps, strategy, vsync = False):
+        """Sets up the schedule. The vsync strategy needs the screen to have been created with vsync, otherwise the hybrid strategy is used."""
+        self.logger = logging.getLogger(__name__)
+
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown frame pacing strategy {strategy}")
+
+        if strategy == "vsync" and not vsync:
+            self.logger.warning("Vsync is unavailable, pacing frames with the hybrid strategy instead")
+            strategy = "hybrid"
+
+        self.strategy = strategy
+        self.frameTime = 1 / fps # Seconds between the start of each frame
+
+        self.nextFrameTime = None # When the next frame should start
+        self.lastFrameTime = None # When the last frame started
+
+        self.jitters = collections.deque(maxlen = constants.PACING_HISTORY) # Jitter of the last frames in milliseconds
+
+        # For reporting how much of the CPU the game uses once a second, since the strategies use different amounts
+        self.cpuStart = time.process_time()
+        self.cpuWallStart = time.perf_counter()
+        self.cpuUsage = 0
+
+
+    def wait(self, early = 0):
+        """Waits until it's time for the next frame, or the amount of seconds given before it (for the late latch mode)"""
+        with profiler.phase("clock tick"):
+            now = time.perf_counter()
+
+            if self.nextFrameTime is None or now > self.nextFrameTime - early + self.frameTime:
+                # A whole frame behind (or the first frame), so starting the schedule again instead of rushing frames to catch up
+                self.nextFrameTime = now + early
+
+            self.wait_until(self.nextFrameTime - early)
+
+            now = time.perf_counter()
+            self.nextFrameTime += self.frameTime
+
+            if self.lastFrameTime is not None:
+                self.jitters.append(((now - self.lastFrameTime) - self.frameTime) * 1000)
+            self.lastFrameTime = now
+
+        self.report(now)
+
+
+    def reset(self):
+        """Starts the schedule again from the next frame, after waiting some other way (such as for inputs when idle), without counting the wait as jitter"""
+        self.nextFrameTime = None
+        self.lastFrameTime = None
+
+
+    def wait_until(self, wakeTime):
+        """Waits until the time given (from time.perf_counter) using the strategy"""
+        if self.strategy == "vsync":
+            # Showing the frame waits for the screen, so this only stops frames from coming too early
+            # on screens that refresh faster than the frame rate, and doesn't need to be accurate
+            wakeTime -= self.frameTime / 2
+
+        if self.strategy == "hybrid":
+            # Sleeping is only accurate to about a millisecond, so spinning for the last part
+            sleepTime = wakeTime - time.perf_counter() - constants.PACING_SPIN_TIME / 1000
+            if sleepTime > 0:
+                time.sleep(sleepTime)
+
+        if self.strategy in ("hybrid", "spin"):
+            while time.perf_counter() < wakeTime:
+                pass
+
+        else:
+            sleepTime = wakeTime - time.perf_counter()
+            if sleepTime > 0:
+                time.sleep(sleepTime)
+
+
+    def get_jitter_stats(self) -> dict:
+        """Gets the average and largest jitter (by how far it's from zero) of the last frames, and the jitter of the last frame"""
+        if not self.jitters:
+            return {"last": 0, "mean": 0, "max": 0}
+
+        return {
+            "last": self.jitters[-1],
+            "mean": sum(abs(jitter) for jitter in self.jitters) / len(self.jitters),
+            "max": max(abs(jitter) for jitter in self.jitters)
+        }
+
+
+    def report(self, now):
+        """Reports the jitter and the CPU usage to the debug overlay, with the CPU usage updated once a second"""
+        if now - self.cpuWallStart >= 1:
+            cpuTime = time.process_time()
+            self.cpuUsage = (cpuTime - self.cpuStart) / (now - self.cpuWallStart)
+            self.cpuStart = cpuTime
+            self.cpuWallStart = now
+
+        stats = self.get_jitter_stats()
+        instrumentation.report("jitter", f"{stats['last']:+.2f}ms (average {stats['mean']:.2f}ms, max {stats['max']:.2f}ms)")
+        instrumentation.report("pacing", f"{self.strategy}, {self.cpuUsage * 100:.0f}% CPU")
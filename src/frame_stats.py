@@ -0,0 +1,170 @@
+"""
+This file times every frame, keeping the frames per second shown by the FPS counter
+and a rolling histogram of the last frame times for the percentiles shown on the debug overlay (src/debug_overlay.py).
+Frames taking longer than HITCH_THRESHOLD frame budgets are logged as hitches, along with the scene, level, and room they happened in
+and the last notable event before them (such as a room being loaded or music starting), so stutters can be traced back to what caused them.
+The log only keeps the latest hitches, and is dumped to a file with the hitch dump key (F6).
+"""
+
+import collections
+import json
+import os
+import time
+import logging
+
+import src.constants as constants
+import src.instrumentation as instrumentation
+
+logger = logging.getLogger(__name__)
+
+frameTimes = [] # Ring buffer of the milliseconds taken by the last frames
+newest = -1 # Index of the newest frame in the frame times
+histogram = collections.Counter() # Bucket index: amount of the frames in the frame times in the bucket
+
+frameCount = 0 # Frames timed since the game started
+frameStart = None # When the current frame started
+
+fps = 0 # Frames in the last full second
+secondStart = None # When the current second started
+secondFrames = 0 # Frames in the current second
+
+hitches = collections.deque() # The latest hitches, from oldest to newest
+hitchCount = 0 # Hitches since the game started, including ones no longer in the log
+lastEvent = None # Name and frame number of the last notable event
+
+
+def event(name):
+    """Notes a notable event (such as a room loading) which hitches after it are tagged with"""
+    global lastEvent
+    lastEvent = (name, frameCount)
+
+
+def new_frame(scene, level, room):
+    """
+    Finishes timing the current frame and starts a new one. Called by the loop at the start of every frame,
+    with the scene, level, and room the frame that finished was in.
+    """
+    global frameStart, frameCount, fps, secondStart, secondFrames
+
+    now = time.perf_counter()
+
+    if frameStart is not None:
+        add_frame((now - frameStart) * 1000, scene, level, room)
+    else:
+        secondStart = now
+
+    frameStart = now
+    frameCount += 1
+    secondFrames += 1
+
+    if now - secondStart >= 1:
+        fps = secondFrames
+        secondFrames = 0
+        secondStart = now
+
+        report()
+
+
+def skip(seconds):
+    """Leaves the seconds given out of the current frame's time, for time spent idle (waiting for inputs) which isn't part of the frame"""
+    global frameStart
+
+    if frameStart is not None:
+        frameStart += seconds
+
+
+def get_bucket(ms) -> int:
+    """Gets the index of the histogram bucket a frame time is in"""
+    return min(int(ms / constants.FRAME_STATS_BUCKET_MS), int(constants.FRAME_STATS_MAX_MS / constants.FRAME_STATS_BUCKET_MS))
+
+
+def add_frame(ms, scene, level, room):
+    """Adds a frame's time to the histogram, replacing the oldest frame, and logs it if it's a hitch"""
+    global newest, hitchCount
+
+    newest = (newest + 1) % constants.FRAME_STATS_HISTORY
+
+    if newest < len(frameTimes):
+        # Removing the oldest frame from the histogram
+        histogram[get_bucket(frameTimes[newest])] -= 1
+        frameTimes[newest] = ms
+    else:
+        frameTimes.append(ms)
+
+    histogram[get_bucket(ms)] += 1
+
+    if ms > 1000 / constants.FPS * constants.HITCH_THRESHOLD:
+        hitchCount += 1
+
+        hitches.append({
+            "frame": frameCount,
+            "ms": round(ms, 3),
+            "scene": scene,
+            "level": level,
+            "room": room,
+            "lastEvent": lastEvent[0] if lastEvent is not None else None,
+            "framesSinceEvent": frameCount - lastEvent[1] if lastEvent is not None else None
+        })
+
+        if len(hitches) > constants.HITCH_LOG_SIZE:
+            hitches.popleft()
+
+
+def get_percentile(percent) -> float:
+    """Gets the frame time (the top of its histogram bucket) that the percent given of the last frames are at or under"""
+    target = len(frameTimes) * percent / 100
+    total = 0
+
+    for bucket in sorted(histogram):
+        total += histogram[bucket]
+        if total >= target:
+            return (bucket + 1) * constants.FRAME_STATS_BUCKET_MS
+
+    return 0
+
+
+def get_one_percent_low() -> float:
+    """Gets the 1% low, the average frames per second of the slowest 1% of the last frames"""
+    slowest = sorted(frameTimes, reverse = True)[:max(1, len(frameTimes) // 100)]
+    return 1000 / (sum(slowest) / len(slowest)) if slowest else 0
+
+
+def get_stats() -> dict:
+    """Gets the percentiles and 1% low of the last frames, and the amount of hitches"""
+    return {
+        "frames": len(frameTimes),
+        "p50": get_percentile(50),
+        "p99": get_percentile(99),
+        "onePercentLow": get_one_percent_low(),
+        "fps": fps,
+        "hitches": hitchCount
+    }
+
+
+def report():
+    """Reports the stats to the debug overlay. Done once a second, since the percentiles don't change much between frames."""
+    stats = get_stats()
+    instrumentation.report("frame time", f"p50 {stats['p50']:.2f}ms, p99 {stats['p99']:.2f}ms, 1% low {stats['onePercentLow']:.0f} FPS")
+    instrumentation.report("hitches", stats["hitches"])
+
+
+def dump(filePath = None) -> str:
+    """Writes the stats, the logged hitches, and the last frame times to a JSON file. Returns the path of the file."""
+    if filePath is None:
+        if not os.path.exists(constants.HITCHES_FOLDER):
+            os.makedirs(constants.HITCHES_FOLDER)
+
+        filePath = f"{constants.HITCHES_FOLDER}/{time.strftime('%Y-%m-%d %H.%M.%S')}.json"
+
+    with open(filePath, "w") as file:
+        json.dump({
+            **get_stats(),
+            "budget": 1000 / constants.FPS,
+            "hitchLog": list(hitches),
+            # From oldest to newest
+            "frameTimes": [round(ms, 3) for ms in frameTimes[newest + 1:] + frameTimes[:newest + 1]]
+        }, file, indent = 4)
+
+    logger.info(f"Dumped {len(hitches)} hitches to {filePath}")
+
+    return filePath
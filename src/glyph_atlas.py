@@ -0,0 +1,128 @@
+import string
+
+import pygame
+
+import src.constants as constants
+
+class GlyphAtlas:
+    """
+    Draws text which changes every frame (such as the speedrun timer and the FPS counter) without rendering it with the font.
+    Every character is rendered once onto an atlas surface, along with its black border,
+    and text is drawn by blitting the characters' rectangles from the atlas next to each other.
+    Only works for fonts where the width of text is the width of its characters added up, like the game's pixel font.
+    """
+    # Characters put on the atlas when it's created, others are added the first time they're drawn
+    CHARACTERS = string.digits + string.ascii_letters + string.punctuation + " "
+
+    def __init__(self, font, color = constants.WHITE, borderWidth = 0):
+        """Renders the characters and their borders onto the atlas"""
+        self.font = font
+        self.color = color
+        self.borderWidth = borderWidth
+
+        self.build(self.CHARACTERS)
+
+
+    def build(self, characters):
+        """
+        Creates the atlas with the characters given.
+        Each character has a column in the atlas, with the character on the top row, its border on the middle row,
+        and the character drawn over its border on the bottom row.
+        """
+        self.characters = characters
+
+        # Size of a character with room for its border on every side
+        glyphSize = (
+            max(self.font.size(character)[0] for character in characters) + self.borderWidth * 2,
+            self.font.get_height() + self.borderWidth * 2
+        )
+
+        self.atlas = pygame.Surface((glyphSize[0] * len(characters), glyphSize[1] * 3), flags = pygame.SRCALPHA)
+
+        self.advances = {} # Character: width it takes up in text
+        self.glyphRects = {} # Character: rectangle of the character on the atlas
+        self.borderRects = {} # Character: rectangle of the character's border on the atlas
+        self.borderedRects = {} # Character: rectangle of the character drawn over its border on the atlas
+
+        # If the border of a character can cover the character before it, which happens when a character
+        # touches the right side of the space it takes up in text. The borders are drawn separately then.
+        self.separateBorders = False
+
+        for count, character in enumerate(characters):
+            x = count * glyphSize[0]
+
+            self.advances[character] = self.font.size(character)[0]
+            self.glyphRects[character] = pygame.Rect((x, 0), glyphSize)
+            self.borderRects[character] = pygame.Rect((x, glyphSize[1]), glyphSize)
+            self.borderedRects[character] = pygame.Rect((x, glyphSize[1] * 2), glyphSize)
+
+            renderText = self.font.render(character, False, self.color)
+
+            if self.borderWidth > 0:
+                # Drawing the character in black in a square around its position, which is the border
+                bgText = self.font.render(character, False, constants.BLACK)
+                for borderX in (0, self.borderWidth, self.borderWidth * 2):
+                    for borderY in (0, self.borderWidth, self.borderWidth * 2):
+                        self.atlas.blit(bgText, (x + borderX, glyphSize[1] + borderY))
+                        self.atlas.blit(bgText, (x + borderX, glyphSize[1] * 2 + borderY))
+
+                # Checking if the character touches the right side of its space
+                mask = pygame.mask.from_surface(renderText)
+                rightSide = pygame.mask.Mask((self.borderWidth, mask.get_size()[1]), fill = True)
+                if mask.overlap_area(rightSide, (self.advances[character] - self.borderWidth, 0)) > 0:
+                    self.separateBorders = True
+
+            self.atlas.blit(renderText, (x + self.borderWidth, self.borderWidth))
+            self.atlas.blit(renderText, (x + self.borderWidth, glyphSize[1] * 2 + self.borderWidth))
+
+
+    def size(self, text) -> tuple:
+        """Gets the width and height of the text without its border, the same as the font's size() method"""
+        self.add_missing(text)
+        return sum(self.advances[character] for character in text), self.font.get_height()
+
+
+    def add_missing(self, text):
+        """Adds any characters in the text that aren't on the atlas"""
+        missing = "".join(set(text) - self.advances.keys())
+        if missing:
+            self.build(self.characters + missing)
+
+
+    def render(self, surface, position, text) -> "pygame.Rect":
+        """Draws the text with its top left corner at the position given, with the border going around it. Returns the area drawn to, like blitting does."""
+        self.add_missing(text)
+
+        # Rounded the same way as blitting the whole text at the position would be, since the characters are placed by whole pixels after it
+        x = int(position[0] - self.borderWidth)
+        y = int(position[1] - self.borderWidth)
+        startX = x
+
+        if self.separateBorders:
+            # Drawing all of the borders first so they don't cover the characters next to them
+            borders = []
+            glyphs = []
+
+            for character in text:
+                borders.append((self.atlas, (x, y), self.borderRects[character]))
+                glyphs.append((self.atlas, (x, y), self.glyphRects[character]))
+                x += self.advances[character]
+
+            surface.blits(borders, doreturn = False)
+            surface.blits(glyphs, doreturn = False)
+
+        else:
+            glyphs = []
+
+            for character in text:
+                glyphs.append((self.atlas, (x, y), self.borderedRects[character]))
+                x += self.advances[character]
+
+            surface.blits(glyphs, doreturn = False)
+
+        # Each character is drawn with the full width of a column on the atlas, so the last one can go past its advance
+        width = x - startX
+        if text:
+            width += self.glyphRects[text[-1]].width - self.advances[text[-1]]
+
+        return pygame.Rect(startX, y, width, self.atlas.get_height() // 3).clip(surface.get_rect())
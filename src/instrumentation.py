@@ -0,0 +1,33 @@
+"""
+This file keeps track of the numbers shown on the debug overlay (src/debug_overlay.py).
+Counters are added up during a frame and restart at the start of every frame,
+while values stay the same until they are reported again.
+"""
+
+frameCounts = {} # Counters being added up during the current frame
+lastFrameCounts = {} # Counters from the last finished frame, which are the ones shown
+values = {} # Values reported by anything in the game
+
+
+def new_frame():
+    """Finishes the counters of the current frame and starts new ones. Called by the loop at the start of every frame."""
+    global frameCounts, lastFrameCounts
+    lastFrameCounts = frameCounts
+    frameCounts = {}
+
+
+def count(name, amount = 1):
+    """Adds to the counter with the given name for the current frame"""
+    frameCounts[name] = frameCounts.get(name, 0) + amount
+
+
+def report(name, value):
+    """Sets the value shown for the given name"""
+    values[name] = value
+
+
+def get_lines() -> list:
+    """Gets the lines of text shown on the debug overlay"""
+    lines = [f"{name}: {value}" for name, value in values.items()]
+    lines += [f"{name}: {value}" for name, value in lastFrameCounts.items()]
+    return lines
@@ -0,0 +1,98 @@
+import pygame
+
+import src.constants as constants
+import src.instrumentation as instrumentation
+import src.profiler as profiler
+
+class LayerCompositor:
+    """
+    Draws a scene as a stack of layers from the bottom up, so what is cached is decided in one place instead of in each scene's render.
+    Each layer has a function which draws it onto the surface it's given, and is one of these kinds:
+    "static" layers look the same every frame until they're invalidated (such as the tiles of a room),
+    "animated" layers change every frame but only in the parts they mark on the scene's dirty rect tracker (such as the buttons on the menus),
+    and "dynamic" layers can change anywhere in their rectangle every frame (such as the player).
+    The static layers at the bottom of the stack are drawn onto a cache once, which is blitted instead of drawing them until one is invalidated.
+    Static layers above other kinds can't be cached without changing how they blend with what's under them, so they're drawn every frame.
+    Every layer drawn is timed as a profiler phase with its name.
+    """
+    KINDS = ("static", "animated", "dynamic")
+
+    def __init__(self, size = constants.SCREEN_SIZE, dirtyRects = None):
+        """Starts with no layers. If the scene has a dirty rect tracker (src/dirty_rect_tracker.py), the cache and dynamic layers are marked on it."""
+        self.size = size
+        self.dirtyRects = dirtyRects
+
+        self.layers = [] # (name, kind, draw function, rectangle) from the bottom up
+        self.cachedLayers = 0 # Amount of static layers at the bottom, which are drawn onto the cache
+
+        self.cache = None # Surface the static layers at the bottom are drawn onto, created when first needed
+        self.cacheValid = False # If the cache has to be drawn again before it's used
+        self.cacheVersion = 0 # Goes up every time the cache is drawn, so the cache is marked as changed
+        self.cacheRect = None # Part of the screen the cached layers draw in
+
+        self.frame = 0 # Frames rendered, the state dynamic layers are marked with so they're always changed
+
+
+    def add(self, name, kind, draw, rect = None):
+        """
+        Adds a layer on top of the others, drawn by calling draw with the surface to draw onto.
+        The rectangle is the part of the screen the layer draws in, which is the whole screen if none is given.
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown layer kind {kind}")
+
+        rect = pygame.Rect(rect) if rect is not None else pygame.Rect((0, 0), self.size)
+        self.layers.append((name, kind, draw, rect))
+
+        if kind == "static" and self.cachedLayers == len(self.layers) - 1:
+            # Still at the bottom, so it's drawn onto the cache with the ones under it
+            self.cachedLayers += 1
+            self.cacheRect = rect if self.cacheRect is None else self.cacheRect.union(rect)
+            self.cacheValid = False
+
+
+    def invalidate(self, name = None):
+        """Draws the cache again before it's next used, which has to be done when a cached layer changes (or any of them if no name is given)"""
+        if name is None or any(layer[0] == name for layer in self.layers[:self.cachedLayers]):
+            self.cacheValid = False
+
+
+    def draw_cache(self):
+        """Draws the static layers at the bottom onto the cache, over black like the frame they would be drawn onto"""
+        if self.cache is None:
+            self.cache = pygame.Surface(self.size)
+
+        self.cache.fill(constants.BLACK)
+
+        for index in range(self.cachedLayers):
+            self.layers[index][2](self.cache)
+
+        self.cacheValid = True
+        self.cacheVersion += 1
+
+
+    def render(self, surface):
+        """Draws every layer onto the surface from the bottom up, blitting the cache instead of the static layers at the bottom"""
+        self.frame += 1
+
+        if self.cachedLayers > 0:
+            with profiler.phase("cached layers"):
+                if not self.cacheValid:
+                    self.draw_cache()
+
+                surface.blit(self.cache, (0, 0))
+
+            if self.dirtyRects is not None:
+                self.dirtyRects.mark("cached layers", self.cacheVersion, self.cacheRect)
+
+        for index in range(self.cachedLayers, len(self.layers)):
+            name, kind, draw, rect = self.layers[index]
+
+            with profiler.phase(name):
+                draw(surface)
+
+            if kind == "dynamic" and self.dirtyRects is not None:
+                self.dirtyRects.mark(name, self.frame, rect)
+
+        instrumentation.count("layers cached", self.cachedLayers)
+        instrumentation.count("layers drawn", len(self.layers) - self.cachedLayers)
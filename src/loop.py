@@ -1,9 +1,9 @@
 import pygame
 import logging
 import os
+import time
 import traceback
-from time import sleep
-import threading
+import random
 
 import src.window
 import src.playing
@@ -16,6 +16,19 @@ import src.boss_level
 import src.main_menu
 import src.settings
 import src.pause_menu
+import src.replay
+import src.debug_overlay
+import src.glyph_atlas
+import src.surface_pool
+import src.dirty_rect_tracker
+import src.allocation_counter
+import src.instrumentation as instrumentation
+import src.frame_stats as frame_stats
+import src.quality as quality
+import src.profiler as profiler
+import src.text_cache as text_cache
+import src.asset_loader as asset_loader
+import src.scene_registry
 
 # Initializing Pygame
 pygame.init()
@@ -26,16 +39,35 @@ class Loop():
     It also sets up the game.
     After the game closes, this class takes all game data and calls a function located in src/utility.py which serializes all of the data to a database.
     """
-    def __init__(self):
-        """Initializes all of the classes and variables needed to run the game"""
+    def __init__(self, replayPath = None):
+        """Initializes all of the classes and variables needed to run the game. If a replay path is given, the replay is played back instead of using the user's inputs."""
         utility.setup_loggers()
         self.logger = logging.getLogger(__name__)
 
+        # When the game started setting up, which the startup times are measured from
+        self.startTime = time.perf_counter()
+        # Milliseconds from the start until the first frame was rendered ("first frame") and the main menu took inputs ("interactive")
+        self.startupTimes = {}
+
+        if constants.DEBUG_ALLOCATIONS:
+            # Installed first so every surface created after this is counted
+            src.allocation_counter.install()
+
+        # Decoding the images in the background, starting with the startup animation while the window is created
+        # With only one CPU the thread would slow down setting up the first frame instead, so it's started after the first frame
+        if (os.cpu_count() or 1) > 1:
+            asset_loader.start()
+
         self.scene = "startup"
-        self.framerateCounter = 0
-        self.fps = 0
         self.errorSettingUp = False
 
+        # Rectangles of the last frame rendered that changed since the frame before it, or None if the whole frame has to be shown
+        self.dirtyRects = None
+        # Scene whose dirty rects were used for the last frame rendered, None if the whole frame was shown
+        self.dirtyRectScene = None
+        # Parts of the HUD drawn over the menus which can change
+        self.hudDirtyRects = src.dirty_rect_tracker.DirtyRectTracker()
+
         # Transition variables (transition between scenes)
         self.transitionImg = None
         self.transitionMode = None
@@ -46,23 +78,54 @@ class Loop():
         self.speedrunTime = 0
         # Font used for the speedrun timer and the FPS counter
         self.font = pygame.font.Font(constants.FONT_PATH, constants.FONT_SIZE)
+        # Both change every frame, so they are drawn from a glyph atlas with a border instead of rendered
+        self.hudText = src.glyph_atlas.GlyphAtlas(self.font, constants.WHITE, 1)
+
+        self.debugOverlay = src.debug_overlay.DebugOverlay()
+        self.profilerOverlay = src.debug_overlay.ProfilerOverlay()
+        quality.report() # Showing the quality level before it first changes
 
         try:
             self.window = src.window.Window()
 
+            # Surfaces every frame is rendered to, reused instead of creating a new one each frame
+            # Created after the window so they have the same pixel format as the screen
+            self.frameBuffers = src.surface_pool.SurfacePool(constants.SCREEN_SIZE, constants.FRAME_BUFFER_COUNT)
+
+            # Last frame before a transition, which is faded to black, kept here since the frame buffers are reused
+            self.transitionBuffer = pygame.Surface(constants.SCREEN_SIZE)
+            # Black surface drawn over the new scene to fade it in from black
+            self.fadeSurface = pygame.Surface(constants.SCREEN_SIZE)
+
             self.startupAnim = src.animation.Animation(
                 3, # Amount of frames between each frame of the animation
                 path = constants.CTM_LOGO_PATH, 
                 width = constants.SCREEN_SIZE[0]
             )
-            self.startupSound = pygame.mixer.Sound("res/sound/intro.wav")
+            self.startupSound = pygame.mixer.Sound(constants.INTRO_SOUND_PATH)
 
             self.cutsceneData = utility.load_json(constants.CUTSCENE_DATA_PATH)
             # Level data is the stuff about the level
             self.levels, self.levelData = utility.load_levels(constants.LEVELS_PATH)
             self.levelsList = self.gen_levels_list()
 
+            if replayPath is not None:
+                # Playing back a replay, starting from the save it was recorded with
+                replayer = src.replay.InputReplayer(replayPath)
+                replayer.setup_save()
+                seed = replayer.seed
+                self.window.replayer = replayer
+
+            else:
+                seed = random.randrange(2 ** 32)
+
             save = self.load_save()
+
+            if replayPath is None and constants.RECORD_INPUTS:
+                self.window.recorder = src.replay.InputRecorder(seed, save)
+
+            # Seeding the bosses' random numbers, so replays play out the same way
+            utility.gameRandom.seed(seed)
             # Setting volume
             pygame.mixer.music.set_volume(int(save["volume"]) / 100)
 
@@ -72,15 +135,17 @@ class Loop():
                 "showFPS": int(save["showFPS"])
             }
 
-            # Setting up scenes
-            self.scenes = {
-                "playing": src.playing.Playing(),
-                "bossLevel": src.boss_level.BossLevel(),
-                "cutscene": src.cutscenes.Cutscenes(self.remove_cutscenes, self.crystals),
-                "mainMenu": src.main_menu.MainMenu(save, self.levelsList, self.levelsCompleted, self.crystals, self.remove_cutscenes),
-                "settings": src.settings.Settings(save),
-                "pauseMenu": src.pause_menu.PauseMenu()
-            }
+            # Save the game started with, which the scenes are created with even if they're first used later
+            self.startupSave = save
+
+            # Setting up scenes, which are created when they're first used
+            self.scenes = src.scene_registry.SceneRegistry()
+            self.scenes.register("playing", lambda: src.playing.Playing())
+            self.scenes.register("bossLevel", lambda: src.boss_level.BossLevel())
+            self.scenes.register("cutscene", lambda: src.cutscenes.Cutscenes(self.remove_cutscenes, self.crystals))
+            self.scenes.register("mainMenu", lambda: src.main_menu.MainMenu(save, self.levelsList, self.levelsCompleted, self.crystals, self.remove_cutscenes))
+            self.scenes.register("settings", lambda: src.settings.Settings(save))
+            self.scenes.register("pauseMenu", lambda: src.pause_menu.PauseMenu())
 
             self.prevScene = self.scene # For the pause menu resuming
         
@@ -127,31 +192,15 @@ class Loop():
         return levelList
 
 
-    def run_framerate(self):
-        """Is run in the background. Manages the framerate and updates the framerate variable every second."""
-        while not self.window.closeWindow:
-            sleep(1) # Delay a second
-            self.fps = self.framerateCounter # Get the number of frames in the past second
-            self.framerateCounter = 0 # Reset framerateCounter
-
-
     def run_game(self):
         """This handles the main game loop, along with any errors that occur in the game"""
         if not self.errorSettingUp: # If there was no error while setting up
-            # Starting FPS counter
-            framerate = threading.Thread(target=self.run_framerate, args=(), daemon=True)
-            framerate.start()
-
             self.startupSound.play() # Playing startup sound
 
             try:
                 # Main Loop
                 while not self.window.closeWindow:
-                    self.window.flip() # Display on screen
-                    self.framerateCounter += 1 # Increment framerateCounter
-
-                    self.update() # Update scene
-                    self.render() # Render scene
+                    self.run_frame()
             
             except Exception:
                 # handles errors that occured in game
@@ -163,6 +212,93 @@ class Loop():
             self.save_and_exit()
             
 
+    def run_frame(self):
+        """
+        Runs a single frame of the game, displaying the last frame and then updating and rendering the scene.
+        In the low latency modes (see LATENCY_MODE in src/constants.py) the frame is displayed as soon as it's rendered instead,
+        waiting for the next frame afterwards, or before the inputs are polled in the late latch mode.
+        When the scene is idle (see is_idle), it waits for an input instead of the next frame.
+        """
+        profiler.new_frame()
+
+        # Timing the last frame, in the scene, level, and room it ended in
+        scene = self.scenes.get(self.scene)
+        frame_stats.new_frame(self.scene, self.level, getattr(scene, "room", None))
+
+        # Letting the quality governor know how long the last frame took without waiting for the next one
+        lastFrame = profiler.get_frames(1)
+        if lastFrame:
+            waits = ["clock tick", "idle"]
+            if self.window.pacer.strategy == "vsync":
+                # Showing the frame waits for the screen to refresh with vsync, which isn't work either
+                waits += ["display flip", "display update"]
+
+            quality.update(lastFrame[0]["frame"] - sum(lastFrame[0].get(name, 0) for name in waits))
+
+        # Waiting for an input instead of the next frame if nothing would change without one
+        idle = self.is_idle()
+
+        if constants.LATENCY_MODE == "normal":
+            self.window.flip(self.dirtyRects, wait = not idle) # Display on screen
+
+            if idle:
+                frame_stats.skip(self.window.wait_for_event(constants.IDLE_TIMEOUT))
+
+            self.update() # Update scene
+            self.render() # Render scene
+
+        else:
+            if idle:
+                frame_stats.skip(self.window.wait_for_event(constants.IDLE_TIMEOUT))
+
+            elif constants.LATENCY_MODE == "late latch":
+                self.window.late_latch()
+
+            self.update()
+            self.render()
+
+            self.window.flip(self.dirtyRects, wait = constants.LATENCY_MODE == "low" and not self.is_idle())
+
+        if "first frame" not in self.startupTimes:
+            self.note_startup_time("first frame")
+            asset_loader.start() # If it wasn't started already
+
+        asset_loader.cache_next()
+
+
+    def note_startup_time(self, name):
+        """Notes how long it took from when the game started setting up to get to a point of starting up, logging it and showing it on the debug overlay"""
+        self.startupTimes[name] = (time.perf_counter() - self.startTime) * 1000
+        self.logger.info(f"Time to {name}: {self.startupTimes[name]:.1f}ms")
+
+        instrumentation.report("startup", ", ".join(f"{name} {ms:.0f}ms" for name, ms in self.startupTimes.items()))
+
+
+    def is_idle(self) -> bool:
+        """
+        Checks if the scene is idle, which is when it's one of the menus, there were no events in the last frame, no button highlights are moving, and there's no transition.
+        Nothing on the screen changes until there's an input then, so the loop waits for one instead of running at the full frame rate.
+        Never idle when the frame rate isn't capped, when playing back a replay, or when an overlay (which changes every frame) is shown.
+        """
+        if not constants.IDLE_THROTTLING or not constants.CAP_FPS or self.window.replayer is not None:
+            return False
+
+        if self.scene not in ("mainMenu", "settings", "pauseMenu") or self.transitionImg is not None:
+            return False
+
+        if self.window.eventCount > 0 or self.debugOverlay.show or self.profilerOverlay.show:
+            return False
+
+        return not any(button.is_moving() for button in self.scenes[self.scene].buttons.values())
+
+
+    def music_stopped(self, *names):
+        """Tells the scenes named that the music has stopped, skipping any that haven't been created (they start without music)"""
+        for name in names:
+            if self.scenes.is_created(name):
+                self.scenes[name].music_stopped()
+
+
     def increment_index(self):
         """Sets the level to completed and adds one to the current level index"""
         
@@ -200,7 +336,10 @@ class Loop():
         
         if not speedrun:
             self.scenes["mainMenu"].update_info(self.level, self.levelsCompleted, self.ending, self.crystals)
-            self.scenes["cutscene"].update_crystals(self.crystals)
+
+            # A cutscene scene created later is created with the new crystals
+            if self.scenes.is_created("cutscene"):
+                self.scenes["cutscene"].update_crystals(self.crystals)
     
 
     def check_crystals(self, command) -> bool:
@@ -212,16 +351,45 @@ class Loop():
     
 
     def start_transition(self):
-        """Sets up transition variables"""
-        self.transitionImg = self.render().copy()
+        """Sets up transition variables, starting the transition from the last frame rendered"""
+        frame_stats.event("transition start")
+
+        self.transitionBuffer.blit(self.frameBuffers.get_last(), (0, 0))
+        self.transitionImg = self.transitionBuffer
         self.transitionMode = "into"
         self.transitionAlpha = 255
 
 
     def update(self):
         """This method updates the scene the game is in, along with the window class"""
-        self.window.update_inputs()
+        instrumentation.new_frame()
+
+        if constants.DEBUG_ALLOCATIONS:
+            src.allocation_counter.new_frame()
+
+        text_cache.report()
+
+        with profiler.phase("inputs"):
+            self.window.update_inputs()
+
+        if self.window.inputs["debug"]:
+            self.debugOverlay.toggle()
+
+        if self.window.inputs["profiler"]:
+            self.profilerOverlay.toggle()
+
+        if self.window.inputs["exportProfile"]:
+            profiler.export_csv()
+
+        if self.window.inputs["dumpHitches"]:
+            frame_stats.dump()
 
+        with profiler.phase("update"):
+            self.update_scene()
+
+
+    def update_scene(self):
+        """Updates the scene the game is in, or the transition if there is one"""
         if self.speedrun and self.scene not in ("mainMenu", "pauseMenu"):
             # Adding time to the speedrun timer
             self.speedrunTime += 1/60 # Each frame is 1/60 of a second
@@ -235,8 +403,8 @@ class Loop():
                 if self.transitionAlpha <= 0: # Reached full dark
                     self.transitionAlpha = constants.TRANSITION_SPEED
                     self.transitionMode = "out"
-                    # Gets the new scene
-                    self.transitionImg = self.render(withoutTransition = True, draw = False).copy() 
+
+                return None # Doesn't update anything else while fading out the old scene
             
             elif self.transitionMode == "out": # Fading out of black
                 self.transitionAlpha += constants.TRANSITION_SPEED
@@ -244,17 +412,25 @@ class Loop():
                 if self.transitionAlpha >= 255:
                     self.transitionImg = None # Stop transition
 
-            return None # Doesn't update anything else while transitioning
+            # The new scene keeps running while fading in
+
+        if self.scene == "startup":
+            # Creating the main menu during the startup animation as soon as its images are decoded, so it's ready when the animation ends
+            if asset_loader.is_ready("main menu") and not self.scenes.is_created("mainMenu"):
+                self.scenes.create("mainMenu")
 
-        elif self.scene == "startup":
             # Startup animation scene
             if not self.startupAnim.update(): # If the startup animation finished
+                asset_loader.wait("main menu")
                 self.start_transition()
                 self.scene = "mainMenu"
                 self.scenes["mainMenu"].start_music()
                 del self.startupAnim
         
         elif self.scene == "mainMenu": # Updating main menu
+            if "interactive" not in self.startupTimes:
+                self.note_startup_time("interactive")
+
             result = self.scenes["mainMenu"].update(self.window.mousePos, self.window.mousePressed)
 
             if result is not None:
@@ -335,8 +511,7 @@ class Loop():
                         self.scenes["mainMenu"].update_info(self.level, self.levelsCompleted, self.ending, self.crystals)
 
                     # Tells these that the music has stopped
-                    self.scenes["playing"].music_stopped()
-                    self.scenes["bossLevel"].music_stopped()
+                    self.music_stopped("playing", "bossLevel")
         
         else:
             # Handles all "playing" scenes such as boss levels, cutscenes, and normal levels
@@ -366,81 +541,132 @@ class Loop():
                     self.switch_to_new_scene(self.level)
 
 
-        if self.scene not in ("startup", "pauseMenu", "mainMenu", "settings"): # Scenes without a pause button
-            if self.scenes["pauseMenu"].check_for_pause(
-                self.window.inputs, 
-                self.window.mousePos, 
-                self.window.mousePressed
-                ): # If the escape button or the pause button has been pressed
-
-                self.prevScene = self.scene
-
-                # Gets the background for the pause menu
-                self.scenes[self.scene].render(self.window.miniWindow)
-                # Getting level info for pause menu
-                if self.levelsList[self.level] == "Cutscene":
-                    level = "Cutscene"
-                else:
-                    level = f"Level {self.remove_cutscenes(self.level) + 1}"
-                # Getting room number and level length for pause menu
-                room = self.scenes[self.scene].room + 1
-                levelLength = len(self.levels[self.level])
-                # Updating pause menu info
-                self.scenes["pauseMenu"].update_info(self.window.miniWindow, level, room, levelLength)
-                
-                self.scene = "pauseMenu"
+        # Scenes without a pause button, and not while fading in
+        if self.scene not in ("startup", "pauseMenu", "mainMenu", "settings") and self.transitionImg is None:
+            with profiler.phase("pause check"):
+                self.check_pause()
     
 
-    def render(self, withoutTransition = False, draw = True) -> "pygame.Surface":
-        """This method renders all objects, based on the current scene """
-        surf = pygame.Surface(constants.SCREEN_SIZE)
+    def check_pause(self):
+        """Switches to the pause menu if the escape button or the pause button has been pressed"""
+        if self.scenes["pauseMenu"].check_for_pause(
+            self.window.inputs, 
+            self.window.mousePos, 
+            self.window.mousePressed
+            ): # If the escape button or the pause button has been pressed
+
+            self.prevScene = self.scene
+
+            # Gets the background for the pause menu
+            self.scenes[self.scene].render(self.window.miniWindow)
+            # Getting level info for pause menu
+            if self.levelsList[self.level] == "Cutscene":
+                level = "Cutscene"
+            else:
+                level = f"Level {self.remove_cutscenes(self.level) + 1}"
+            # Getting room number and level length for pause menu
+            room = self.scenes[self.scene].room + 1
+            levelLength = len(self.levels[self.level])
+            # Updating pause menu info
+            self.scenes["pauseMenu"].update_info(self.window.miniWindow, level, room, levelLength)
+            
+            self.scene = "pauseMenu"
+
+
+    def render(self) -> "pygame.Surface":
+        """
+        This method renders all objects, based on the current scene.
+        Returns the surface rendered to, which is reused by a later frame, so it has to be copied to be kept.
+        """
+        surf = self.frameBuffers.get()
+
+        if self.transitionImg is not None and self.transitionMode == "into":
+            profiler.start("transition")
+            # Fading the old scene's last frame to black, which the frame is cleared to
+            self.transitionImg.set_alpha(self.transitionAlpha)
+            surf.blit(self.transitionImg, (0, 0))
+            profiler.stop()
 
-        if self.transitionImg is None or withoutTransition:
+        else:
             if self.scene == "startup": # Startup animation
-                self.startupAnim.render(surf, (0, 0))
+                with profiler.phase("render"):
+                    self.startupAnim.render(surf, (0, 0))
             
             else: # Normal scenes
-                self.scenes[self.scene].render(surf)
+                with profiler.phase("render"):
+                    self.scenes[self.scene].render(surf)
 
                 if self.scene not in ("mainMenu", "pauseMenu", "settings"):
+                    profiler.start("hud")
                     # Rendering pause button
                     self.scenes["pauseMenu"].render_pause_button(surf)
 
                     # Rendering speedrun time
                     if self.speedrun:
                         time = utility.seconds_to_readable_time(self.speedrunTime) # Turning current time into a readable one
-                        timeRender = self.font.render(time, False, constants.WHITE) # Rendered surface
                         # Centered on the x axis
-                        timePos = (constants.SCREEN_SIZE[0] / 2 - timeRender.get_width() / 2, 0)
+                        timePos = (constants.SCREEN_SIZE[0] / 2 - self.hudText.size(time)[0] / 2, 0)
                         # Drawing with a black border
-                        utility.draw_text_with_border(
-                            surf, timePos, time, self.font, 
-                            constants.WHITE, 
-                            renderText = timeRender
-                        )
-        
-        else: # Render transition
-            self.transitionImg.set_alpha(self.transitionAlpha)
-            surf.blit(self.transitionImg, (0, 0))
+                        self.hudText.render(surf, timePos, time)
+                    profiler.stop()
+
+            if self.transitionImg is not None:
+                profiler.start("transition")
+                # Fading the new scene in from black, darkening it less every frame
+                self.fadeSurface.set_alpha(255 - self.transitionAlpha)
+                surf.blit(self.fadeSurface, (0, 0))
+                profiler.stop()
         
+        profiler.start("hud")
         # Rendering FPS
         if self.settings["showFPS"]:
-            fpsRender = self.font.render(f"{self.fps} FPS", False, constants.WHITE)
+            fpsText = f"{frame_stats.fps} FPS"
             # Locking to the top right corner
-            fpsPos = (constants.SCREEN_SIZE[0] - fpsRender.get_width() - 1, 0)
+            fpsPos = (constants.SCREEN_SIZE[0] - self.hudText.size(fpsText)[0] - 1, 0)
             # Drawing with a border
-            utility.draw_text_with_border(
-                surf, fpsPos, f"{self.fps} FPS", self.font,
-                constants.WHITE,
-                renderText = fpsRender
-            )
+            rect = self.hudText.render(surf, fpsPos, fpsText)
+            self.hudDirtyRects.mark("fps", fpsText, rect)
+
+        self.debugOverlay.render(surf)
+        self.profilerOverlay.render(surf)
+        profiler.stop()
         
-        if draw:
-            self.window.miniWindow.blit(surf, (0, 0))
+        self.window.miniWindow.blit(surf, (0, 0))
+        self.dirtyRects = self.get_dirty_rects()
 
         return surf
 
 
+    def get_dirty_rects(self) -> list:
+        """
+        Gets the rectangles of the frame just rendered that changed since the last frame, from the scene's dirty rect tracker.
+        Only the menus keep track of what changed, so None (the whole frame) is returned for other scenes, transitions, overlays,
+        and for the first frame of a scene, since the frame before it was different.
+        """
+        scene = self.scenes[self.scene] if self.scene != "startup" else None
+        tracker = getattr(scene, "dirtyRects", None)
+
+        if tracker is None:
+            # Forgetting the HUD drawn, since the scene drew over it
+            self.hudDirtyRects.get_dirty_rects()
+            self.dirtyRectScene = None
+            return None
+
+        # Called every frame so the trackers compare with the last frame, even if the whole frame is shown
+        rects = tracker.get_dirty_rects() + self.hudDirtyRects.get_dirty_rects()
+
+        # Transitions and the overlays change the whole frame
+        tracked = self.transitionImg is None and not self.debugOverlay.show and not self.profilerOverlay.show
+        # The whole frame is shown when switching to tracking the scene, since the last frame shown may be anything
+        fullFrame = not tracked or self.dirtyRectScene != self.scene
+        self.dirtyRectScene = self.scene if tracked else None
+
+        if fullFrame:
+            return None
+
+        return rects
+
+
     def switch_to_new_scene(self, level, testEnding = True):
         """Switches to a new scene based on the level id it's given to switch to"""
         save = utility.load_save()
@@ -462,8 +688,7 @@ class Loop():
             # Sets up main menu
             self.scene = "mainMenu"
             self.scenes["mainMenu"].start_music()
-            self.scenes["playing"].music_stopped()
-            self.scenes["bossLevel"].music_stopped()
+            self.music_stopped("playing", "bossLevel")
 
             return None # Exits without running the rest
 
@@ -499,14 +724,14 @@ class Loop():
             # Creating the popup saying the level number
             self.scenes["playing"].popup(f"Level {self.remove_cutscenes(level) + 1}")
             # Other playing scene, telling it that the music has stopped
-            self.scenes["bossLevel"].music_stopped()
+            self.music_stopped("bossLevel")
         
         elif self.levelsList[level] == "Boss Level":
             # Sets up boss level
             self.scene = "bossLevel"
             self.scenes["bossLevel"].setup(self.levelData[level]["boss"], level, self.crystals, self.remove_cutscenes(level), entities = entities)
             self.scenes["bossLevel"].popup(f"Level {self.remove_cutscenes(level) + 1}")
-            self.scenes["playing"].music_stopped()
+            self.music_stopped("playing")
 
         elif self.levelsList[level] == "Cutscene":
             if not self.speedrun:
@@ -515,8 +740,7 @@ class Loop():
                 self.scenes["cutscene"].setup(self.levelData[level]["cutscene"], level)
 
                 # Tells these that the music has stopped
-                self.scenes["playing"].music_stopped()
-                self.scenes["bossLevel"].music_stopped()
+                self.music_stopped("playing", "bossLevel")
             else:
                 # Skips cutscene if speedrunning
                 self.level = level + 1
@@ -525,6 +749,10 @@ class Loop():
 
     def save_and_exit(self):
         """This method saves all data to a database for later playing"""
+        if self.window.recorder is not None:
+            self.logger.info("Saving replay...")
+            self.window.recorder.save_to_folder()
+
         self.logger.info("Saving game...")
 
         if not self.speedrun:
@@ -532,17 +760,21 @@ class Loop():
             utility.modif_save({
                 # Game data
                 "levels": "".join([str(x) for x in self.levelsCompleted]),
-                "level": self.scenes["playing"].level,
+                # Scenes that were never used still have the values they would have been created with
+                "level": self.scenes["playing"].level if self.scenes.is_created("playing") else 0,
                 "crystals": "".join([str(x) for x in self.crystals]),
                 # Settings
                 "showText": self.settings["showText"],
                 "showCharacters": self.settings["showCharacters"],
                 "showFPS": self.settings["showFPS"],
-                "volume": self.scenes["settings"].volume,
+                "volume": self.scenes["settings"].volume if self.scenes.is_created("settings") else int(self.startupSave["volume"]),
                 # Saving speedrun time
-                "speedrunHighscore": self.scenes["mainMenu"].speedrunHighscore
+                "speedrunHighscore": self.scenes["mainMenu"].speedrunHighscore if self.scenes.is_created("mainMenu") else self.startupSave["speedrunHighscore"]
             }) 
 
+        # Not quitting Pygame while images are still being decoded
+        asset_loader.stop()
+
         self.logger.info("Exiting Pygame...")
         
         # Quits Pygame
@@ -3,8 +3,11 @@ import logging
 
 import src.constants as constants
 import src.utility as utility
+import src.asset_loader as asset_loader
 import src.button
 import src.tile_renderer
+import src.dirty_rect_tracker
+import src.layer_compositor
 
 
 class MainMenu():
@@ -26,14 +29,14 @@ class MainMenu():
 
         self.speedrunHighscore = save["speedrunHighscore"]
 
-        self.crystal_check = pygame.image.load(constants.CRYSTAL_CHECK_PATH).convert_alpha()
-        self.crystal_x = pygame.image.load(constants.CRYSTAL_X_PATH).convert_alpha()
+        self.crystal_check = asset_loader.load_image(constants.CRYSTAL_CHECK_PATH).convert_alpha()
+        self.crystal_x = asset_loader.load_image(constants.CRYSTAL_X_PATH).convert_alpha()
 
-        arrow = pygame.image.load(constants.ARROW_PATH).convert_alpha()
-        cog = pygame.image.load(constants.COG_PATH)
+        arrow = asset_loader.load_image(constants.ARROW_PATH).convert_alpha()
+        cog = asset_loader.load_image(constants.COG_PATH)
 
-        self.screenShadow = pygame.image.load(constants.SCREEN_SHADOW_PATH).convert_alpha()
-        self.logo = pygame.image.load(constants.TIN_LOGO_PATH).convert_alpha()
+        self.screenShadow = asset_loader.load_image(constants.SCREEN_SHADOW_PATH).convert_alpha()
+        self.logo = asset_loader.load_image(constants.TIN_LOGO_PATH).convert_alpha()
 
         self.levels, self.levelData = utility.load_levels(constants.LEVELS_PATH)
 
@@ -86,6 +89,19 @@ class MainMenu():
         # For nonbutton text
         self.otherTextFont = pygame.font.Font(constants.FONT_PATH, constants.FONT_SIZE)
 
+        # Parts of the menu that change, so only they are shown again when they do
+        self.dirtyRects = src.dirty_rect_tracker.DirtyRectTracker()
+
+        # Everything under the buttons and text never changes, so it's cached as one surface
+        self.layers = src.layer_compositor.LayerCompositor(dirtyRects = self.dirtyRects)
+        self.layers.add("background", "static", lambda surface: surface.blit(self.background, (0, 0)))
+        self.layers.add("screen shadow", "static", lambda surface: surface.blit(self.screenShadow, (0, 0)))
+        # Centers logo on the x axis
+        self.layers.add("logo", "static", lambda surface: surface.blit(self.logo, (constants.SCREEN_SIZE[0] / 2 - self.logo.get_width() / 2, 15)))
+        self.layers.add("level selector label", "static", lambda surface: utility.centered_text(surface, "Level Selector", (255, constants.SCREEN_SIZE[1] / 2 + 5), self.otherTextFont))
+        self.layers.add("buttons", "animated", self.render_buttons)
+        self.layers.add("info", "animated", self.render_info)
+
 
     def start_music(self):
         """Plays main menu music"""
@@ -169,17 +185,19 @@ class MainMenu():
 
     
     def render(self, window):
-        """Renders everything in the scene to the window"""
-        window.blit(self.background, (0, 0))
-        window.blit(self.screenShadow, (0, 0))
+        """Renders everything in the scene to the window with its layers, marking the parts that can change on the dirty rect tracker"""
+        self.layers.render(window)
 
-        # Centers logo on the x axis
-        window.blit(self.logo, (constants.SCREEN_SIZE[0] / 2 - self.logo.get_width() / 2, 15))
 
-        # Rendering all buttons
-        for button in self.buttons.values():
+    def render_buttons(self, window):
+        """Renders all buttons, marking them on the dirty rect tracker"""
+        for key, button in self.buttons.items():
             button.render(window)
-        
+            self.dirtyRects.mark(key, button.get_render_state(), button.rect)
+
+
+    def render_info(self, window):
+        """Renders the text about the button hovered over and the level selected, marking it on the dirty rect tracker"""
         # If the mouse is hovering over the Speedrun button, display some infromation underneath
         if self.buttons["speedrun"].selected:
             if self.ending != -1:
@@ -189,18 +207,18 @@ class MainMenu():
                     highscore = utility.seconds_to_readable_time(float(self.speedrunHighscore))
                 else:
                     highscore = "---"
-                utility.centered_text(window, "Highscore: " + highscore, (120, constants.SCREEN_SIZE[1] / 2 + 83), self.otherTextFont)
+                text = "Highscore: " + highscore
                 # Displaying warning message
                 # utility.centered_text(window, "DOESN'T SAVE!", (120, constants.SCREEN_SIZE[1] / 2 + 95), self.otherTextFont)
             else:
-                utility.centered_text(window, "Finish the game to\nunlock speedrun mode.", (120, constants.SCREEN_SIZE[1] / 2 + 83), self.otherTextFont)
+                text = "Finish the game to\nunlock speedrun mode."
+            rect = utility.centered_text(window, text, (120, constants.SCREEN_SIZE[1] / 2 + 83), self.otherTextFont)
+            self.dirtyRects.mark("speedrunInfo", text, rect)
         
         # If the mouse is hovering over the Restart button, say that it wipes your data
         if self.buttons["newSave"].selected:
-            utility.centered_text(window, "IRREVERSIBLE!", (120, constants.SCREEN_SIZE[1] / 2 + 53), self.otherTextFont)
-        
-        # Draws the "level selector" text
-        utility.centered_text(window, "Level Selector", (255, constants.SCREEN_SIZE[1] / 2 + 5), self.otherTextFont)
+            rect = utility.centered_text(window, "IRREVERSIBLE!", (120, constants.SCREEN_SIZE[1] / 2 + 53), self.otherTextFont)
+            self.dirtyRects.mark("newSaveWarning", None, rect)
 
         if self.levelsList[self.lvlsIndex] != "Cutscene": # If the selected level isn't a cutscene
             # Level number not including cutscenes (and adding one so it doesn't start at zero)
@@ -208,20 +226,25 @@ class MainMenu():
         else:
             # Getting cutscene name
             text = self.levelData[self.lvlsIndex]["cutscene"]
-        utility.centered_text(window, text, (255, constants.SCREEN_SIZE[1] / 2 + 20), self.otherTextFont)
+        rect = utility.centered_text(window, text, (255, constants.SCREEN_SIZE[1] / 2 + 20), self.otherTextFont)
+        self.dirtyRects.mark("levelName", text, rect)
 
         # Rendering the type of level
-        utility.centered_text(window, self.levelsList[self.lvlsIndex], (255, constants.SCREEN_SIZE[1] / 2 + 30), self.otherTextFont)
+        rect = utility.centered_text(window, self.levelsList[self.lvlsIndex], (255, constants.SCREEN_SIZE[1] / 2 + 30), self.otherTextFont)
+        self.dirtyRects.mark("levelType", self.levelsList[self.lvlsIndex], rect)
 
         levelStatus, color = self.get_status(self.lvlsIndex)
         
         # Rendering the status of the level, whether it's completed, unlocked, or locked
-        utility.centered_text(window, levelStatus, (255, constants.SCREEN_SIZE[1] / 2 + 45), self.otherTextFont, color)
+        rect = utility.centered_text(window, levelStatus, (255, constants.SCREEN_SIZE[1] / 2 + 45), self.otherTextFont, color)
+        self.dirtyRects.mark("levelStatus", levelStatus, rect)
 
         # If the level isn't a cutscene
         if "cutscene" not in self.levelData[self.lvlsIndex]and "crystal moves on" not in self.levelData[self.lvlsIndex]:
             # Rendering the little crystal icon for whether you've gotten it or not
-            if self.crystals[self.remove_cutscenes(self.lvlsIndex)]:
-                window.blit(self.crystal_check, (218, constants.SCREEN_SIZE[1] / 2 + 22))
+            collected = self.crystals[self.remove_cutscenes(self.lvlsIndex)]
+            if collected:
+                rect = window.blit(self.crystal_check, (218, constants.SCREEN_SIZE[1] / 2 + 22))
             else:
-                window.blit(self.crystal_x, (218, constants.SCREEN_SIZE[1] / 2 + 22))
\ No newline at end of file
+                rect = window.blit(self.crystal_x, (218, constants.SCREEN_SIZE[1] / 2 + 22))
+            self.dirtyRects.mark("crystal", collected, rect)
\ No newline at end of file
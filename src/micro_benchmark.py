@@ -0,0 +1,191 @@
+"""
+This file times the helpers that are called the most (or that take the longest) on their own, without running whole frames.
+Every benchmark is warmed up, then timed for a number of repetitions, with each repetition calling the helper
+enough times to take a couple of milliseconds so the timer's resolution doesn't matter.
+The minimum and median time per call are reported, since the minimum is the least affected by anything else running.
+Used by bench.py with --micro, which should be run instead of this file.
+"""
+
+import os
+import sys
+import time
+import logging
+import statistics
+
+import pygame
+
+import src.constants as constants
+import src.utility as utility
+import src.benchmark
+import src.object_base
+
+# How long each repetition should take, in seconds, when choosing how many calls it makes
+REPETITION_TIME = 0.002
+
+
+def measure(function, repetitions, warmup) -> dict:
+    """
+    Times the function given, returning the minimum, median, mean, and maximum microseconds per call.
+    Calls it the amount of warmup times first, which isn't timed.
+    """
+    for _ in range(warmup):
+        function()
+
+    # Finding how many calls it takes for a repetition to be long enough
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+
+        if elapsed >= REPETITION_TIME:
+            break
+
+        number *= 2
+
+    times = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        times.append((time.perf_counter() - start) / number * 1e6)
+
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+        "max": max(times),
+        "repetitions": repetitions,
+        "number": number
+    }
+
+
+def create_tile_test_level() -> list:
+    """
+    Creates an empty level with two rooms for testing tile collisions.
+    The first room has a solid tile, a spike, and a special tile (a jump orb) along its bottom, and the second room has a solid tile on its left edge.
+    """
+    level = [[[" "] * constants.SCREEN_TILE_SIZE[0] for _ in range(constants.SCREEN_TILE_SIZE[1])] for _ in range(2)]
+
+    bottom = constants.SCREEN_TILE_SIZE[1] - 1
+    level[0][bottom][2] = "w"
+    level[0][bottom][4] = "^"
+    level[0][bottom][6] = "j"
+    level[1][bottom][0] = "w"
+
+    return level
+
+
+def get_tile_benchmarks(tileRenderer) -> dict:
+    """Gets the benchmarks of ObjectBase.check_tile, with an object placed over each kind of tile in the test level"""
+    level = create_tile_test_level()
+    tileRenderer.setup_room_tile_anims(level[0])
+
+    obj = src.object_base.ObjectBase(constants.PLAYER_ANIMATIONS, (0, 0), (constants.PLAYER_WIDTH, constants.TILE_SIZE[1]))
+    obj.gravityDir = 1
+
+    bottom = constants.SCREEN_TILE_SIZE[1] - 1
+    benchmarks = {}
+
+    # Tile x position, and x position of the object (on the tile, so every check collides)
+    for name, tileX, objX in (
+        ("solid", 2, 2 * constants.TILE_SIZE[0]),
+        ("spike", 4, 4 * constants.TILE_SIZE[0]),
+        ("special", 6, 6 * constants.TILE_SIZE[0]),
+        ("cross-room", constants.SCREEN_TILE_SIZE[0], constants.SCREEN_SIZE[0] - constants.PLAYER_WIDTH // 2)
+    ):
+        def check_tile(tileX = tileX, objX = objX):
+            obj.rect.topleft = (objX, bottom * constants.TILE_SIZE[1])
+            obj.check_tile(level[0], 0, level, (tileX, bottom), tileRenderer, 1, constants.SCREEN_SIZE[1])
+
+        benchmarks[f"check_tile {name}"] = check_tile
+
+    return benchmarks
+
+
+def get_benchmarks(game) -> dict:
+    """Gets a dictionary of benchmark name: function to time, set up with the game's scenes"""
+    benchmarks = {}
+
+    benchmarks["load_levels"] = lambda: utility.load_levels(constants.LEVELS_PATH)
+
+    # Drawing the first room that uses each background tile
+    tileRenderer = game.scenes["playing"].tileRenderer
+    surface = pygame.Surface(constants.SCREEN_SIZE)
+
+    for levelNum, data in enumerate(game.levelData):
+        if "background" not in data:
+            continue
+
+        backgrounds = data["background"].split(", ")
+        for roomNum, room in enumerate(game.levels[levelNum]):
+            background = backgrounds[0] if len(backgrounds) == 1 else backgrounds[roomNum]
+            name = f"draw_tiles {background}"
+
+            if name not in benchmarks:
+                benchmarks[name] = lambda room = room, roomNum = roomNum, background = data["background"]: tileRenderer.draw_tiles(room, roomNum, surface, background)
+
+    benchmarks.update(get_tile_benchmarks(tileRenderer))
+
+    font = pygame.font.Font(constants.FONT_PATH, constants.FONT_SIZE)
+    benchmarks["draw_text_with_border"] = lambda: utility.draw_text_with_border(surface, (10, 10), "Benchmark text", font, constants.WHITE)
+    benchmarks["draw_text_with_border wide"] = lambda: utility.draw_text_with_border(surface, (10, 10), "Benchmark text", font, constants.WHITE, borderWidth = 2, alpha = 150)
+
+    # The speedrun timer, which changes every frame
+    benchmarks["GlyphAtlas.render"] = lambda: game.hudText.render(surface, (10, 10), utility.seconds_to_readable_time(754.32))
+
+    animation = constants.PLAYER_ANIMATIONS["walk"]
+    benchmarks["load_spritesheet"] = lambda: utility.load_spritesheet(animation["path"], width = animation["width"])
+
+    # Halfway highlighted, as if the mouse just moved over it
+    button = next(iter(game.scenes["mainMenu"].buttons.values()))
+    button.highlightYPos = button.rect.height / 2
+    benchmarks["Button.render highlighted"] = lambda: button.render(surface)
+
+    # Every conditional of the cutscene with the most conditionals
+    cutscenes = game.scenes["cutscene"]
+    level = max(
+        (level for level, data in enumerate(game.levelData) if "cutscene" in data),
+        key = lambda level: len(utility.load_json("data/cutscenes.json")[game.levelData[level]["cutscene"]].get("conditionals", {}))
+    )
+    cutscenes.setup(game.levelData[level]["cutscene"], level)
+    conditionals = list(cutscenes.cutsceneData["conditionals"].values())
+
+    def run_conditionals():
+        for conditional in conditionals:
+            cutscenes.run_conditional(conditional)
+
+    benchmarks["run_conditional"] = run_conditionals
+
+    return benchmarks
+
+
+def run(repetitions, warmup, names = None) -> dict:
+    """Runs every benchmark (or only the ones named), returning a dictionary of the results"""
+    game = src.benchmark.create_game()[0]
+
+    results = {
+        "repetitions": repetitions,
+        "warmup": warmup,
+        **src.benchmark.get_system_info(),
+        "benchmarks": {}
+    }
+
+    for name, function in get_benchmarks(game).items():
+        if names and name not in names:
+            continue
+
+        results["benchmarks"][name] = measure(function, repetitions, warmup)
+
+        stats = results["benchmarks"][name]
+        print(f"{name}: {stats['min']:.1f}us min, {stats['median']:.1f}us median ({stats['number']} calls x {repetitions})", file = sys.stderr)
+
+    logging.disable(logging.NOTSET)
+
+    return results
+
+
+def get_default_path() -> str:
+    """Gets the path the results are saved to if no path is given, named with the time"""
+    return os.path.join(constants.BENCHMARKS_FOLDER, f"{time.strftime('%Y-%m-%d %H.%M.%S')}.json")
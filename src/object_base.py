@@ -3,6 +3,8 @@ from math import floor
 
 import src.constants as constants
 import src.utility as utility
+import src.collision_manager
+import src.culling as culling
 
 class ObjectBase:
     """
@@ -42,6 +44,9 @@ class ObjectBase:
         # Direction the object is facing (used in rendering)
         # 1 is right, -1 is left
         self.facing = 1
+
+        # Set by levels so hazard collisions are counted on the debug overlay
+        self.collisionManager = None
         
     
     def switch_anim(self, newAnim):
@@ -79,12 +84,8 @@ class ObjectBase:
 
     def get_mask(self) -> "pygame.mask.Mask":
         """Returns the mask of the current frame of the animation of the object"""
-        objImage = self.animations[self.currentAnim].get_frame()
         # Flips if the gravity direction is opposite
-        objImage = pygame.transform.flip(objImage, False, self.gravityDir == -1)
-        objMask = pygame.mask.from_surface(objImage)
-
-        return objMask
+        return self.animations[self.currentAnim].get_mask(flipY = self.gravityDir == -1)
         
     
     def check_tile(
@@ -136,26 +137,24 @@ class ObjectBase:
                 tile = room[tilePos[1]][tilePos[0]] # tile character (such as "w")
 
                 if tile in constants.SPIKE_ROTATIONS: # If it's a spike
-                    # Rotates the spike image and sets it as the image
-                    image = pygame.transform.rotate(
-                        pygame.image.load(constants.SPIKE_PATH).convert_alpha(), 
-                        constants.SPIKE_ROTATIONS[tile]
-                    )
+                    # Gets the mask of the spike with its rotation
+                    tileMask = tileRenderer.spikeMasks[tile]
                 
                 else:
-                    # Gets the tile's animation frame from the tile renderer
-                    image = tileRenderer.get_tile_anim_frame(tilePos,  globalGravity, gravityBeamYPos)
+                    # Gets the mask of the tile's animation frame from the tile renderer
+                    tileMask = tileRenderer.get_tile_anim_mask(tilePos, globalGravity, gravityBeamYPos)
                 
-                tileMask = pygame.mask.from_surface(image)
-                objMask = self.get_mask()
-
-                # Checking pixel perfect mask collisions
-                collided = tileMask.overlap(
-                    objMask, 
-                    (self.rect.x - tilePos[0] * constants.TILE_SIZE[0] - offset, 
-                    self.rect.y - tilePos[1] * constants.TILE_SIZE[1])
+                tilePosition = (
+                    tilePos[0] * constants.TILE_SIZE[0] + offset, 
+                    tilePos[1] * constants.TILE_SIZE[1]
                 )
 
+                # Checking collisions, first with rectangles and then pixel perfect with masks
+                if self.collisionManager is not None:
+                    collided = self.collisionManager.test(tilePosition, constants.TILE_SIZE, tileMask, self.rect.topleft, self.get_mask())
+                else:
+                    collided = src.collision_manager.overlap(tilePosition, constants.TILE_SIZE, tileMask, self.rect.topleft, self.get_mask())
+
                 if collided:
                     return False, tile
         
@@ -312,12 +311,18 @@ class ObjectBase:
             self.gravityDir = -1 * globalGravity
     
 
+    def get_bounds(self, offset = 0) -> "pygame.Rect":
+        """Gets the rectangle the object is drawn in on the screen, with a given offset"""
+        return self.animations[self.currentAnim].get_bounds((self.rect.x + offset, self.rect.y))
+
+
     def render(self, window, offset = 0):
-        """Renders to the screen, with a given offset (if provided one)"""
-        frame = self.animations[self.currentAnim].get_frame()
+        """Renders to the screen, with a given offset (if provided one). Nothing is drawn if it's entirely off the screen."""
+        if not culling.is_visible(self.get_bounds(offset)):
+            return
 
         # Flips the image horizontally if the facing is the opposite direction
         # Flips the image vertically if the gravity direction is negative
-        frame = pygame.transform.flip(frame, self.facing == -1, self.gravityDir == -1)
+        frame = self.animations[self.currentAnim].get_flipped_frame(self.facing == -1, self.gravityDir == -1)
 
         window.blit(frame, (self.rect.x + offset, self.rect.y))
\ No newline at end of file
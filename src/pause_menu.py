@@ -2,7 +2,11 @@ import pygame
 import logging
 
 import src.button
+import src.text_cache
+import src.dirty_rect_tracker
+import src.layer_compositor
 import src.constants as constants
+import src.asset_loader as asset_loader
 
 class PauseMenu():
     """
@@ -15,7 +19,7 @@ class PauseMenu():
         font = pygame.font.Font(constants.FONT_PATH, 25)
 
         # There Is Nothing logo
-        self.logo = pygame.image.load(constants.TIN_LOGO_PATH).convert_alpha()
+        self.logo = asset_loader.load_image(constants.TIN_LOGO_PATH).convert_alpha()
 
         # Button layout
         buttons = {
@@ -45,6 +49,17 @@ class PauseMenu():
         self.level = None
 
         self.levelFont = pygame.font.Font(constants.FONT_PATH, constants.FONT_SIZE)
+
+        # Buttons on the menu, so only they are shown again when they change
+        self.dirtyRects = src.dirty_rect_tracker.DirtyRectTracker()
+
+        # Everything but the buttons stays the same until the game is paused again, so it's cached as one surface
+        self.layers = src.layer_compositor.LayerCompositor(dirtyRects = self.dirtyRects)
+        self.layers.add("background", "static", lambda surface: surface.blit(self.background, (0, 0)))
+        # Rendering logo centered on the x axis
+        self.layers.add("logo", "static", lambda surface: surface.blit(self.logo, (constants.SCREEN_SIZE[0] / 2 - self.logo.get_width() / 2, 15)))
+        self.layers.add("level", "static", self.render_level)
+        self.layers.add("buttons", "animated", self.render_buttons)
     
 
     def render_pause_button(self, window):
@@ -63,6 +78,8 @@ class PauseMenu():
         self.background.set_alpha(100) # Alpha 
         self.level = level
         self.room = f"Room {room}/{levelLength}"
+
+        self.layers.invalidate()
     
 
     def update(self, inputs, mousePos, mouseInputs) -> str:
@@ -80,21 +97,24 @@ class PauseMenu():
 
     
     def render(self, window):
-        """Renders buttons, background, and logo to the screen"""
-        window.blit(self.background, (0, 0))
+        """Renders buttons, background, and logo to the screen with the menu's layers, marking the buttons on the dirty rect tracker"""
+        self.layers.render(window)
+
 
-        # Rendering buttons
-        for button in self.buttons.values():
+    def render_buttons(self, window):
+        """Renders the buttons, marking them on the dirty rect tracker"""
+        for key, button in self.buttons.items():
             button.render(window)
-        
-        # Rendering logo centered on the x axis
-        window.blit(self.logo, (constants.SCREEN_SIZE[0] / 2 - self.logo.get_width() / 2, 15))
+            self.dirtyRects.mark(key, button.get_render_state(), button.rect)
+
 
+    def render_level(self, window):
+        """Renders the level and room numbers in the top right corner"""
         # Rendering level number in the top right corner
-        text = self.levelFont.render(self.level, False, constants.WHITE)
+        text = src.text_cache.get(self.levelFont, self.level)
         window.blit(text, (constants.SCREEN_SIZE[0] - text.get_width() - 1, 12))
         
         if self.level != "Cutscene":
             # Rendering room number in the top right corner
-            text = self.levelFont.render(self.room, False, constants.WHITE)
+            text = src.text_cache.get(self.levelFont, self.room)
             window.blit(text, (constants.SCREEN_SIZE[0] - text.get_width() - 1, 24))
\ No newline at end of file
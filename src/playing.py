@@ -7,8 +7,12 @@ import math
 
 import src.base_level
 import src.tile_renderer
+import src.layer_compositor
 import src.utility as utility
 import src.constants as constants
+import src.profiler as profiler
+import src.frame_stats as frame_stats
+import src.quality as quality
 
 class Playing(src.base_level.BaseLevel):
     """
@@ -23,14 +27,22 @@ class Playing(src.base_level.BaseLevel):
         self.font = pygame.font.Font(constants.FONT_PATH, constants.FONT_SIZE) # Setting up the font
         self.get_text() # Getting the text for the current room
         
-        # Setup tile drawing surface
-        self.tileSurface = pygame.Surface(constants.SCREEN_SIZE)
-
         self.tileRenderer = src.tile_renderer.TileRenderer()
 
         self.showText = True # Whether or not to show tutorial text
+
+        # Layers the level is drawn with, from the bottom up
+        # The tiles of the room are only drawn again when the room changes, since they're cached
+        self.layers = src.layer_compositor.LayerCompositor()
+        self.layers.add("tiles", "static", self.render_tiles)
+        self.layers.add("tile animations", "animated", lambda surface: self.tileRenderer.render_tiles_with_anims(surface, self.gravityDir, self.gravBeamYPos))
+        self.layers.add("entities", "dynamic", super().render)
+        self.layers.add("gravity beam", "animated", super().render_grav_beam)
+        self.layers.add("text", "animated", self.render_text)
+        self.layers.add("screen shadow", "static", super().render_screen_shadow)
+        self.layers.add("popup", "animated", super().render_popup)
         
-        self.load_room() # Drawing the tiles onto the tile surface
+        self.load_room() # Setting up the tiles of the room
 
         # EDITOR CONTROLS:
         self.placeTile = "w" # Tile to be placed when you click
@@ -57,21 +69,16 @@ class Playing(src.base_level.BaseLevel):
         
 
     def load_room(self):
-        """Loads the rendered tiles in the room, while also setting up the animated tiles in the tile renderer"""
+        """Loads the tiles in the room to be drawn again, while also setting up the animated tiles in the tile renderer"""
         self.logger.info("Loading tiles in room")
+        frame_stats.event("load_room")
         
         if self.showText:
             self.get_text()
 
-        # This is done so that the tile renderer doesn't have to rerender tiles every frame
-        # (for performance)
-        # Instead, the tiles on screen are saved and rendered from that
-        self.tileSurface.fill(constants.BLACK)
-        self.tileRenderer.draw_tiles(
-            self.levels[self.level][self.room], self.room,
-            self.tileSurface,
-            self.levelData[self.level]["background"]
-        )
+        # The tiles are cached by the layers so the tile renderer doesn't have to rerender tiles every frame
+        # (for performance), so they only need to be drawn again when the room changes
+        self.layers.invalidate("tiles")
         self.tileRenderer.setup_room_tile_anims(self.levels[self.level][self.room])
     
     
@@ -90,10 +97,12 @@ class Playing(src.base_level.BaseLevel):
         mousePos = window.mousePos # Position of the mouse
         mousePressed = window.mousePressed # Which mouse buttons were pressed
 
+        profiler.start("level")
         result = super().update(
             inputs,
             self.tileRenderer
         )
+        profiler.stop()
 
         if result == "right":
             if self.room == 0: # If it switched to a new level
@@ -110,7 +119,8 @@ class Playing(src.base_level.BaseLevel):
             return result
 
         # Updates all tiles that have animations (such as orbs)
-        self.tileRenderer.update_tiles_with_anims()
+        with profiler.phase("tiles"):
+            self.tileRenderer.update_tiles_with_anims()
 
         if constants.LEVEL_EDITING:
             """  Mouse Inputs for Editor  """
@@ -141,37 +151,38 @@ class Playing(src.base_level.BaseLevel):
 
 
     def render(self, window):
-        """Renders everything to the screen"""
-        # Drawing tiles
-        window.blit(self.tileSurface, (0, 0))
+        """Renders everything to the screen with the level's layers"""
+        self.layers.render(window)
 
-        # Drawing tiles with animations
-        self.tileRenderer.render_tiles_with_anims(window, self.gravityDir, self.gravBeamYPos)
 
-        # Renders entities and gravity beam
-        super().render(window)
-        super().render_grav_beam(window)
-        
-        # Drawing text if there is any in the room
+    def render_tiles(self, surface):
+        """Draws the tiles of the room, which is only done when the room changes since they're cached by the layers"""
+        self.tileRenderer.draw_tiles(
+            self.levels[self.level][self.room], self.room,
+            surface,
+            self.levelData[self.level]["background"]
+        )
+
+
+    def render_text(self, window):
+        """Draws the tutorial text if there is any in the room"""
         if self.text is not None and self.showText:
             self.textWavX += 0.05
-            
+        
             tList = self.text.split("\\n")
 
+            # The quality governor can stop the text bobbing up and down
+            textYOffset = math.sin(self.textWavX) * constants.TEXT_BOB_INTENSITY if quality.enabled("text bobbing") else 0
+
             # Iterating through a list of the text rows,
             # rendering for every row
             for count, text in enumerate(tList):
                 # Getting the surface with text on it
                 if text != "":
-                    renderText = self.font.render(text, False, constants.WHITE)
-
                     # Calculating position of the text, factoring in the sine wave used to bob up and down and the text row
                     position = (
-                        constants.SCREEN_SIZE[0] / 2 - renderText.get_width() / 2, # Centering text on screen 
-                        20 + math.sin(self.textWavX) * constants.TEXT_BOB_INTENSITY + count * constants.VERTICAL_TEXT_GAP
+                        constants.SCREEN_SIZE[0] / 2 - self.font.size(text)[0] / 2, # Centering text on screen 
+                        20 + textYOffset + count * constants.VERTICAL_TEXT_GAP
                     )
 
-                    utility.draw_text_with_border(window, position, text, self.font, constants.WHITE, renderText = renderText)
-        
-        super().render_screen_shadow(window)
-        super().render_popup(window)
\ No newline at end of file
+                    utility.draw_text_with_border(window, position, text, self.font, constants.WHITE)
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""
+This file times the phases of every frame (such as updating, rendering, and flipping the display),
+keeping the timings of the last frames so they can be shown on the profiler overlay (src/debug_overlay.py) or exported to a CSV file.
+Phases can be inside other phases (such as the player being updated inside of the update phase),
+in which case they are named with the outer phase first, like "update/player".
+"""
+
+import contextlib
+import csv
+import os
+import time
+import logging
+
+import src.constants as constants
+
+logger = logging.getLogger(__name__)
+
+history = [None] * constants.PROFILER_HISTORY # Ring buffer of the timings of the last frames, as dictionaries of phase: milliseconds
+newest = -1 # Index of the newest frame in the history
+length = 0 # Amount of frames in the history
+
+frameTimes = {} # Timings of the current frame
+frameStart = None # When the current frame started
+phaseStack = [] # Names of the phases currently being timed, from outermost to innermost
+phaseStarts = [] # When each of the phases being timed started
+
+
+def new_frame():
+    """Finishes the timings of the current frame, adding them to the history, and starts a new frame. Called by the loop at the start of every frame."""
+    global frameTimes, frameStart, newest, length
+
+    now = time.perf_counter()
+
+    if frameStart is not None:
+        total = (now - frameStart) * 1000
+        # Time spent outside of any phase
+        frameTimes["other"] = max(0, total - sum(ms for name, ms in frameTimes.items() if "/" not in name))
+        frameTimes["frame"] = total
+
+        newest = (newest + 1) % len(history)
+        history[newest] = frameTimes
+        length = min(length + 1, len(history))
+
+    frameTimes = {}
+    frameStart = now
+
+    # A phase that was never stopped (such as by an error) isn't carried into the next frame
+    phaseStack.clear()
+    phaseStarts.clear()
+
+
+def start(name):
+    """
+    Starts timing the phase given until stop is called, for timing long blocks of code without indenting them in a with statement.
+    Every return inside the phase has to stop it first.
+    """
+    phaseStack.append(name)
+    phaseStarts.append(time.perf_counter())
+
+
+def stop():
+    """Stops timing the innermost phase being timed, adding to the time of the phase if it was already timed this frame"""
+    fullName = "/".join(phaseStack)
+    frameTimes[fullName] = frameTimes.get(fullName, 0) + (time.perf_counter() - phaseStarts.pop()) * 1000
+    phaseStack.pop()
+
+
+@contextlib.contextmanager
+def phase(name):
+    """Times everything inside the with statement as the phase given, adding to the time of the phase if it was already timed this frame"""
+    start(name)
+    try:
+        yield
+    finally:
+        stop()
+
+
+def get_frames(amount = None) -> list:
+    """Gets the timings of the last frames in the history (all of them if no amount is given), from oldest to newest"""
+    if amount is None or amount > length:
+        amount = length
+
+    return [history[(newest - lag) % len(history)] for lag in range(amount - 1, -1, -1)]
+
+
+def get_averages(frames) -> dict:
+    """Gets the average milliseconds of every phase in the frames given, counting frames where the phase didn't happen as zero"""
+    averages = {}
+
+    for frame in frames:
+        for name, ms in frame.items():
+            averages[name] = averages.get(name, 0) + ms / len(frames)
+
+    return averages
+
+
+def export_csv(filePath = None) -> str:
+    """Writes the timings of all frames in the history to a CSV file, with a column per phase. Returns the path of the file."""
+    if filePath is None:
+        if not os.path.exists(constants.PROFILES_FOLDER):
+            os.makedirs(constants.PROFILES_FOLDER)
+
+        filePath = f"{constants.PROFILES_FOLDER}/{time.strftime('%Y-%m-%d %H.%M.%S')}.csv"
+
+    frames = get_frames()
+
+    # Every phase that happened, in the order they first happened
+    names = ["frame"]
+    for frame in frames:
+        for name in frame:
+            if name not in names:
+                names.append(name)
+
+    with open(filePath, "w", newline = "") as file:
+        writer = csv.writer(file)
+        writer.writerow(names)
+
+        for frame in frames:
+            writer.writerow([f"{frame.get(name, 0):.3f}" for name in names])
+
+    logger.info(f"Exported timings of {len(frames)} frames to {filePath}")
+
+    return filePath
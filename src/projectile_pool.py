@@ -0,0 +1,140 @@
+import logging
+import numpy as np
+
+FREE = -1 # Owner of a slot which isn't being used
+FOREVER = -1 # Lifetime of a projectile that only goes away when culled or released
+
+class ProjectilePool:
+    """
+    Holds every projectile in a boss level (such as the Belloq's lazers and the Red Stare's mouth)
+    in arrays which are allocated once, with one slot per projectile.
+    Spawning takes a slot from the list of free slots, and releasing puts it back, so no objects are created while playing.
+    Projectiles are moved, aged, and culled all at once for each owner.
+    """
+    def __init__(self, capacity):
+        """Allocates the arrays with the amount of slots given"""
+        self.logger = logging.getLogger(__name__)
+
+        self.positions = np.zeros((capacity, 2)) # Position of each projectile in the level (the start of its line)
+        self.velocities = np.zeros((capacity, 2)) # Pixels moved per frame
+        self.lengths = np.zeros(capacity) # Length of the line the projectile draws in the direction it's moving, in pixels
+        self.lifetimes = np.zeros(capacity, dtype = int) # Frames left before the projectile is released
+        self.owners = np.full(capacity, FREE, dtype = int) # Id of the owner of each projectile
+
+        self.ownerIds = {} # Owner name: id in the owners array
+
+        self.freeSlots = [] # Stack of free slots, the one at the end is used next
+        self.clear()
+
+
+    def clear(self, owner = None):
+        """Releases all projectiles of the owner given, or all projectiles if no owner is given"""
+        if owner is None:
+            self.owners[:] = FREE
+            self.freeSlots = list(range(len(self.owners) - 1, -1, -1))
+
+        else:
+            self.release(self.get_slots(owner))
+
+
+    def __len__(self) -> int:
+        """Amount of projectiles being used"""
+        return len(self.owners) - len(self.freeSlots)
+
+
+    def get_owner_id(self, owner) -> int:
+        """Gets the id used in the owners array for the owner's name"""
+        if owner not in self.ownerIds:
+            self.ownerIds[owner] = len(self.ownerIds)
+
+        return self.ownerIds[owner]
+
+
+    def grow(self):
+        """Doubles the amount of slots. Only happens if there are more projectiles than the pool was made for."""
+        capacity = len(self.owners)
+        self.logger.warning(f"Projectile pool is full, growing from {capacity} to {capacity * 2} slots")
+
+        self.positions = np.concatenate((self.positions, np.zeros((capacity, 2))))
+        self.velocities = np.concatenate((self.velocities, np.zeros((capacity, 2))))
+        self.lengths = np.concatenate((self.lengths, np.zeros(capacity)))
+        self.lifetimes = np.concatenate((self.lifetimes, np.zeros(capacity, dtype = int)))
+        self.owners = np.concatenate((self.owners, np.full(capacity, FREE, dtype = int)))
+
+        self.freeSlots = list(range(capacity * 2 - 1, capacity - 1, -1)) + self.freeSlots
+
+
+    def spawn(self, owner, position, velocity, length = 0, lifetime = FOREVER) -> int:
+        """Puts a projectile into a free slot, returning the slot"""
+        if not self.freeSlots:
+            self.grow()
+
+        slot = self.freeSlots.pop()
+
+        self.positions[slot] = position
+        self.velocities[slot] = velocity
+        self.lengths[slot] = length
+        self.lifetimes[slot] = lifetime
+        self.owners[slot] = self.get_owner_id(owner)
+
+        return slot
+
+
+    def release(self, slots):
+        """Frees the slot or array of slots given so they can be reused"""
+        slots = np.atleast_1d(slots)
+        if len(slots) == 0:
+            return
+
+        self.owners[slots] = FREE
+        # Added in reverse so the lowest of these slots is reused first
+        self.freeSlots.extend(slots[::-1].tolist())
+
+
+    def get_slots(self, owner) -> np.ndarray:
+        """Gets an array of the slots used by the owner given"""
+        return np.flatnonzero(self.owners == self.get_owner_id(owner))
+
+
+    def get_ends(self, slots) -> np.ndarray:
+        """Gets the end points of the projectiles' lines, which go from their positions in the direction they're moving"""
+        velocities = self.velocities[slots]
+        speeds = np.hypot(velocities[:, 0], velocities[:, 1])
+
+        # Projectiles that aren't moving don't have a direction, so they are only a point
+        scale = np.divide(self.lengths[slots], speeds, out = np.zeros_like(speeds), where = speeds > 0)
+
+        return self.positions[slots] + velocities * scale[:, None]
+
+
+    def update(self, owner):
+        """Moves the owner's projectiles by their velocities, releasing the ones whose lifetimes ran out"""
+        slots = self.get_slots(owner)
+        if len(slots) == 0:
+            return
+
+        self.positions[slots] += self.velocities[slots]
+
+        aging = slots[self.lifetimes[slots] > 0]
+        self.lifetimes[aging] -= 1
+        self.release(aging[self.lifetimes[aging] == 0])
+
+
+    def cull(self, owner, bounds):
+        """Releases the owner's projectiles whose lines are completely outside the bounds given (left, top, right, bottom)"""
+        slots = self.get_slots(owner)
+        if len(slots) == 0:
+            return
+
+        starts = self.positions[slots]
+        ends = self.get_ends(slots)
+
+        topLefts = np.minimum(starts, ends)
+        bottomRights = np.maximum(starts, ends)
+
+        outside = (
+            (bottomRights[:, 0] < bounds[0]) | (topLefts[:, 0] > bounds[2]) |
+            (bottomRights[:, 1] < bounds[1]) | (topLefts[:, 1] > bounds[3])
+        )
+
+        self.release(slots[outside])
@@ -0,0 +1,98 @@
+"""
+This file is the quality governor, which turns off optional visual work when frames take longer than their budget.
+Every QUALITY_WINDOW frames, the median time spent working on a frame (not waiting for the next one) is checked.
+If it's over QUALITY_LOWER_THRESHOLD of the budget, the next step in STEPS is turned off, and once it stays under
+QUALITY_RAISE_THRESHOLD for QUALITY_RAISE_WINDOWS checks in a row, the last step turned off is turned back on.
+The gap between the thresholds stops the governor from turning the same step off and on again every check.
+Each step is logged, and the quality level is shown on the debug overlay (src/debug_overlay.py).
+"""
+
+import logging
+import statistics
+
+import src.constants as constants
+import src.instrumentation as instrumentation
+
+logger = logging.getLogger(__name__)
+
+# Steps turned off in order when frames take too long, and turned back on in the opposite order
+STEPS = (
+    "followers", # Rendering Ellipse and Corlen (they're still updated so they're in the right place when turned back on)
+    "text bobbing",
+    "screen shadow",
+    "gravity beam animation", # The gravity beam is drawn as one still image instead
+    "text borders",
+    "screen shake" # In cutscenes
+)
+
+level = 0 # Amount of steps turned off, from the start of the steps
+workTimes = [] # Milliseconds spent working on each frame since the last check
+headroomChecks = 0 # Checks in a row the work time was under the raise threshold
+
+
+def enabled(step) -> bool:
+    """Checks if a step is still turned on"""
+    return STEPS.index(step) >= level
+
+
+def update(ms) -> bool:
+    """
+    Adds the time spent working on a frame, turning a step off or on if it's time to check.
+    Called by the loop every frame. Returns True if a step was turned off or on.
+    """
+    global workTimes, headroomChecks
+
+    if not constants.ADAPTIVE_QUALITY:
+        return False
+
+    workTimes.append(ms)
+    if len(workTimes) < constants.QUALITY_WINDOW:
+        return False
+
+    # The median isn't affected by a single slow frame, such as a room loading
+    median = statistics.median(workTimes)
+    workTimes = []
+
+    budget = 1000 / constants.FPS
+
+    if median > budget * constants.QUALITY_LOWER_THRESHOLD:
+        headroomChecks = 0
+
+        if level < len(STEPS):
+            set_level(level + 1, f"median frame took {median:.2f}ms of {budget:.2f}ms")
+            return True
+
+    elif median < budget * constants.QUALITY_RAISE_THRESHOLD:
+        headroomChecks += 1
+
+        if headroomChecks >= constants.QUALITY_RAISE_WINDOWS and level > 0:
+            headroomChecks = 0
+            set_level(level - 1, f"median frame took {median:.2f}ms of {budget:.2f}ms")
+            return True
+
+    else:
+        headroomChecks = 0
+
+    return False
+
+
+def set_level(newLevel, reason = None):
+    """Sets the amount of steps turned off, logging the step turned off or on"""
+    global level
+
+    if newLevel > level:
+        logger.info(f"Lowering quality, turning off {STEPS[newLevel - 1]}" + (f" ({reason})" if reason else ""))
+    elif newLevel < level:
+        logger.info(f"Raising quality, turning on {STEPS[newLevel]}" + (f" ({reason})" if reason else ""))
+
+    level = newLevel
+    report()
+
+
+def report():
+    """Reports the quality level to the debug overlay, with the steps turned off"""
+    value = f"{len(STEPS) - level}/{len(STEPS)}"
+    if level > 0:
+        value += f" ({', '.join(STEPS[:level])} off)"
+
+    instrumentation.report("quality", value)
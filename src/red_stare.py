@@ -1,9 +1,9 @@
 import pygame
 import logging
-import random
 import math
 
 import src.utility as utility
+import src.culling as culling
 import src.constants as constants
 
 class RedStare:
@@ -11,12 +11,16 @@ class RedStare:
     Red Stare boss (appears in level 19). 
     Instance of this is created in the boss_level.py file.
     Handles everything related to the boss.
+    The mouth is a projectile in the boss level's projectile pool (src/projectile_pool.py).
     """
 
-    def __init__(self): 
+    def __init__(self, projectiles): 
         """Sets up variables and loads animations"""
         self.logger = logging.getLogger(__name__)
 
+        self.projectiles = projectiles
+        self.mouthSlot = None # Slot of the mouth in the projectile pool
+
         self.animations = utility.load_animations_dict(constants.RED_STARE_ANIMATIONS)
 
         self.reset()
@@ -38,13 +42,26 @@ class RedStare:
         self.poppedUp = False
         self.bodyPos = None
         self.cooldown = constants.RED_STARE_COOLDOWN
-        self.mouthPos = None
+
+        self.projectiles.clear("Red Stare")
+        self.mouthSlot = None
 
         self.reset_mouth()
 
+
+    def get_mouth_pos(self) -> list:
+        """Gets the position of the mouth from the start of the level"""
+        return self.projectiles.positions[self.mouthSlot].tolist()
+
+
+    def move_mouth(self, xVelocity, yVelocity):
+        """Moves the mouth by the velocity given"""
+        self.projectiles.velocities[self.mouthSlot] = (xVelocity, yVelocity)
+        self.projectiles.update("Red Stare")
+
     
-    def update(self, player, room, tilesOffset):
-        """Updates the boss, moving it if it is moving. Also checks for collisions between the boss and the player."""
+    def update(self, player, room, tilesOffset, collisionManager):
+        """Updates the boss, moving it if it is moving. Also registers the mouth with the collision manager so collisions with the player are checked."""
         # Updating animations
         for anim in self.animations.values():
             anim.update()
@@ -64,28 +81,32 @@ class RedStare:
                     # add rooms that the player has already gone through 
                     playerRoomX = room * constants.SCREEN_SIZE[0] + player.rect.x
 
-                    randomOffset = random.randint(-constants.RED_STARE_POPUP_RANGE, constants.RED_STARE_POPUP_RANGE)
+                    randomOffset = utility.gameRandom.randint(-constants.RED_STARE_POPUP_RANGE, constants.RED_STARE_POPUP_RANGE)
 
                     self.bodyPos = [
                         playerRoomX + randomOffset, 
                         constants.SCREEN_SIZE[1] - constants.RED_STARE_MOUTH_OFFSET[1]
                     ]
                     
-                    self.mouthPos = [
-                        self.bodyPos[0] + constants.RED_STARE_MOUTH_OFFSET[0], 
-                        self.bodyPos[1] + constants.RED_STARE_MOUTH_OFFSET[1]
-                    ]
+                    # Replacing the mouth from the last time it popped up
+                    self.projectiles.clear("Red Stare")
+                    self.mouthSlot = self.projectiles.spawn(
+                        "Red Stare",
+                        (self.bodyPos[0] + constants.RED_STARE_MOUTH_OFFSET[0], 
+                         self.bodyPos[1] + constants.RED_STARE_MOUTH_OFFSET[1]),
+                        (0, 0)
+                    )
             
             else: # If the boss still needs to move down off the screen
                 self.bodyPos[1] += constants.RED_STARE_POPUP_SPEED
-                self.mouthPos[1] += constants.RED_STARE_POPUP_SPEED
+                self.move_mouth(0, constants.RED_STARE_POPUP_SPEED)
 
         else: # If the boss is moving up or attacking
             if self.mouthMoving: # If the mouth is attacking
                 # Finds the distance between the mouth's starting and ending point
                 totalDis = utility.distance_to(self.mouthStart, self.mouthGoTo)
                 # Finds the distance the mouth still has to go
-                currDis = utility.distance_to(self.mouthPos, self.mouthGoTo)
+                currDis = utility.distance_to(self.get_mouth_pos(), self.mouthGoTo)
 
                 if currDis <= totalDis / 2:
                     # Mouth is closest to the starting point
@@ -100,8 +121,7 @@ class RedStare:
                 velocity = distFromEitherSide / 15 + constants.RED_STARE_MOUTH_SPEED
 
                 # Moving by degree, with velocity
-                self.mouthPos[0] += math.cos(self.mouthDegree) * velocity
-                self.mouthPos[1] += math.sin(self.mouthDegree) * velocity
+                self.move_mouth(math.cos(self.mouthDegree) * velocity, math.sin(self.mouthDegree) * velocity)
 
                 if currDis < 1.5: # If the mouth reached its end point
                     if not self.mouthGoingBack:
@@ -114,9 +134,9 @@ class RedStare:
                             self.bodyPos[1] + constants.RED_STARE_MOUTH_OFFSET[1]
                         )
 
-                        self.mouthStart = self.mouthPos[:]
+                        self.mouthStart = self.get_mouth_pos()
 
-                        self.mouthDegree = utility.angle_to(self.mouthPos, self.mouthGoTo)
+                        self.mouthDegree = utility.angle_to(self.mouthStart, self.mouthGoTo)
                     
                     else: # If the mouth's attack has finished
                         self.logger.info("Mouth attack finished")
@@ -130,7 +150,7 @@ class RedStare:
             else: # If the mouth isn't attacking
                 # Move the body and mouth up
                 self.bodyPos[1] -= constants.RED_STARE_POPUP_SPEED
-                self.mouthPos[1] -= constants.RED_STARE_POPUP_SPEED
+                self.move_mouth(0, -constants.RED_STARE_POPUP_SPEED)
 
                 # If the body has fully appeared on screen
                 if self.bodyPos[1] <= constants.SCREEN_SIZE[1] - self.animations["body"].get_image_height():
@@ -138,7 +158,7 @@ class RedStare:
                     self.mouthMoving = True
 
                     # Used for determining speed later
-                    self.mouthStart = self.mouthPos[:]
+                    self.mouthStart = self.get_mouth_pos()
 
                     # Centers the mouth onto the player
                     self.mouthGoTo = (
@@ -147,50 +167,49 @@ class RedStare:
                     )
 
                     # Direction it's moving in
-                    self.mouthDegree = utility.angle_to(self.mouthPos, self.mouthGoTo)
+                    self.mouthDegree = utility.angle_to(self.mouthStart, self.mouthGoTo)
             
-        # Checking collisions between the mouth and the player
-        if self.mouthPos is not None:
-            pScreenX = player.rect.x + tilesOffset
-            # Boss on screen x position
-            # The mouthPos is the position from the very start of the level
-            bScreenX = self.mouthPos[0] + tilesOffset - room * constants.SCREEN_SIZE[0]
+        # Registering the mouth so collisions with the player are checked
+        if self.mouthSlot is not None:
+            mouthPos = self.get_mouth_pos()
 
-            mask = pygame.mask.from_surface(self.animations["mouth"].get_frame())
-            playerMask = player.get_mask()
-
-            collided = mask.overlap(
-                playerMask, 
-                (pScreenX - bScreenX, 
-                player.rect.y - self.mouthPos[1])
+            # Boss on screen x position
+            # The mouth's position is the position from the very start of the level
+            bScreenX = mouthPos[0] + tilesOffset - room * constants.SCREEN_SIZE[0]
+
+            collisionManager.register(
+                "Red Stare",
+                (bScreenX, mouthPos[1]),
+                (self.animations["mouth"].get_image_width(), self.animations["mouth"].get_image_height()),
+                self.animations["mouth"].get_mask
             )
-            
-            return collided
-            
-        return False
 
     
+    def get_render_positions(self, tilesOffset, room) -> tuple:
+        """Gets the positions on the screen the body and the mouth are drawn at"""
+        offset = tilesOffset - room * constants.SCREEN_SIZE[0]
+
+        if self.mouthMoving:
+            mouthPos = self.get_mouth_pos()
+        else:
+            mouthPos = (self.bodyPos[0] + constants.RED_STARE_MOUTH_OFFSET[0], self.bodyPos[1] + constants.RED_STARE_MOUTH_OFFSET[1])
+
+        return (self.bodyPos[0] + offset, self.bodyPos[1]), (mouthPos[0] + offset, mouthPos[1])
+
+
+    def get_bounds(self, tilesOffset, room) -> tuple:
+        """Gets the rectangles the body and the mouth are drawn in on the screen"""
+        bodyPos, mouthPos = self.get_render_positions(tilesOffset, room)
+        return self.animations["body"].get_bounds(bodyPos), self.animations["mouth"].get_bounds(mouthPos)
+
+
     def render(self, window, tilesOffset, room):
-        """Renders the boss along with its mouth on screen"""
+        """Renders the boss along with its mouth on screen, skipping either if it's off the screen"""
         if self.bodyPos is not None:
-            offset = tilesOffset - room * constants.SCREEN_SIZE[0]
+            bodyPos, mouthPos = self.get_render_positions(tilesOffset, room)
 
-            self.animations["body"].render(
-                window, 
-                (self.bodyPos[0] + offset,
-                self.bodyPos[1])
-            )
+            if culling.is_visible(self.animations["body"].get_bounds(bodyPos)):
+                self.animations["body"].render(window, bodyPos)
 
-            if self.mouthMoving:
-                self.animations["mouth"].render(
-                    window,
-                    (self.mouthPos[0] + offset,
-                    self.mouthPos[1])
-                )
-            
-            else:
-                self.animations["mouth"].render(
-                    window,
-                    (self.bodyPos[0] + constants.RED_STARE_MOUTH_OFFSET[0] + offset,
-                    self.bodyPos[1] + constants.RED_STARE_MOUTH_OFFSET[1])
-                )
\ No newline at end of file
+            if culling.is_visible(self.animations["mouth"].get_bounds(mouthPos)):
+                self.animations["mouth"].render(window, mouthPos)
\ No newline at end of file
@@ -0,0 +1,170 @@
+"""
+This file contains the classes which record the inputs of a play session to a small binary file, and play those recordings back.
+Recordings store the inputs of every frame (run-length encoded), the seed used for the bosses' random numbers, and the save the session started with.
+"""
+
+import struct
+import json
+import os
+import time
+import logging
+
+import src.constants as constants
+import src.utility as utility
+
+# Header: magic bytes, version, random seed, length of the save data
+HEADER_FORMAT = "<4sHQI"
+# A run of identical frames: frame count, pressed buttons (as bits), mouse x, mouse y
+RUN_FORMAT = "<IHhh"
+
+MAGIC = b"BPAR"
+VERSION = 2
+
+# Order of the bits in the pressed buttons number
+INPUT_BITS = ("left", "right", "up", "space", "esc", "enter")
+MOUSE_BITS = ("left", "center", "right")
+
+
+def pack_inputs(window) -> tuple:
+    """Packs the inputs and mouse state of the window into a tuple of (buttons, mouse x, mouse y)"""
+    buttons = 0
+    for bit, key in enumerate(INPUT_BITS):
+        if window.inputs[key]:
+            buttons |= 1 << bit
+
+    for bit, key in enumerate(MOUSE_BITS):
+        if window.mousePressed[key]:
+            buttons |= 1 << (bit + len(INPUT_BITS))
+
+    return (buttons, window.mousePos[0], window.mousePos[1])
+
+
+def unpack_inputs(window, state):
+    """Sets the inputs and mouse state of the window to the packed state given"""
+    buttons, mouseX, mouseY = state
+
+    for bit, key in enumerate(INPUT_BITS):
+        window.inputs[key] = bool(buttons & (1 << bit))
+
+    for bit, key in enumerate(MOUSE_BITS):
+        window.mousePressed[key] = bool(buttons & (1 << (bit + len(INPUT_BITS))))
+
+    window.mousePos = (mouseX, mouseY)
+
+
+class InputRecorder:
+    """
+    Records the inputs of every frame, only storing a new entry when the inputs change.
+    Nothing is written to the disk until save() is called.
+    """
+    def __init__(self, seed, save):
+        """Sets up the runs list, the seed, and the save the session started with"""
+        self.logger = logging.getLogger(__name__)
+
+        self.seed = seed
+        self.save = {key: str(value) for key, value in save.items()} # Save values are stored as strings in the database
+
+        self.runs = [] # List of [frame count, state]
+        self.lastState = None
+
+
+    def record(self, window):
+        """Records the current frame's inputs from the window"""
+        state = pack_inputs(window)
+
+        if state == self.lastState:
+            self.runs[-1][0] += 1 # Same inputs as the previous frame, lengthening the run
+        else:
+            self.runs.append([1, state])
+            self.lastState = state
+
+
+    def write(self, filePath):
+        """Writes the recording to the file path given"""
+        saveData = json.dumps(self.save).encode("utf-8")
+
+        with open(filePath, "wb") as file:
+            file.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, self.seed, len(saveData)))
+            file.write(saveData)
+
+            file.write(struct.pack("<I", len(self.runs)))
+            for count, (buttons, mouseX, mouseY) in self.runs:
+                file.write(struct.pack(RUN_FORMAT, count, buttons, mouseX, mouseY))
+
+        self.logger.info(f"Wrote replay with {len(self.runs)} input runs to {filePath}")
+
+
+    def save_to_folder(self):
+        """Writes the recording to the replays folder with a timestamp for the name, removing the oldest replays past the limit"""
+        if not os.path.exists(constants.REPLAYS_FOLDER):
+            os.makedirs(constants.REPLAYS_FOLDER)
+
+        self.write(f"{constants.REPLAYS_FOLDER}/{time.strftime('%Y-%m-%d %H.%M.%S')}.{constants.REPLAY_EXTENSION}")
+
+        # Removing the oldest replays (the file names are timestamps, so they sort by date)
+        replays = sorted(name for name in os.listdir(constants.REPLAYS_FOLDER) if name.endswith(constants.REPLAY_EXTENSION))
+        for name in replays[:-constants.REPLAYS_KEPT]:
+            os.remove(f"{constants.REPLAYS_FOLDER}/{name}")
+
+
+class InputReplayer:
+    """
+    Plays back a recording made by the InputRecorder,
+    setting the window's inputs to the recorded inputs one frame at a time.
+    """
+    def __init__(self, filePath):
+        """Loads the recording from the file path given"""
+        self.logger = logging.getLogger(__name__)
+
+        with open(filePath, "rb") as file:
+            data = file.read()
+
+        magic, version, self.seed, saveLength = struct.unpack_from(HEADER_FORMAT, data)
+        if magic != MAGIC or version != VERSION:
+            raise Exception(f"{filePath} is not a replay file, or is from a different version of the game")
+
+        offset = struct.calcsize(HEADER_FORMAT)
+        self.save = json.loads(data[offset:offset + saveLength].decode("utf-8"))
+        offset += saveLength
+
+        runAmount = struct.unpack_from("<I", data, offset)[0]
+        offset += 4
+
+        self.runs = []
+        for count, buttons, mouseX, mouseY in struct.iter_unpack(RUN_FORMAT, data[offset:offset + runAmount * struct.calcsize(RUN_FORMAT)]):
+            self.runs.append((count, (buttons, mouseX, mouseY)))
+
+        self.totalFrames = sum(run[0] for run in self.runs)
+        self.logger.info(f"Loaded replay {filePath} with {self.totalFrames} frames")
+
+        self.runIndex = 0
+        self.runFrame = 0
+        self.frame = 0
+
+
+    def setup_save(self):
+        """Points the game at a separate save file containing the recorded save, so the replay starts from the same state and doesn't change the real save"""
+        constants.SAVE_PATH = constants.REPLAY_SAVE_PATH
+
+        if os.path.isfile(constants.SAVE_PATH):
+            os.remove(constants.SAVE_PATH)
+
+        utility.create_default_database()
+        utility.modif_save(self.save)
+
+
+    def apply(self, window) -> bool:
+        """Sets the window's inputs to the next recorded frame. Returns False if the replay has finished."""
+        if self.runIndex >= len(self.runs):
+            return False
+
+        count, state = self.runs[self.runIndex]
+        unpack_inputs(window, state)
+
+        self.frame += 1
+        self.runFrame += 1
+        if self.runFrame >= count: # Reached the end of the run, moving to the next one
+            self.runFrame = 0
+            self.runIndex += 1
+
+        return True
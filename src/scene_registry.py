@@ -0,0 +1,54 @@
+import logging
+import time
+
+import src.frame_stats as frame_stats
+
+class SceneRegistry:
+    """
+    Creates each scene the first time it's used instead of every scene when the game starts, so the game can show its first frame sooner.
+    Scenes are registered with a function that creates them, and are created when they're first looked up by name.
+    """
+    def __init__(self):
+        """Starts with no scenes"""
+        self.logger = logging.getLogger(__name__)
+
+        self.factories = {} # Scene name: function that creates the scene
+        self.scenes = {} # Scene name: scene, for the scenes that have been created
+
+
+    def register(self, name, factory):
+        """Registers a scene, which is created by calling the factory with no arguments when it's first used"""
+        self.factories[name] = factory
+
+
+    def create(self, name) -> object:
+        """Creates the scene if it hasn't been created yet, returning it"""
+        if name not in self.scenes:
+            start = time.perf_counter()
+            self.scenes[name] = self.factories[name]()
+
+            self.logger.info(f"Created the {name} scene in {(time.perf_counter() - start) * 1000:.1f}ms")
+            # Creating a scene can take longer than a frame, so hitches after it are tagged with it
+            frame_stats.event(f"{name} created")
+
+        return self.scenes[name]
+
+
+    def is_created(self, name) -> bool:
+        """Checks if the scene has been created"""
+        return name in self.scenes
+
+
+    def get(self, name, default = None) -> object:
+        """Gets the scene if it has been created, without creating it"""
+        return self.scenes.get(name, default)
+
+
+    def __getitem__(self, name) -> object:
+        """Gets the scene, creating it if it's the first time it's used"""
+        return self.create(name)
+
+
+    def __contains__(self, name) -> bool:
+        """Checks if there is a scene registered with the name"""
+        return name in self.factories
@@ -3,8 +3,11 @@ import logging
 
 import src.constants as constants
 import src.utility as utility
+import src.asset_loader as asset_loader
 import src.tile_renderer
 import src.button
+import src.dirty_rect_tracker
+import src.layer_compositor
 
 class Settings:
     """Handles the settings menu, the options, and everything within it"""
@@ -31,11 +34,11 @@ class Settings:
             self.bg, menuLevelData[1]["background"]
         )
         # Screen shadow
-        self.screenShadow = pygame.image.load(constants.SCREEN_SHADOW_PATH)
+        self.screenShadow = asset_loader.load_image(constants.SCREEN_SHADOW_PATH)
         # Back image
-        back = pygame.image.load(constants.BACK_PATH)
+        back = asset_loader.load_image(constants.BACK_PATH)
         
-        arrow = pygame.image.load(constants.ARROW_PATH)
+        arrow = asset_loader.load_image(constants.ARROW_PATH)
 
         # Creating buttons
         # Button layout
@@ -73,6 +76,17 @@ class Settings:
                     data[1], data[2],
                     image = data[0]
                 )
+
+        # Parts of the menu that change, so only they are shown again when they do
+        self.dirtyRects = src.dirty_rect_tracker.DirtyRectTracker()
+
+        # Everything but the buttons and the volume never changes, so it's cached as one surface
+        self.layers = src.layer_compositor.LayerCompositor(dirtyRects = self.dirtyRects)
+        self.layers.add("background", "static", lambda surface: surface.blit(self.bg, (0, 0)))
+        self.layers.add("screen shadow", "static", lambda surface: surface.blit(self.screenShadow, (0, 0)))
+        self.layers.add("labels", "static", self.render_labels)
+        self.layers.add("buttons", "animated", self.render_buttons)
+        self.layers.add("volume", "animated", self.render_volume)
     
 
     def update(self, mousePos, mouseInputs):
@@ -102,13 +116,19 @@ class Settings:
     
 
     def render(self, window):
-        """Renders everything in the settings menu to the screen"""
-        window.blit(self.bg, (0, 0))
-        window.blit(self.screenShadow, (0, 0))
+        """Renders everything in the settings menu to the screen with its layers, marking the parts that can change on the dirty rect tracker"""
+        self.layers.render(window)
 
-        for button in self.buttons.values():
+
+    def render_buttons(self, window):
+        """Renders all buttons, marking them on the dirty rect tracker"""
+        for name, button in self.buttons.items():
             button.render(window)
+            self.dirtyRects.mark(name, button.get_render_state(), button.rect)
 
+
+    def render_labels(self, window):
+        """Renders the title and the text next to the buttons"""
         # Settings title
         utility.centered_text(window, "Settings", (constants.SCREEN_SIZE[0] / 2, 30), self.largeFont)
         
@@ -121,5 +141,9 @@ class Settings:
 
         # Render the audio text
         utility.centered_text(window, "Music\nVolume", (100, constants.SCREEN_SIZE[1] / 2 - 35), self.font)
-        # Render the audio level
-        utility.centered_text(window, f"{self.volume}%", (100, constants.SCREEN_SIZE[1] / 2 + 15), self.font)
\ No newline at end of file
+
+
+    def render_volume(self, window):
+        """Renders the audio level, marking it on the dirty rect tracker"""
+        rect = utility.centered_text(window, f"{self.volume}%", (100, constants.SCREEN_SIZE[1] / 2 + 15), self.font)
+        self.dirtyRects.mark("volume", self.volume, rect)
\ No newline at end of file
@@ -0,0 +1,30 @@
+import pygame
+
+class SurfacePool:
+    """
+    Holds a few surfaces of the same size which are allocated once and handed out in turn,
+    so a new surface doesn't need to be created every frame (such as the frame the loop renders to).
+    A surface that was handed out stays untouched until every other surface in the pool has been handed out after it.
+    """
+    def __init__(self, size, count = 2, flags = 0):
+        """Allocates the amount of surfaces given"""
+        self.surfaces = [pygame.Surface(size, flags = flags) for _ in range(count)]
+        self.index = -1 # Index of the surface handed out last
+
+        # Color the surfaces are cleared to
+        self.clearColor = (0, 0, 0, 0) if flags & pygame.SRCALPHA else (0, 0, 0)
+
+
+    def get(self) -> "pygame.Surface":
+        """Gets the next surface in the pool, cleared to black (or to transparent if it has per-pixel alpha)"""
+        self.index = (self.index + 1) % len(self.surfaces)
+
+        surface = self.surfaces[self.index]
+        surface.fill(self.clearColor)
+
+        return surface
+
+
+    def get_last(self) -> "pygame.Surface":
+        """Gets the surface handed out last, without clearing it"""
+        return self.surfaces[self.index]
@@ -0,0 +1,93 @@
+"""
+This file keeps surfaces of rendered text so the same text doesn't need to be rendered again every frame.
+Surfaces are kept by their font, text, color, and border width (0 for text without a border),
+and once there are more than TEXT_CACHE_SIZE surfaces, the one used longest ago is removed.
+Hits and misses are counted for every frame on the debug overlay (src/debug_overlay.py), and added up in total.
+Surfaces from the cache are shared, so they shouldn't be drawn on.
+"""
+
+import collections
+
+import pygame
+
+import src.constants as constants
+import src.instrumentation as instrumentation
+
+cache = collections.OrderedDict() # Surfaces from the least to the most recently used
+hits = 0 # Amount of times text was found in the cache
+misses = 0 # Amount of times text had to be rendered
+
+
+def render(font, text, color, borderWidth) -> "pygame.Surface":
+    """Renders the text, with a black border of the width given around it if the width isn't 0"""
+    renderText = font.render(text, False, color)
+
+    if borderWidth == 0:
+        return renderText
+
+    bgText = font.render(text, False, constants.BLACK)
+
+    textSurf = pygame.Surface((renderText.get_width() + borderWidth * 2, renderText.get_height() + borderWidth * 2), flags = pygame.SRCALPHA) # Creates a surface for the text
+
+    # Goes in a square around the text's position
+    # Drawing the background text, which is the border
+    for x in (0, borderWidth, borderWidth * 2):
+        for y in (0, borderWidth, borderWidth * 2):
+            textSurf.blit(bgText, (x, y))
+
+    # Drawing normal text above the background text
+    textSurf.blit(renderText, (borderWidth, borderWidth))
+
+    return textSurf
+
+
+def get(font, text, color = (255, 255, 255), borderWidth = 0) -> "pygame.Surface":
+    """Gets the surface of the text rendered with the font, color, and border width given, rendering it if it isn't in the cache"""
+    global hits, misses
+
+    key = (font, text, tuple(color), borderWidth)
+    surface = cache.get(key)
+
+    if surface is not None:
+        cache.move_to_end(key)
+        hits += 1
+        instrumentation.count("text cache hits")
+        return surface
+
+    misses += 1
+    instrumentation.count("text cache misses")
+
+    surface = render(font, text, color, borderWidth)
+    cache[key] = surface
+
+    if len(cache) > constants.TEXT_CACHE_SIZE:
+        cache.popitem(last = False)
+
+    return surface
+
+
+def clear():
+    """Removes every surface from the cache and resets the hits and misses"""
+    global hits, misses
+
+    cache.clear()
+    hits = 0
+    misses = 0
+
+
+def get_stats() -> dict:
+    """Gets the amount of surfaces in the cache, and the total hits, misses, and hit rate"""
+    total = hits + misses
+
+    return {
+        "size": len(cache),
+        "hits": hits,
+        "misses": misses,
+        "hitRate": hits / total if total else 0
+    }
+
+
+def report():
+    """Reports the size and hit rate of the cache to the debug overlay"""
+    stats = get_stats()
+    instrumentation.report("text cache", f"{stats['size']}/{constants.TEXT_CACHE_SIZE}, {stats['hitRate'] * 100:.1f}% hits")
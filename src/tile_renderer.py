@@ -4,6 +4,8 @@ import os
 import src.animation
 import src.constants as constants
 import src.utility as utility
+import src.asset_loader as asset_loader
+import src.culling as culling
 
 class TileRenderer:
     """
@@ -19,8 +21,13 @@ class TileRenderer:
         self.load_tile_anims()
 
         # Loading spike tile
-        self.spikeTile = pygame.image.load(constants.SPIKE_PATH).convert_alpha()
-        self.brightSpike = pygame.image.load(constants.BRIGHT_SPIKE_PATH).convert_alpha()
+        self.spikeTile = asset_loader.load_image(constants.SPIKE_PATH).convert_alpha()
+        self.brightSpike = asset_loader.load_image(constants.BRIGHT_SPIKE_PATH).convert_alpha()
+
+        # Masks of the spike in every rotation, used for collisions
+        self.spikeMasks = {}
+        for tile, rotation in constants.SPIKE_ROTATIONS.items():
+            self.spikeMasks[tile] = pygame.mask.from_surface(pygame.transform.rotate(self.spikeTile, rotation))
 
         # If the tile being checked is on the screen and transparent, used when drawing edges to the screen
         self.check_tile = lambda room, x, y: utility.check_between((x, y), (0, 0), constants.SCREEN_TILE_SIZE) and room[y][x] in constants.TRANSPARENT_TILES
@@ -55,13 +62,13 @@ class TileRenderer:
             tilePath = "res/tiles/solid/" + constants.TILE_KEYS[tileKey] + "/"
 
             self.tileKey[tileKey] = {
-                "tile": pygame.image.load(tilePath + "/tile.png").convert_alpha(),
-                "corner": pygame.image.load(tilePath + "corner.png").convert_alpha(),
-                "edge": pygame.image.load(tilePath + "edge.png").convert_alpha(),
+                "tile": asset_loader.load_image(tilePath + "/tile.png").convert_alpha(),
+                "corner": asset_loader.load_image(tilePath + "corner.png").convert_alpha(),
+                "edge": asset_loader.load_image(tilePath + "edge.png").convert_alpha(),
             }
 
             if os.path.isfile(tilePath + "inverse_corner.png"): # If there is an inverse_corner image for the tile
-                self.tileKey[tileKey]["inverse_corner"] = pygame.image.load(tilePath + "inverse_corner.png").convert_alpha() # Load the inverse corner
+                self.tileKey[tileKey]["inverse_corner"] = asset_loader.load_image(tilePath + "inverse_corner.png").convert_alpha() # Load the inverse corner
             
             else: # If there isn't an inverse_corner needed
                 self.tileKey[tileKey]["inverse_corner"] = self.tileKey[tileKey]["corner"] # Sets the inverse_corner to the normal corner
@@ -103,10 +110,8 @@ class TileRenderer:
                     }
 
 
-    def get_tile_anim_frame(self, position, globalGravity, gravBeamYPos) -> "pygame.Surface":
-        """Gets the frame that the tile is currently in"""
-        
-        image = self.individualTileAnims[position]["animationObject"].get_frame()
+    def get_tile_flip(self, position, globalGravity, gravBeamYPos) -> bool:
+        """Gets whether the tile at the position is flipped vertically (if it's below the gravity line)"""
         tile = self.individualTileAnims[position]["tile"]
 
         if tile not in constants.NO_ROTATE_TILES:
@@ -119,20 +124,48 @@ class TileRenderer:
         else:
             flip = position[1] >= constants.GRAV_BEAM_TILE_Y_POS
 
-        return pygame.transform.flip(image, False, flip)
+        return flip
+
+
+    def get_tile_anim_frame(self, position, globalGravity, gravBeamYPos) -> "pygame.Surface":
+        """Gets the frame that the tile is currently in"""
+        anim = self.individualTileAnims[position]["animationObject"]
+
+        return anim.get_flipped_frame(flipY = self.get_tile_flip(position, globalGravity, gravBeamYPos))
+    
+
+    def get_tile_anim_mask(self, position, globalGravity, gravBeamYPos) -> "pygame.mask.Mask":
+        """Gets the mask of the frame that the tile is currently in"""
+        anim = self.individualTileAnims[position]["animationObject"]
+
+        return anim.get_mask(flipY = self.get_tile_flip(position, globalGravity, gravBeamYPos))
 
 
     def render_tiles_with_anims(self, window, globalGravity, gravBeamYPos, offset = 0):
-        """Renders all tiles with animations. Renders the tiles flipped if they're bellow the gravity line."""
+        """Renders all tiles with animations that are on the screen. Renders the tiles flipped if they're bellow the gravity line."""
+        # The tiles are all inside of their room, so they only need to be checked one by one if the room is partly on the screen
+        roomBounds = culling.camera.move(offset, 0)
+        if not culling.camera.colliderect(roomBounds):
+            culling.count(0, len(self.individualTileAnims))
+            return
 
-        for tilePos in self.individualTileAnims:
-            frame = self.get_tile_anim_frame(tilePos, globalGravity, gravBeamYPos)
+        checkTiles = not culling.camera.contains(roomBounds)
+        if not checkTiles:
+            culling.count(len(self.individualTileAnims), 0)
 
-            # Rendering it on the screen
-            window.blit(frame, (
+        for tilePos, anim in self.individualTileAnims.items():
+            position = (
                 tilePos[0] * constants.TILE_SIZE[0] + offset, 
                 tilePos[1] * constants.TILE_SIZE[1]
-            ))
+            )
+
+            if checkTiles and not culling.is_visible(anim["animationObject"].get_bounds(position)):
+                continue
+
+            frame = self.get_tile_anim_frame(tilePos, globalGravity, gravBeamYPos)
+
+            # Rendering it on the screen
+            window.blit(frame, position)
 
 
     def update_tiles_with_anims(self):
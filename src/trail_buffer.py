@@ -0,0 +1,41 @@
+class TrailBuffer:
+    """
+    Ring buffer of the samples the player leaves behind while moving, which follow objects (such as Ellipse and Corlen) follow.
+    Each sample is a tuple of (x, y, level, room, facing).
+    The buffer is allocated once, so adding a sample never moves the other samples,
+    and samples are accessed by their lag, which is how many samples ago they were added (0 being the newest).
+    """
+    def __init__(self, capacity):
+        """Allocates the buffer with the given amount of samples"""
+        self.capacity = capacity
+        self.samples = [None] * capacity
+
+        self.clear()
+
+
+    def clear(self):
+        """Removes all samples"""
+        self.newest = -1 # Index of the newest sample
+        self.length = 0
+
+
+    def __len__(self) -> int:
+        """Amount of samples in the buffer"""
+        return self.length
+
+
+    def append(self, position, level, room, facing):
+        """Adds a sample as the newest one, overwriting the oldest if the buffer is full"""
+        self.newest = (self.newest + 1) % self.capacity
+        self.samples[self.newest] = (position[0], position[1], level, room, facing)
+
+        if self.length < self.capacity:
+            self.length += 1
+
+
+    def get(self, lag) -> tuple:
+        """Gets the sample added the given amount of samples ago"""
+        if not 0 <= lag < self.length:
+            raise IndexError(f"Lag {lag} is outside the trail of length {self.length}")
+
+        return self.samples[(self.newest - lag) % self.capacity]
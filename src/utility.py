@@ -8,14 +8,25 @@ import math
 import sqlite3
 import os
 import re
-import win32api
 import logging
-import smtplib, ssl
 import json
 import base64
+import random
 
 import src.constants as constants
 import src.animation
+import src.text_cache
+import src.quality
+import src.frame_stats as frame_stats
+import src.asset_loader as asset_loader
+
+# Surfaces reused by draw_text_background, with their sizes as the keys
+textBackgrounds = {}
+MAX_TEXT_BACKGROUNDS = 64 # Amount of text backgrounds kept before they are all cleared
+
+# Random number generator used by the bosses.
+# It's separate from the random module so it can be seeded for replays
+gameRandom = random.Random()
 
 def setup_loggers():
     """Setting up root logger (and default configuration for future loggers)"""
@@ -212,34 +223,28 @@ def save_room(
 def load_spritesheet(
         filePath, # Path to the file
         width = None, # Width of each image
-        frames = None # Frames in the animation
+        frames = None, # Frames in the animation
         # Choose either width or frames
+        copy = False # If each frame should be a surface of its own
     ) -> list:
     """
     This function assumes the spritesheet is horizontal.
-    It returns a list of all the frames of the spritesheet.
+    It returns a list of all the frames of the spritesheet, which are subsurfaces of it (sharing its pixels instead of copying them).
+    Frames that will be changed should be copied, so changing one doesn't change the spritesheet.
     """
 
-    image = pygame.image.load(filePath).convert_alpha() # Loads the spritesheet from a file
+    image = asset_loader.load_image(filePath).convert_alpha() # Loads the spritesheet from a file
 
     # Calculating the other var based on the given
     if width is None: width = image.get_width() // frames
     else: frames = image.get_width() // width
 
-    result = []
-
     # Iterates through a range which is the amount of images in the spritesheet
-    for count in range(frames):
-        frame = pygame.Surface((width, image.get_height()), flags=pygame.SRCALPHA) # Creates a surface for each frame
-        
-        frame.blit(
-            image, 
-            (-(count * width), # This moves the spritesheet back enough so that the only frame in the image is the individual frame being saved
-            0),
-            special_flags = pygame.BLEND_RGBA_MAX
-        )
+    # Each frame is the part of the spritesheet it's in
+    result = [image.subsurface((count * width, 0, width, image.get_height())) for count in range(frames)]
 
-        result.append(frame)
+    if copy:
+        result = [frame.copy() for frame in result]
     
     return result
     
@@ -259,18 +264,21 @@ def check_between(
     return min[0] <= vect[0] < max[0] and min[1] <= vect[1] < max[1]
 
 
-def render_text(window, text, position, font, color = (255, 255, 255)):
-    """Renders text normally. Does not account for newlines."""
-    rendered = font.render(text, False, color)
-    window.blit(rendered, position)
+def render_text(window, text, position, font, color = (255, 255, 255)) -> "pygame.Rect":
+    """Renders text normally, returning the area drawn to. Does not account for newlines."""
+    rendered = src.text_cache.get(font, text, color)
+    return window.blit(rendered, position)
 
 
-def centered_text(window, text, position, font, color = (255, 255, 255)):
-    """Renders text centered on the x position. Also accounts for newlines."""
+def centered_text(window, text, position, font, color = (255, 255, 255)) -> "pygame.Rect":
+    """Renders text centered on the x position, returning the area drawn to. Also accounts for newlines."""
     text = text.split("\n")
+    rects = []
     for count, txt in enumerate(text):
-        surf = font.render(txt, False, color) # Rendering to a surface
-        window.blit(surf, (position[0] - surf.get_width() / 2, position[1] + count * constants.VERTICAL_TEXT_GAP)) # Centered
+        surf = src.text_cache.get(font, txt, color) # Rendered surface
+        rects.append(window.blit(surf, (position[0] - surf.get_width() / 2, position[1] + count * constants.VERTICAL_TEXT_GAP))) # Centered
+
+    return rects[0].unionall(rects[1:])
 
 
 def draw_text_with_border(
@@ -280,29 +288,18 @@ def draw_text_with_border(
     textObj, # Font object used to render
     color, 
     borderWidth = 1,
-    renderText = None, # Surface with text (if already made)
-    backgroundText = None, # Pygame Surface with the background text
     alpha = None
     ):
-    """Draws text on the screen with a black border"""
-    if renderText is None:
-        renderText = textObj.render(text, False, color)
-    
-    if backgroundText is None:
-        bgText = textObj.render(text, False, constants.BLACK)
-    
-    textSurf = pygame.Surface((renderText.get_width() + borderWidth * 2, renderText.get_height() + borderWidth * 2), flags = pygame.SRCALPHA) # Creates a surface for the text
+    """Draws text on the screen with a black border. The bordered text is kept in the text cache (src/text_cache.py)."""
+    if not src.quality.enabled("text borders"):
+        borderWidth = 0 # The quality governor turned borders off
 
-    # Goes in a square around the text's position
-    # Drawing the background text, which is the border
-    for x in (0, borderWidth, borderWidth * 2):
-        for y in (0, borderWidth, borderWidth * 2):
-            textSurf.blit(bgText, (x, y))
-    
-    # Drawing normal text on screen above the background text
-    textSurf.blit(renderText, (borderWidth, borderWidth))
+    textSurf = src.text_cache.get(textObj, text, color, borderWidth)
 
-    if alpha is not None: # Setting alpha if one is given
+    # Setting alpha if one is given, otherwise resetting any alpha from the last time the surface was drawn
+    # Only set when it changes, since setting it makes the next blit slower
+    alpha = alpha if alpha is not None else 255
+    if textSurf.get_alpha() != alpha:
         textSurf.set_alpha(alpha)
     
     window.blit(textSurf, (position[0] - borderWidth, position[1] - borderWidth)) # Blits the text to the screen
@@ -315,25 +312,33 @@ def draw_text_background(window, position, text, textObj, gap):
 
     # Getting longest string of text in the rows of text
     longest = max(text, key = len)
-    # Getting the longest string of text rendered to a Pygame Surface
-    rendered = textObj.render(longest, False, constants.WHITE)
+    # Getting the size of the longest string of text, without rendering it
+    textWidth, textHeight = textObj.size(longest)
 
-    # Gets the size of the background using the rendered text
-    width = rendered.get_width() + 2
-    height = len(text) * gap + (rendered.get_height() - gap) + 2 # Gap is the height between each text object
+    # Gets the size of the background using the size of the text
+    width = textWidth + 2
+    height = len(text) * gap + (textHeight - gap) + 2 # Gap is the height between each text object
 
-    bg = pygame.Surface((width, height), flags = pygame.SRCALPHA) # Creating surface with width and height
-    bg.fill(constants.BLACK) # Filling with black
-    bg.set_alpha(150) # Semi-transparent
+    if (width, height) not in textBackgrounds:
+        if len(textBackgrounds) >= MAX_TEXT_BACKGROUNDS:
+            textBackgrounds.clear()
 
-    alphaValues = pygame.surfarray.pixels_alpha(bg) # Used for editting the individual pixel alphas
+        bg = pygame.Surface((width, height), flags = pygame.SRCALPHA) # Creating surface with width and height
+        bg.fill(constants.BLACK) # Filling with black
+        bg.set_alpha(150) # Semi-transparent
 
-    # Removing the four corners (to look better)
-    for y in range(2):
-        for x in range(2):
-            alphaValues[x * (width - 1), y * (height - 1)] = 0
-    
-    del alphaValues
+        alphaValues = pygame.surfarray.pixels_alpha(bg) # Used for editting the individual pixel alphas
+
+        # Removing the four corners (to look better)
+        for y in range(2):
+            for x in range(2):
+                alphaValues[x * (width - 1), y * (height - 1)] = 0
+        
+        del alphaValues
+
+        textBackgrounds[(width, height)] = bg # Backgrounds never change, so they are reused
+
+    bg = textBackgrounds[(width, height)]
 
     # Drawing to the window
     window.blit(bg, (position[0] - 1 - width / 2, position[1] - 1))
@@ -341,6 +346,8 @@ def draw_text_background(window, position, text, textObj, gap):
 
 def play_music(musicName) -> bool: # Successful or not
     """Plays music from the music folder in "res". Returns a bool indicating if it was successful or not."""
+    frame_stats.event(f"play_music {musicName}")
+
     try:
         # Setting up music
         pygame.mixer.music.load(f"{constants.MUSIC_FOLDER}/{musicName}.wav")
@@ -379,6 +386,8 @@ DATABASE HANDLING
 """
 def create_default_database():
     """Creates a database assuming that there is none, from the default layout found in constants.py"""
+    frame_stats.event("save write")
+
     conn = sqlite3.connect(constants.SAVE_PATH) # Creating a connection
     c = conn.cursor() # Creates the cursor
 
@@ -423,6 +432,8 @@ def load_save() -> dict:
 
 def modif_save(dict):
     """Modifies the save with the corresponding keys and values passed in through the dictionary"""
+    frame_stats.event("save write")
+
     if os.path.isfile(constants.SAVE_PATH): # If the file doesn't exist
         # Creating a connection and cursor
         conn = sqlite3.connect(constants.SAVE_PATH)
@@ -442,6 +453,16 @@ def modif_save(dict):
         modif_save(dict) # Call this function to modify the changes
 
 
+def get_win32api() -> "module":
+    """Imports win32api, which is used for popup boxes, only when a box is shown. Returns None if it isn't available (it's only on Windows)."""
+    try:
+        import win32api
+    except ImportError:
+        return None
+
+    return win32api
+
+
 def error_box(error):
     """Creates an error box with the given error message, reporting the error if the user presses "ok"."""
     pygame.quit() # Closes window
@@ -460,6 +481,12 @@ def error_box(error):
     with open(crashFilePath, "w") as file:
         file.write(crashReport)
 
+    win32api = get_win32api()
+    if win32api is None:
+        # No popup box on this platform, the error is only in the crash report and the event log
+        logging.getLogger(__name__).critical(f"Wrote crash report to {crashFilePath}")
+        return
+
     errorMessage = f"Game ERROR. This is an unrecoverable state.\n\nError:\n----------------------\n{error}----------------------\n\n\nWould you like to report this crash?"
 
     # Generates a popup box with the error
@@ -469,6 +496,9 @@ def error_box(error):
                                 1)
 
     if result == 1: # If the user wants to report the crash
+        # Only imported when a crash is reported, since they take a while to import
+        import smtplib, ssl
+
         with open(constants.EVENT_LOG_PATH, "r") as file: # Opens the file
             contents = file.read() # Grabs the contents of the file
         
@@ -489,6 +519,12 @@ def warning_box(message):
     """
     Generates a popup box with the message formatted and passed in
     """
+    win32api = get_win32api()
+    if win32api is None:
+        # No popup box on this platform, logging the warning instead
+        logging.getLogger(__name__).warning(message)
+        return
+
     errorMessage = f"Game WARNING. This is a recoverable state.\n\nWarning:\n----------------------\n{message}\n----------------------"
     win32api.MessageBox(None, 
                         errorMessage, 
@@ -1,6 +1,11 @@
 import pygame
 import logging
+import time
 import src.constants as constants
+import src.asset_loader as asset_loader
+import src.profiler as profiler
+import src.instrumentation as instrumentation
+import src.frame_pacer
 
 class Window:
     """
@@ -11,7 +16,11 @@ class Window:
     WINDOW_SIZE = (
         constants.PX_SCALE_FACTOR * constants.SCREEN_SIZE[0],
         constants.PX_SCALE_FACTOR * constants.SCREEN_SIZE[1]
-    ) # This is the size of the window
+    ) # This is the size of the window when using the integer scaling mode
+
+    # Scaling modes tried when the scaling mode is "auto", in the order they are tried
+    # The last one is used if none of the others can be set up
+    AUTO_SCALING_MODES = ("scaled", "integer")
 
     def __init__(self):
         """Creates the window, the miniwindow, sets up other Pygame things, and inputs"""
@@ -19,19 +28,36 @@ class Window:
         self.logger = logging.getLogger(__name__)
 
         self.logger.info("Setting up window...")
-        self.window = pygame.display.set_mode(self.WINDOW_SIZE, pygame.DOUBLEBUF)
-        self.miniWindow = pygame.Surface((
-            self.WINDOW_SIZE[0] / constants.PX_SCALE_FACTOR,
-            self.WINDOW_SIZE[1] / constants.PX_SCALE_FACTOR
-        )) # Miniwindow is the window divided by the pixel scale factor
 
-        icon = pygame.image.load(constants.ICON_PATH)
+        # Average milliseconds taken to scale and show each frame, reported on the debug overlay
+        self.presentTime = 0
+
+        # If the whole screen has to be shown next frame even if only parts of the frame changed, such as after the window was covered
+        self.fullRedraw = True
+
+        # When the inputs shown in the next frame were polled, for timing how long it takes for them to be shown
+        self.inputTime = None
+        # Average milliseconds from the inputs being polled until the frame is shown, reported on the debug overlay
+        self.inputLatency = 0
+        # Average seconds taken from polling the inputs to showing the frame, which the late latch mode leaves time for
+        self.workTime = 0
+
+        if constants.SCALING_MODE == "auto":
+            self.choose_scaling_mode()
+        else:
+            self.set_scaling_mode(constants.SCALING_MODE)
+
+        # The screen isn't created again after this, so images can be converted to its pixel format and cached
+        asset_loader.set_cache_format()
+
+        # Waits between frames, using vsync if the screen was created with it
+        self.pacer = src.frame_pacer.FramePacer(constants.FPS, constants.PACING_STRATEGY, self.vsync)
+
+        icon = asset_loader.load_image(constants.ICON_PATH)
 
         pygame.display.set_caption("There Is Nothing")
         pygame.display.set_icon(icon)
 
-        self.clock = pygame.time.Clock()
-
         self.closeWindow = False 
 
         self.inputs = {
@@ -40,7 +66,11 @@ class Window:
             "up": False,
             "space": False,
             "esc": False,
-            "enter": False
+            "enter": False,
+            "debug": False,
+            "profiler": False,
+            "exportProfile": False,
+            "dumpHitches": False
         }
         self.mousePos = (0, 0)
         self.mousePressed = {
@@ -55,32 +85,61 @@ class Window:
             "up": constants.UP_KEYS,
             "space": [pygame.K_SPACE],
             "esc": [pygame.K_ESCAPE],
-            "enter": [pygame.K_RETURN]
+            "enter": [pygame.K_RETURN],
+            "debug": [constants.DEBUG_OVERLAY_KEY],
+            "profiler": [constants.PROFILER_OVERLAY_KEY],
+            "exportProfile": [constants.PROFILER_EXPORT_KEY],
+            "dumpHitches": [constants.HITCH_DUMP_KEY]
         }
+
+        self.eventCount = 0 # Amount of events in the last frame, the loop only waits for inputs after frames without any
+        self.waitedEvent = None # Event which ended a wait for inputs, handled with the events of the next frame
+
+        # Set by the loop when recording or playing back inputs (src/replay.py)
+        self.recorder = None
+        self.replayer = None
     
     
     def update_inputs(self):
         """Resets inputs that are one time, iterates through Pygame events and takes note of inputs"""
 
+        self.inputTime = time.perf_counter()
+
         # Resetting one-time inputs
         self.inputs["up"] = False
         self.inputs["space"] = False
         self.inputs["esc"] = False
         self.inputs["enter"] = False
+        self.inputs["debug"] = False
+        self.inputs["profiler"] = False
+        self.inputs["exportProfile"] = False
+        self.inputs["dumpHitches"] = False
 
-        # Getting mouse positions and buttons pressed
+        # Getting mouse positions (on the miniwindow) and buttons pressed
+        mousePos = pygame.mouse.get_pos()
         self.mousePos = (
-            pygame.mouse.get_pos()[0] // constants.PX_SCALE_FACTOR,
-            pygame.mouse.get_pos()[1] // constants.PX_SCALE_FACTOR,
+            (mousePos[0] - self.scaledOffset[0]) // self.scale,
+            (mousePos[1] - self.scaledOffset[1]) // self.scale
         )
 
         self.mousePressed["left"], self.mousePressed["center"], self.mousePressed["right"] = pygame.mouse.get_pressed()
         
+        events = pygame.event.get()
+        if self.waitedEvent is not None:
+            events.insert(0, self.waitedEvent) # It happened before the others
+            self.waitedEvent = None
+
+        self.eventCount = len(events)
+
         # Iterating through all events/inputs
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 self.closeWindow = True
 
+            elif event.type == pygame.WINDOWEXPOSED:
+                # What was on the screen may have been lost
+                self.fullRedraw = True
+
             elif event.type == pygame.KEYDOWN:
                 # If there was a key pressed down, sets the corresponding key to true
                 for key in self.inputButtons:
@@ -95,16 +154,197 @@ class Window:
                 elif event.key in constants.LEFT_KEYS:
                     self.inputs["left"] = False
 
+        if self.replayer is not None:
+            # Replacing the inputs with the recorded ones
+            if not self.replayer.apply(self):
+                self.logger.info("Replay finished")
+                self.closeWindow = True
 
-    def flip(self):
-        """Scales up the miniwindow and updates the screen with it, stablizing frame rate and also clearing the miniwindow afterwards"""
+        elif self.recorder is not None:
+            self.recorder.record(self)
 
-        scaledWindow = pygame.transform.scale(self.miniWindow, self.WINDOW_SIZE)
-        self.window.blit(scaledWindow, (0, 0))
 
-        pygame.display.flip()
+    def set_scaling_mode(self, mode):
+        """
+        Sets up the screen and the miniwindow for the scaling mode given:
+        "integer" scales the miniwindow by the pixel scale factor onto the window every frame,
+        "scaled" lets SDL scale the miniwindow (which is the screen itself) when showing it, using the GPU if there is one,
+        and "letterbox" goes fullscreen, scaling the miniwindow by the largest whole number that fits with black bars around it.
+        Only the "scaled" mode can wait for the screen to refresh when showing frames (vsync), which it does with the vsync pacing strategy.
+        """
+        self.vsync = False
 
-        if constants.CAP_FPS:
-            self.clock.tick(constants.FPS) # Manages the framerate
+        if mode == "scaled":
+            if constants.PACING_STRATEGY == "vsync":
+                try:
+                    self.window = pygame.display.set_mode(constants.SCREEN_SIZE, pygame.SCALED | pygame.DOUBLEBUF, vsync = 1)
+                    self.vsync = True
+                except pygame.error as exc:
+                    self.logger.warning(f"Could not create the screen with vsync: {exc}")
+
+            if not self.vsync:
+                self.window = pygame.display.set_mode(constants.SCREEN_SIZE, pygame.SCALED | pygame.DOUBLEBUF)
+            # Rendering straight to the screen, since it's the same size
+            self.miniWindow = self.window
+            self.scaledArea = None # Nothing to scale
+            self.scale = 1 # Mouse positions are already on the miniwindow
+            self.scaledOffset = (0, 0)
+
+        elif mode == "letterbox":
+            self.window = pygame.display.set_mode((0, 0), pygame.FULLSCREEN | pygame.DOUBLEBUF) # Size of the monitor
+            screenSize = self.window.get_size()
+
+            self.scale = max(1, min(screenSize[0] // constants.SCREEN_SIZE[0], screenSize[1] // constants.SCREEN_SIZE[1]))
+            scaledSize = (constants.SCREEN_SIZE[0] * self.scale, constants.SCREEN_SIZE[1] * self.scale)
+            # Centered on the screen
+            self.scaledOffset = ((screenSize[0] - scaledSize[0]) // 2, (screenSize[1] - scaledSize[1]) // 2)
+
+            # Part of the screen the miniwindow is scaled onto, the rest stays black
+            self.scaledArea = self.window.subsurface((self.scaledOffset, scaledSize))
+            self.miniWindow = pygame.Surface(constants.SCREEN_SIZE)
+
+        elif mode == "integer":
+            self.window = pygame.display.set_mode(self.WINDOW_SIZE, pygame.DOUBLEBUF)
+            self.scaledArea = self.window # Scaling straight onto the screen instead of creating a new scaled surface
+            self.scale = constants.PX_SCALE_FACTOR
+            self.scaledOffset = (0, 0)
+            self.miniWindow = pygame.Surface(constants.SCREEN_SIZE) # Miniwindow is the window divided by the pixel scale factor
+
+        else:
+            raise ValueError(f"Unknown scaling mode {mode}")
+
+        self.scalingMode = mode
+        self.presentTime = 0
+        self.fullRedraw = True
+
+
+    def choose_scaling_mode(self):
+        """
+        Tries each of the automatic scaling modes, timing how long it takes to show frames with each of them, and uses the fastest one.
+        With the vsync pacing strategy the "scaled" mode is used if it can be, since showing frames waits for the screen then and can't be compared.
+        """
+        if constants.PACING_STRATEGY == "vsync":
+            try:
+                self.set_scaling_mode("scaled")
+                self.logger.info("Using scaling mode scaled for vsync")
+                return
+            except pygame.error as exc:
+                self.logger.warning(f"Scaling mode scaled is unavailable: {exc}")
+
+        times = {}
+
+        for mode in self.AUTO_SCALING_MODES:
+            try:
+                self.set_scaling_mode(mode)
+            except pygame.error as exc:
+                self.logger.warning(f"Scaling mode {mode} is unavailable: {exc}")
+                continue
 
-        self.miniWindow.fill(constants.BLACK)
\ No newline at end of file
+            start = time.perf_counter()
+            for _ in range(constants.SCALING_TEST_FRAMES):
+                self.present()
+            times[mode] = (time.perf_counter() - start) * 1000 / constants.SCALING_TEST_FRAMES
+
+        fastest = min(times, key = times.get)
+        if fastest != self.scalingMode:
+            try:
+                self.set_scaling_mode(fastest)
+            except pygame.error as exc:
+                # Some drivers can't switch back after the window was changed
+                self.logger.warning(f"Could not switch back to scaling mode {fastest}: {exc}")
+                fastest = self.AUTO_SCALING_MODES[-1]
+                self.set_scaling_mode(fastest)
+
+        self.logger.info(f"Using scaling mode {fastest} ({', '.join(f'{mode} {ms:.3f}ms' for mode, ms in times.items())} per frame)")
+
+
+    def present(self, dirtyRects = None):
+        """
+        Scales up the miniwindow if needed and shows it on the screen.
+        If a list of rectangles on the miniwindow is given, only those parts are scaled and shown, and nothing is if it's empty.
+        """
+        if dirtyRects is None or self.fullRedraw:
+            with profiler.phase("scale"):
+                if self.scaledArea is not None:
+                    pygame.transform.scale(self.miniWindow, self.scaledArea.get_size(), self.scaledArea)
+
+            with profiler.phase("display flip"):
+                pygame.display.flip()
+
+            self.fullRedraw = False
+            return
+
+        if not dirtyRects:
+            return # Nothing changed
+
+        screenRects = []
+
+        with profiler.phase("scale"):
+            for rect in dirtyRects:
+                rect = rect.clip(self.miniWindow.get_rect())
+                if rect.width == 0 or rect.height == 0:
+                    continue
+
+                if self.scaledArea is not None:
+                    scaledRect = pygame.Rect(rect.x * self.scale, rect.y * self.scale, rect.width * self.scale, rect.height * self.scale)
+                    # Scaling the part onto the same part of the scaled area
+                    pygame.transform.scale(self.miniWindow.subsurface(rect), scaledRect.size, self.scaledArea.subsurface(scaledRect))
+                    rect = scaledRect.move(self.scaledOffset)
+
+                screenRects.append(rect)
+
+        with profiler.phase("display update"):
+            pygame.display.update(screenRects)
+
+
+    def flip(self, dirtyRects = None, wait = True):
+        """
+        Scales up the miniwindow and updates the screen with it, stablizing frame rate and also clearing the miniwindow afterwards.
+        If a list of the rectangles that changed since the last frame is given, only those are shown (see present).
+        The late latch mode waits before the inputs are polled instead of here, so it doesn't wait.
+        """
+        start = time.perf_counter()
+        self.present(dirtyRects)
+        end = time.perf_counter()
+
+        # Reporting the average time taken to show each frame
+        self.presentTime += ((end - start) * 1000 - self.presentTime) * constants.SCALING_TIME_SMOOTHING
+        instrumentation.report("scaling", f"{self.scalingMode} {self.presentTime:.2f}ms")
+
+        if self.inputTime is not None:
+            # Time from the inputs of the frame being polled until it was shown
+            latency = (end - self.inputTime) * 1000
+            self.inputLatency += (latency - self.inputLatency) * constants.LATENCY_SMOOTHING
+            self.workTime += (end - self.inputTime - self.workTime) * constants.LATENCY_SMOOTHING
+            instrumentation.report("input latency", f"{latency:.2f}ms (average {self.inputLatency:.2f}ms, {constants.LATENCY_MODE})")
+
+        if wait and constants.CAP_FPS:
+            self.pacer.wait() # Manages the framerate
+
+        self.miniWindow.fill(constants.BLACK)
+
+
+    def wait_for_event(self, timeout) -> float:
+        """
+        Waits until there's an event or the timeout (in milliseconds) passes, instead of waiting for the next frame, when nothing on the screen is moving.
+        The frame schedule starts again afterwards, so the frames after it aren't rushed to catch up. Returns how many seconds it waited.
+        """
+        start = time.perf_counter()
+
+        with profiler.phase("idle"):
+            event = pygame.event.wait(timeout)
+            if event.type != pygame.NOEVENT:
+                self.waitedEvent = event
+
+        self.pacer.reset()
+
+        return time.perf_counter() - start
+
+
+    def late_latch(self):
+        """
+        Waits before the inputs are polled in the late latch mode, until there's only enough time left to run and show the frame
+        (the average time frames take, plus a margin) before the time the next frame starts, so the inputs are as recent as possible when shown.
+        """
+        if constants.CAP_FPS:
+            self.pacer.wait(early = self.workTime + constants.LATE_LATCH_MARGIN / 1000)